@@ -0,0 +1,241 @@
+import gzip
+import hashlib
+import os
+import re
+
+import build_metrics
+import build_runner
+
+try:
+    import brotli
+except ImportError:
+    # Without the brotli package only the .gz siblings are written.
+    brotli = None
+
+# --- Configuration ---
+SITE_DIR = 'docs'
+
+# Source files, relative to SITE_DIR. Each is minified and copied to a
+# content-hashed name next to it (css/style.css -> css/style.<hash>.css),
+# so browsers may cache it for good; the sources stay the files to edit.
+ASSETS = [
+    'css/style.css',
+    'js/report-page.js',
+    'js/league-data.js',
+    'js/scripts.js',
+    'js/tournament-rules.js',
+    'assets/icons.svg',
+]
+
+ASSET_HASH_LENGTH = 10
+
+# Precompressed siblings (style.<hash>.css.gz / .br) for servers that can send
+# them as-is instead of compressing on every request.
+PRECOMPRESS_EXTENSIONS = ('.css', '.js', '.svg')
+
+# Source path -> hashed path of the last build_assets() run. Empty until then,
+# in which case asset_url() hands out the source paths unchanged.
+ASSET_URLS = {}
+
+_STRING_RE = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')')
+
+
+def _minify_css_code(code):
+    code = re.sub(r'\s+', ' ', code)
+    code = re.sub(r'\s*([{};,>])\s*', r'\1', code)
+    code = re.sub(r':\s+', ':', code)
+    return code.replace(';}', '}')
+
+
+def minify_css(css):
+    """Drops comments and layout whitespace from a stylesheet, leaving strings alone."""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    parts = _STRING_RE.split(css)
+    # split() with a capturing group puts the strings at the odd indexes.
+    return ''.join(part if index % 2 else _minify_css_code(part) for index, part in enumerate(parts)).strip()
+
+
+def _template_line_states(js):
+    """
+    For each line of js, whether it starts and whether it ends inside a
+    template literal. Strings, comments and ${...} nesting are followed;
+    regex literals are not, so a backtick or quote inside one would confuse it.
+
+    Returns:
+        list: One (starts_inside, ends_inside) pair per line of js.
+    """
+    states = []
+    stack = []  # '`' for a template literal, or the brace depth of a ${...} inside one
+    starts_inside = False
+    i = 0
+    while i < len(js):
+        c = js[i]
+        in_template = bool(stack) and stack[-1] == '`'
+        if c == '\n':
+            states.append((starts_inside, in_template))
+            starts_inside = in_template
+        elif in_template:
+            if c == '\\' and js[i + 1:i + 2] != '\n':
+                i += 1
+            elif c == '`':
+                stack.pop()
+            elif js.startswith('${', i):
+                stack.append(0)
+                i += 1
+        elif c in '"\'':
+            end = i + 1
+            while end < len(js) and js[end] not in (c, '\n'):
+                end += 2 if js[end] == '\\' and js[end + 1:end + 2] != '\n' else 1
+            i = end if end < len(js) and js[end] == c else end - 1
+        elif js.startswith('//', i):
+            end = js.find('\n', i)
+            i = (end if end >= 0 else len(js)) - 1
+        elif js.startswith('/*', i):
+            end = js.find('*/', i + 2)
+            end = end + 1 if end >= 0 else len(js) - 1
+            states.extend([(False, False)] * js.count('\n', i, end))
+            i = end
+        elif c == '`':
+            stack.append('`')
+        elif c == '{' and stack:
+            stack[-1] += 1
+        elif c == '}' and stack:
+            if stack[-1] == 0:
+                stack.pop()
+            else:
+                stack[-1] -= 1
+        i += 1
+    states.append((starts_inside, bool(stack) and stack[-1] == '`'))
+    return states
+
+
+def minify_js(js):
+    """
+    Strips indentation, blank lines and whole-line // comments. Line breaks
+    are kept, so automatic semicolon insertion still reads the code the same,
+    and text inside multi-line template literals is left exactly as written.
+    """
+    lines = []
+    for line, (starts_inside, ends_inside) in zip(js.split('\n'), _template_line_states(js)):
+        if not starts_inside:
+            line = line.lstrip()
+            if not line or line.startswith('//'):
+                continue
+        if not ends_inside:
+            line = line.rstrip()
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def minify_svg(svg):
+    """Drops comments and whitespace between tags."""
+    svg = re.sub(r'<!--.*?-->', '', svg, flags=re.DOTALL)
+    return re.sub(r'>\s+<', '><', svg).strip()
+
+
+MINIFIERS = {
+    '.css': minify_css,
+    '.js': minify_js,
+    '.svg': minify_svg,
+}
+
+
+def hashed_path(source_path, content):
+    """css/style.css -> css/style.<hash of content>.css"""
+    stem, extension = os.path.splitext(source_path)
+    digest = hashlib.sha256(content).hexdigest()[:ASSET_HASH_LENGTH]
+    return f"{stem}.{digest}{extension}"
+
+
+def _hashed_name_pattern(source_path):
+    stem, extension = os.path.splitext(source_path)
+    return re.escape(stem) + r'(?:\.[0-9a-f]{' + str(ASSET_HASH_LENGTH) + r'})?' + re.escape(extension)
+
+
+def _write_if_missing(path, data):
+    """Writes a content-addressed file; an existing one already has these bytes."""
+    if os.path.exists(path):
+        return False
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+    build_metrics.add_bytes(len(data))
+    return True
+
+
+def _remove_stale_versions(site_dir, source_path, current_path):
+    """Deletes earlier hashed copies (and their .gz/.br) of one asset."""
+    stem, extension = os.path.splitext(source_path)
+    folder = os.path.join(site_dir, os.path.dirname(source_path))
+    pattern = re.compile(
+        re.escape(os.path.basename(stem)) + r'\.[0-9a-f]{' + str(ASSET_HASH_LENGTH) + r'}'
+        + re.escape(extension) + r'(?:\.gz|\.br)?$'
+    )
+    current_name = os.path.basename(current_path)
+    for name in os.listdir(folder):
+        if pattern.match(name) and not name.startswith(current_name):
+            os.remove(os.path.join(folder, name))
+
+
+def build_assets(site_dir=SITE_DIR):
+    """
+    Minifies every asset in ASSETS to a content-hashed file with .gz (and,
+    when the brotli package is installed, .br) siblings, removes older
+    versions, and records the new names for asset_url().
+
+    Returns:
+        dict: Source path -> hashed path, or None on error.
+    """
+    try:
+        urls = {}
+        written = 0
+        with build_metrics.stage('render'):
+            for source_path in ASSETS:
+                full_source_path = os.path.join(site_dir, *source_path.split('/'))
+                if not os.path.exists(full_source_path):
+                    continue
+                with open(full_source_path, 'r', encoding='utf-8') as f:
+                    source = f.read()
+                minify = MINIFIERS.get(os.path.splitext(source_path)[1])
+                data = (minify(source) if minify else source).encode('utf-8')
+                url = hashed_path(source_path, data)
+                output_path = os.path.join(site_dir, *url.split('/'))
+
+                if _write_if_missing(output_path, data):
+                    written += 1
+                if output_path.endswith(PRECOMPRESS_EXTENSIONS):
+                    # mtime=0 keeps the .gz bytes identical from build to build.
+                    _write_if_missing(output_path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+                    if brotli is not None:
+                        _write_if_missing(output_path + '.br', brotli.compress(data))
+                _remove_stale_versions(site_dir, source_path, output_path)
+                urls[source_path] = url
+
+        ASSET_URLS.clear()
+        ASSET_URLS.update(urls)
+        print(f"Built {len(urls)} asset(s), {written} new, in {site_dir}")
+        return urls
+
+    except OSError as e:
+        build_runner.note_error(f"Error building assets: {e}")
+    return None
+
+
+def asset_url(source_path):
+    """The hashed path to link for an asset, or its source path before build_assets() has run."""
+    return ASSET_URLS.get(source_path, source_path)
+
+
+def rewrite_asset_references(page_html):
+    """
+    Points quoted references to an asset, by its source name or an older
+    hashed name, at the current hashed file.
+
+    Returns:
+        str: The page, unchanged when no assets have been built.
+    """
+    for source_path, url in ASSET_URLS.items():
+        pattern = r'(?<=["\'])' + _hashed_name_pattern(source_path) + r'(?=["\'#])'
+        page_html = re.sub(pattern, url, page_html)
+    return page_html
@@ -0,0 +1,195 @@
+import argparse
+import gc
+import importlib
+import json
+import os
+import shutil
+import statistics
+import time
+import tracemalloc
+
+import league_db
+import synthetic_league
+
+# League sizes to benchmark: (players, boxes, rounds)
+PRESETS = {
+    'small': (120, 20, 8),
+    'medium': (2000, 100, 50),
+    'large': (10000, 500, 200),
+}
+
+# Where the benchmark builds its database and writes the generated pages.
+BENCHMARK_DIR = 'benchmark_output'
+
+# The site's own pages and partials, which the generated pages embed.
+SITE_SOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'docs')
+
+
+def _benchmarks(html_reports, instagram_posts, renderer):
+    """
+    The generators to time, as (name, callable, snapshot fields it renders).
+    Every callable extracts its own snapshot, so timings are end to end.
+    """
+    return [
+        ('html.current_round_fixtures', html_reports.generate_current_round_fixtures_report,
+         ('current_matches',)),
+        ('html.current_round_standings', html_reports.generate_current_round_standings_report,
+         ('current_standings',)),
+        ('html.leaderboard', html_reports.generate_leaderboard_report,
+         ('leaderboard',)),
+        ('html.previous_rounds', html_reports.generate_previous_rounds_report,
+         ('previous_standings', 'previous_matches')),
+        ('insta.standings', lambda: instagram_posts.generate_current_standings_post(None, renderer),
+         ('current_standings',)),
+        ('insta.matches_summary', lambda: instagram_posts.generate_matches_summary_post(None, renderer, 'all'),
+         ('current_matches',)),
+        ('insta.leaderboard', lambda: instagram_posts.generate_leaderboard_post(None, renderer),
+         ('leaderboard',)),
+    ]
+
+
+def _reset_build_state():
+    """
+    Forgets what earlier runs archived: deletes the frozen rounds and the
+    build manifest, so every run reads closed rounds from the database and
+    renders them in full instead of taking the archived path.
+    """
+    build_manifest = importlib.import_module('build_manifest')
+    round_archive = importlib.import_module('round_archive')
+    shutil.rmtree(round_archive.ROUND_ARCHIVE_DIR, ignore_errors=True)
+    if os.path.exists(build_manifest.BUILD_MANIFEST_PATH):
+        os.remove(build_manifest.BUILD_MANIFEST_PATH)
+    build_manifest.reset_manifest()
+
+
+def _time_call(func):
+    _reset_build_state()
+    gc.collect()
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def _peak_memory(func):
+    """Peak Python heap allocated while func runs, in bytes (tracemalloc)."""
+    _reset_build_state()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmarks(db_path, repeat=3, renderer='pillow'):
+    """
+    Times every report and post generator end to end against a SQLite league.
+
+    Args:
+        db_path (str): League database (see synthetic_league.py).
+        repeat (int): Timed runs per generator; the median is reported. Each
+            run starts without archived rounds, so all of them do the full work.
+        renderer (str): Instagram backend, 'pillow' or 'playwright' (HTML only;
+            screenshots are not part of the benchmark).
+
+    Returns:
+        list: One dict per generator with seconds, rows, rows_per_second and peak_bytes.
+    """
+    league_db.use_sqlite(db_path)
+    # Imported after changing directory: both scripts create their output folders on import.
+    html_reports = importlib.import_module('generate_html_reports')
+    instagram_posts = importlib.import_module('generate_instagram_posts')
+    build_manifest = importlib.import_module('build_manifest')
+    league_snapshot = importlib.import_module('league_snapshot')
+    site_includes = importlib.import_module('site_includes')
+    for source in site_includes.PARTIALS.values():
+        shutil.copy(os.path.join(SITE_SOURCE_DIR, source), html_reports.output_dir)
+    # Always render, so repeated runs are not skipped as unchanged.
+    build_manifest.FORCE_REBUILD = True
+
+    extract_seconds, snapshot = _time_call(league_snapshot.extract_league_snapshot)
+    results = [{
+        'name': 'snapshot.extract',
+        'seconds': extract_seconds,
+        'rows': sum(len(rows) for rows in snapshot[2:]),
+        'peak_bytes': _peak_memory(league_snapshot.extract_league_snapshot),
+    }]
+
+    for name, func, fields in _benchmarks(html_reports, instagram_posts, renderer):
+        timings = []
+        for _ in range(repeat):
+            seconds, output = _time_call(func)
+            if output is None:
+                raise RuntimeError(f"{name} failed; see the error above.")
+            timings.append(seconds)
+        results.append({
+            'name': name,
+            'seconds': statistics.median(timings),
+            'rows': sum(len(getattr(snapshot, field)) for field in fields),
+            'peak_bytes': _peak_memory(func),
+        })
+
+    for result in results:
+        result['rows_per_second'] = result['rows'] / result['seconds'] if result['seconds'] else 0.0
+    league_db.close_pool()
+    return results
+
+
+def print_results(results, label):
+    print(f"\n--- Benchmark: {label} ---")
+    print(f"  {'generator':<30} {'median s':>9} {'rows':>9} {'rows/s':>11} {'peak MiB':>9}")
+    for result in results:
+        print(
+            f"  {result['name']:<30} {result['seconds']:>9.3f} {result['rows']:>9} "
+            f"{result['rows_per_second']:>11.0f} {result['peak_bytes'] / 2 ** 20:>9.1f}"
+        )
+
+
+# --- Main execution block ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the HTML report and Instagram post generators on a synthetic league."
+    )
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='small',
+                        help="League size (players/boxes/rounds): " + ", ".join(
+                            f"{name} {players}/{boxes}/{rounds}"
+                            for name, (players, boxes, rounds) in sorted(PRESETS.items())))
+    parser.add_argument('--players', type=int, help="Override the preset's number of players.")
+    parser.add_argument('--boxes', type=int, help="Override the preset's number of boxes.")
+    parser.add_argument('--rounds', type=int, help="Override the preset's number of rounds.")
+    parser.add_argument('--db', help="Benchmark an existing SQLite league instead of generating one.")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per generator (default 3).")
+    parser.add_argument('--renderer', choices=('pillow', 'playwright'), default='pillow',
+                        help="Instagram renderer; playwright only times writing the HTML.")
+    parser.add_argument('--json', metavar='PATH', help="Also write the results as JSON.")
+    args = parser.parse_args()
+
+    players, boxes, rounds = PRESETS[args.preset]
+    players = args.players or players
+    boxes = args.boxes or boxes
+    rounds = args.rounds or rounds
+
+    os.makedirs(BENCHMARK_DIR, exist_ok=True)
+    db_path = os.path.abspath(args.db) if args.db else None
+    json_path = os.path.abspath(args.json) if args.json else None
+    os.chdir(BENCHMARK_DIR)
+
+    if db_path is None:
+        db_path = os.path.abspath(f"league_{players}p_{boxes}b_{rounds}r.sqlite3")
+        if not os.path.exists(db_path):
+            start = time.perf_counter()
+            counts = synthetic_league.generate_league(db_path, players, boxes, rounds)
+            print(f"Generated {os.path.basename(db_path)} in {time.perf_counter() - start:.1f}s: "
+                  + ", ".join(f"{count} {table}" for table, count in counts.items()))
+        label = f"{players} players, {boxes} boxes, {rounds} rounds"
+    else:
+        label = os.path.basename(db_path)
+
+    results = run_benchmarks(db_path, args.repeat, args.renderer)
+    print_results(results, label)
+
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({'league': label, 'results': results}, f, indent=2)
+        print(f"Wrote {json_path}")
@@ -0,0 +1,179 @@
+import datetime
+import hashlib
+import json
+import os
+import threading
+
+# Stored next to the scripts rather than in docs/ so it is never published.
+BUILD_MANIFEST_PATH = 'build_manifest.json'
+
+# Set to True (e.g. from --force) to render every page even if its inputs match.
+FORCE_REBUILD = False
+
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+
+def _json_default(value):
+    """Lets pyodbc rows, dates and decimals take part in input hashes."""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    try:
+        return list(value)
+    except TypeError:
+        return str(value)
+
+
+def hash_inputs(*parts):
+    """Returns a stable SHA-256 of the data (rows, values) a page is rendered from."""
+    payload = json.dumps(parts, default=_json_default, separators=(',', ':'), sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def hash_file(path):
+    """Returns the SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """
+    Remembers, per output page, the hash of the data it was rendered from, the
+    hash of the rendered body and when that data last changed, so unchanged
+    pages can be skipped and re-renders don't rewrite identical bytes.
+    """
+
+    def __init__(self, path=BUILD_MANIFEST_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.pages = {}
+        # Closed rounds whose archive page has been written: round id -> page,
+        # generator and the [match_count, checksum] of the matches it shows.
+        self.archived_rounds = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.pages = data.get('pages', {})
+                self.archived_rounds = data.get('archived_rounds', {})
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable build manifest {path}: {e}")
+
+    def is_unchanged(self, page, input_hash, output_path):
+        """True when the page's inputs match the last build and its file still exists."""
+        if FORCE_REBUILD:
+            return False
+        with self._lock:
+            entry = self.pages.get(page)
+        return bool(entry) and entry.get('input_hash') == input_hash and os.path.exists(output_path)
+
+    def data_changed_at(self, page, input_hash, default):
+        """When the page's data last changed: the recorded time if the inputs still match, else default."""
+        with self._lock:
+            entry = self.pages.get(page)
+        if entry and entry.get('input_hash') == input_hash and entry.get('data_changed_at'):
+            return datetime.datetime.strptime(entry['data_changed_at'], TIMESTAMP_FORMAT)
+        return default
+
+    def commit_page(self, page, writer, input_hash, data_changed_at):
+        """
+        Finishes a page streamed through html_writer.PageWriter: moves it into
+        place unless identical bytes are already on disk, and records it.
+
+        Returns:
+            bool: True if the file was (re)written.
+        """
+        writer.close()
+        with self._lock:
+            entry = self.pages.get(page, {})
+        written = False
+        if entry.get('body_hash') != writer.body_hash or not os.path.exists(writer.output_path):
+            writer.commit()
+            written = True
+        else:
+            writer.discard()
+        self.record(page, input_hash, writer.body_hash, data_changed_at)
+        return written
+
+    def record(self, page, input_hash, body_hash, data_changed_at):
+        with self._lock:
+            self.pages[page] = {
+                'input_hash': input_hash,
+                'body_hash': body_hash,
+                'data_changed_at': data_changed_at.strftime(TIMESTAMP_FORMAT),
+            }
+
+    def page_names(self):
+        """Every page the manifest has an entry for."""
+        with self._lock:
+            return list(self.pages)
+
+    def forget_page(self, page):
+        """Drops the entry of a page that is no longer generated, after its file is removed."""
+        with self._lock:
+            self.pages.pop(page, None)
+
+    def archived_round_checksums(self, generator_fingerprint):
+        """
+        Closed rounds whose archive page exists and was rendered by the current
+        generator, as round id -> [match_count, checksum] at the time. While a
+        round's checksum is unchanged it needs neither re-reading nor
+        re-rendering. Empty when FORCE_REBUILD is set.
+        """
+        if FORCE_REBUILD:
+            return {}
+        with self._lock:
+            entries = list(self.archived_rounds.items())
+        return {
+            int(round_id): entry.get('checksum')
+            for round_id, entry in entries
+            if entry.get('generator') == generator_fingerprint and os.path.exists(entry.get('page', ''))
+        }
+
+    def record_archived_round(self, round_id, page_path, generator_fingerprint, checksum):
+        with self._lock:
+            self.archived_rounds[str(round_id)] = {
+                'page': page_path,
+                'generator': generator_fingerprint,
+                'checksum': list(checksum),
+                'archived_at': datetime.datetime.now().strftime(TIMESTAMP_FORMAT),
+            }
+
+    def save(self):
+        with self._lock:
+            data = {
+                'pages': dict(sorted(self.pages.items())),
+                'archived_rounds': dict(sorted(self.archived_rounds.items(), key=lambda item: int(item[0]))),
+            }
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp_path, self.path)
+
+
+_manifest = None
+_manifest_lock = threading.Lock()
+
+
+def get_manifest():
+    """Returns the build manifest shared by every report in this run."""
+    global _manifest
+    with _manifest_lock:
+        if _manifest is None:
+            _manifest = BuildManifest()
+        return _manifest
+
+
+def reset_manifest():
+    """Drops the shared manifest without saving it; the next get_manifest() reloads it from disk."""
+    global _manifest
+    with _manifest_lock:
+        _manifest = None
+
+
+def save_manifest():
+    """Saves the shared manifest if it was used during this run."""
+    if _manifest is not None:
+        _manifest.save()
@@ -0,0 +1,148 @@
+import datetime
+import functools
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# Report that stages are charged to when no report() block is active.
+DEFAULT_REPORT = 'build'
+
+_FROM_RE = re.compile(r'\bFROM\s+(?:dbo\.)?\[?(\w+)', re.IGNORECASE)
+
+_lock = threading.Lock()
+_reports = OrderedDict()
+_state = threading.local()
+
+
+class ReportMetrics:
+    """Time per stage, rows fetched and bytes written for one report or post."""
+
+    def __init__(self, name):
+        self.name = name
+        self.stages = OrderedDict()
+        self.rows_fetched = 0
+        self.bytes_written = 0
+
+    def add(self, stage_name, seconds):
+        entry = self.stages.setdefault(stage_name, {'seconds': 0.0, 'calls': 0})
+        entry['seconds'] += seconds
+        entry['calls'] += 1
+
+    def to_dict(self):
+        return {
+            'seconds': sum(entry['seconds'] for entry in self.stages.values()),
+            'rows_fetched': self.rows_fetched,
+            'bytes_written': self.bytes_written,
+            'stages': {name: dict(entry) for name, entry in self.stages.items()},
+        }
+
+
+def _current_report():
+    name = getattr(_state, 'report', None) or DEFAULT_REPORT
+    with _lock:
+        report_metrics = _reports.get(name)
+        if report_metrics is None:
+            report_metrics = _reports[name] = ReportMetrics(name)
+    return report_metrics
+
+
+def _stack():
+    stack = getattr(_state, 'stack', None)
+    if stack is None:
+        stack = _state.stack = []
+    return stack
+
+
+@contextmanager
+def report(name):
+    """Charges every stage, row and byte recorded in this thread to the named report."""
+    previous = getattr(_state, 'report', None)
+    _state.report = name
+    try:
+        yield
+    finally:
+        _state.report = previous
+
+
+def add_stage_time(stage_name, seconds):
+    """
+    Records time measured elsewhere (e.g. a query) as a stage of the current
+    report. It is not counted again in the enclosing stage's own time.
+    """
+    report_metrics = _current_report()
+    with _lock:
+        report_metrics.add(stage_name, seconds)
+    stack = _stack()
+    if stack:
+        stack[-1][1] += seconds
+
+
+@contextmanager
+def stage(stage_name):
+    """
+    Times a block as a stage of the current report. Stages nest: a stage's
+    recorded time excludes the time of stages (and queries) inside it, so no
+    time is counted twice when a report's stages are added up.
+    """
+    stack = _stack()
+    frame = [stage_name, 0.0]
+    stack.append(frame)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stack.pop()
+        report_metrics = _current_report()
+        with _lock:
+            report_metrics.add(stage_name, elapsed - frame[1])
+        if stack:
+            stack[-1][1] += elapsed
+
+
+def add_rows(count):
+    report_metrics = _current_report()
+    with _lock:
+        report_metrics.rows_fetched += count
+
+
+def add_bytes(count):
+    report_metrics = _current_report()
+    with _lock:
+        report_metrics.bytes_written += count
+
+
+@functools.lru_cache(maxsize=256)
+def query_stage_name(sql):
+    """Names a query's stage after the first table or view it reads, e.g. 'query:vw_CurrentStandings'."""
+    match = _FROM_RE.search(sql)
+    return f"query:{match.group(1)}" if match else 'query'
+
+
+def get_metrics():
+    """Returns every report's metrics as plain dicts, in the order they first recorded something."""
+    with _lock:
+        return OrderedDict((name, metrics.to_dict()) for name, metrics in _reports.items())
+
+
+def write_metrics_json(path, wall_seconds, **extra):
+    """
+    Writes the collected metrics as JSON, so builds can be compared over time.
+
+    Args:
+        path (str): Output file.
+        wall_seconds (float): Wall-clock duration of the whole build.
+        **extra: Further top-level fields, e.g. database counters or options.
+    """
+    data = {
+        'generated_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'wall_seconds': wall_seconds,
+    }
+    data.update(extra)
+    data['reports'] = get_metrics()
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    print(f"Wrote build metrics to {path}")
@@ -0,0 +1,77 @@
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import build_metrics
+
+# Outcome of one build task.
+#   status: 'ok' or 'failed'
+#   errors: messages reported through note_error while the task ran
+TaskResult = namedtuple('TaskResult', ['name', 'status', 'seconds', 'result', 'errors'])
+
+_task_state = threading.local()
+
+
+def note_error(message):
+    """
+    Prints an error message and, when called from a task started by run_tasks,
+    records it against that task so it shows up in the build summary.
+    """
+    print(message)
+    errors = getattr(_task_state, 'errors', None)
+    if errors is not None:
+        errors.append(message)
+
+
+def _run_task(name, func, args):
+    _task_state.errors = []
+    start = time.perf_counter()
+    try:
+        with build_metrics.report(name):
+            result = func(*args)
+    except Exception as e:
+        result = None
+        note_error(f"Unhandled error in {name}: {e}")
+    seconds = time.perf_counter() - start
+    errors = _task_state.errors
+    _task_state.errors = None
+    # Generators report failure by returning None after printing the error.
+    status = 'failed' if errors or result is None else 'ok'
+    return TaskResult(name, status, seconds, result, errors)
+
+
+def run_tasks(tasks, jobs=1):
+    """
+    Runs independent build tasks, concurrently when jobs > 1.
+
+    Threads rather than processes are used: the tasks spend their time on
+    database and file I/O, and they share the in-memory league snapshot.
+
+    Args:
+        tasks (list): (name, callable, args) tuples.
+        jobs (int): Maximum number of tasks to run at once.
+
+    Returns:
+        list: A TaskResult per task, in the order the tasks were given.
+    """
+    if jobs <= 1:
+        return [_run_task(name, func, args) for name, func, args in tasks]
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(_run_task, name, func, args) for name, func, args in tasks]
+        return [future.result() for future in futures]
+
+
+def print_summary(results, wall_seconds):
+    """Prints each task's status and timing, followed by any collected errors."""
+    width = max((len(r.name) for r in results), default=0)
+    print("\n--- Build summary ---")
+    for r in results:
+        print(f"  {r.name:<{width}}  {r.status:<6}  {r.seconds:7.2f}s")
+    busy = sum(r.seconds for r in results)
+    print(f"  Wall-clock {wall_seconds:.2f}s (tasks took {busy:.2f}s in total)")
+    failed = [r for r in results if r.status != 'ok']
+    for r in failed:
+        print(f"  {r.name} failed:")
+        for message in r.errors or ["returned no output"]:
+            print(f"    {message}")
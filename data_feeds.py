@@ -0,0 +1,174 @@
+import datetime
+import decimal
+import hashlib
+import json
+import os
+import re
+from collections import defaultdict
+
+import build_manifest
+import build_metrics
+import build_runner
+import html_writer
+import league_db
+import league_snapshot
+
+# --- Configuration ---
+# Bump FEED_VERSION when a feed's layout changes; old and new clients then
+# read from different folders, so a cached page never gets data it can't render.
+FEED_VERSION = 1
+FEEDS_DIR = os.path.join('docs', 'data', f'v{FEED_VERSION}')
+
+# Characters of the content hash appended to feed URLs (?v=...), so browsers
+# may cache a feed for as long as its bytes are unchanged.
+VERSION_HASH_LENGTH = 12
+
+STANDINGS_HEADINGS = ['Rank', 'Player', 'Played', 'Wins', 'Losses', 'Draws', 'Points']
+FIXTURES_HEADINGS = ['Player 1', 'Player 2', 'Score (P1-P2)', 'Winner', 'Played On']
+LEADERBOARD_HEADINGS = ['Rank', 'Player', 'Played', 'Won', 'Lost', 'Draw', 'Games Won', 'Sets Won', 'Points']
+
+
+def slugify(name):
+    """Turns a box name into a file name, e.g. 'Box 1' -> 'box-1'."""
+    return re.sub(r'[^a-z0-9]+', '-', (name or 'box').lower()).strip('-') or 'box'
+
+
+def _json_default(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    return str(value)
+
+
+def _encode(payload):
+    return json.dumps(payload, default=_json_default, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _write_feed(manifest, relative_path, payload, extracted_at):
+    """
+    Writes one feed file unless identical bytes are already on disk.
+
+    Returns:
+        tuple: (url relative to FEEDS_DIR with ?v=<hash>, when its data last changed)
+    """
+    data = _encode(payload)
+    version = hashlib.sha256(data).hexdigest()[:VERSION_HASH_LENGTH]
+    output_path = os.path.join(FEEDS_DIR, *relative_path.split('/'))
+    page = f"data/v{FEED_VERSION}/{relative_path}"
+    data_changed_at = manifest.data_changed_at(page, version, extracted_at)
+    if not manifest.is_unchanged(page, version, output_path):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with html_writer.PageWriter(output_path) as writer:
+            writer.write(data.decode('utf-8'))
+            manifest.commit_page(page, writer, version, data_changed_at)
+    return f"{relative_path}?v={version}", data_changed_at
+
+
+def _standings_rows(rows):
+    # vw_CurrentStandings: RoundName, BoxName, PlayerName, MatchesPlayed, Wins, Losses, Draws, Points, RankInBox
+    return [[row[8], row[2], row[3], row[4], row[5], row[6], row[7]] for row in rows]
+
+
+def _fixture_rows(rows):
+    # vw_CurrentRoundMatches: RoundName, BoxName, Player1Name, Player2Name, Score, WinnerName, PlayedOn, ...
+    return [
+        [row[2], row[3], row[4], row[5], row[6].strftime("%Y-%m-%d") if row[6] is not None else 'Not Played']
+        for row in rows
+    ]
+
+
+def _leaderboard_rows(rows):
+    # vw_OverallLeaderboard: PlayerName, MatchesPlayed, MatchesWon, GamesWon, SetsWon, MatchesLost, MatchesDraw, TotalPoints, OverallRank
+    return [[row[8], row[0], row[1], row[2], row[5], row[6], row[3], row[4], row[7]] for row in rows]
+
+
+def generate_data_feeds(snapshot=None):
+    """
+    Writes the league data as small versioned JSON files under docs/data/v1,
+    for docs/js/league-data.js to render in the browser:
+
+        rounds.json                 index: current round, boxes, feed URLs, previous rounds
+        standings/<box>.json        current standings of one box
+        fixtures/<box>.json         current round fixtures of one box
+        leaderboard.json            overall leaderboard
+
+    Every feed is {"version", "headings", "rows"} with rows in display order.
+    rounds.json links each feed with a content hash (?v=...), so only the
+    index has to be revalidated; a score update rewrites one or two box feeds
+    and the index, and leaves every other file byte-for-byte unchanged.
+
+    Returns:
+        str: Path of rounds.json, or None on error.
+    """
+    try:
+        if snapshot is None:
+            with build_metrics.stage('extract'):
+                snapshot = league_snapshot.extract_league_snapshot()
+        manifest = build_manifest.get_manifest()
+
+        with build_metrics.stage('group'):
+            standings_by_box = defaultdict(list)
+            for row in snapshot.current_standings:
+                standings_by_box[row[1]].append(row)
+            fixtures_by_box = defaultdict(list)
+            for row in snapshot.current_matches:
+                fixtures_by_box[row[1]].append(row)
+
+        with build_metrics.stage('render'):
+            boxes = []
+            changed_times = []
+            for box_name in sorted(set(standings_by_box) | set(fixtures_by_box)):
+                slug = slugify(box_name)
+                box = {'name': box_name, 'slug': slug}
+                if box_name in standings_by_box:
+                    box['standings'], changed_at = _write_feed(manifest, f"standings/{slug}.json", {
+                        'version': FEED_VERSION, 'box': box_name, 'headings': STANDINGS_HEADINGS,
+                        'rows': _standings_rows(standings_by_box[box_name]),
+                    }, snapshot.extracted_at)
+                    changed_times.append(changed_at)
+                if box_name in fixtures_by_box:
+                    box['fixtures'], changed_at = _write_feed(manifest, f"fixtures/{slug}.json", {
+                        'version': FEED_VERSION, 'box': box_name, 'headings': FIXTURES_HEADINGS,
+                        'rows': _fixture_rows(fixtures_by_box[box_name]),
+                    }, snapshot.extracted_at)
+                    changed_times.append(changed_at)
+                boxes.append(box)
+
+            leaderboard_url, changed_at = _write_feed(manifest, "leaderboard.json", {
+                'version': FEED_VERSION, 'headings': LEADERBOARD_HEADINGS,
+                'rows': _leaderboard_rows(snapshot.leaderboard),
+            }, snapshot.extracted_at)
+            changed_times.append(changed_at)
+
+            current_round = None
+            if snapshot.current_round:
+                current_round = {
+                    'name': snapshot.current_round[0],
+                    'start_date': snapshot.current_round[1],
+                    'end_date': snapshot.current_round[2],
+                }
+            index = {
+                'version': FEED_VERSION,
+                'data_changed_at': max(changed_times).strftime(build_manifest.TIMESTAMP_FORMAT),
+                'current_round': current_round,
+                'boxes': boxes,
+                'leaderboard': leaderboard_url,
+                'previous_rounds': [
+                    {'id': round_id, 'name': name, 'start_date': start_date, 'end_date': end_date,
+                     'page': f"previous_round_{round_id}.html"}
+                    for round_id, name, start_date, end_date in snapshot.previous_rounds
+                ],
+            }
+            _write_feed(manifest, "rounds.json", index, snapshot.extracted_at)
+
+        index_path = os.path.join(FEEDS_DIR, 'rounds.json')
+        print(f"Wrote data feeds for {len(boxes)} box(es) to {FEEDS_DIR}")
+        return index_path
+
+    except league_db.DatabaseError as ex:
+        sqlstate = ex.args[0]
+        build_runner.note_error(f"Database error in generate_data_feeds: {sqlstate} - {ex}")
+    except Exception as e:
+        build_runner.note_error(f"An unexpected error occurred in generate_data_feeds: {e}")
+    return None
@@ -0,0 +1,76 @@
+(function() {
+var FEED_ROOT = 'data/v1/';
+function fetchJson(url, options) {
+return fetch(FEED_ROOT + url, options).then(function(response) {
+if (!response.ok) throw new Error('Could not load ' + url);
+return response.json();
+});
+}
+function buildTable(feed) {
+var table = document.createElement('table');
+table.className = 'data-table';
+var headRow = table.createTHead().insertRow();
+feed.headings.forEach(function(heading) {
+var th = document.createElement('th');
+th.textContent = heading;
+headRow.appendChild(th);
+});
+var body = table.createTBody();
+feed.rows.forEach(function(row) {
+var tr = body.insertRow();
+row.forEach(function(value) {
+tr.insertCell().textContent = value === null ? '' : value;
+});
+});
+return table;
+}
+function feedUrl(index, element) {
+var kind = element.getAttribute('data-feed');
+if (kind === 'leaderboard') return index.leaderboard;
+var slug = element.getAttribute('data-box');
+for (var i = 0; i < index.boxes.length; i++) {
+if (index.boxes[i].slug === slug) return index.boxes[i][kind];
+}
+return null;
+}
+function showLastUpdated(index) {
+var lastUpdated = document.getElementById('last-updated');
+if (!lastUpdated || !index.data_changed_at) return;
+var changedAt = new Date(index.data_changed_at);
+lastUpdated.textContent = changedAt.toLocaleString('en-GB', {
+day: '2-digit', month: 'short', year: 'numeric',
+hour: '2-digit', minute: '2-digit', second: '2-digit'
+});
+}
+function renderFeeds() {
+var targets = document.querySelectorAll('[data-feed]');
+if (!targets.length) return;
+fetchJson('rounds.json', { cache: 'no-cache' })
+.then(function(index) {
+showLastUpdated(index);
+var pending = [];
+targets.forEach(function(element) {
+var url = feedUrl(index, element);
+if (!url) {
+element.innerHTML = "<p class='no-data-message'>No data available yet.</p>";
+return;
+}
+pending.push(fetchJson(url).then(function(feed) {
+element.innerHTML = '';
+element.appendChild(buildTable(feed));
+}));
+});
+return Promise.all(pending);
+})
+.then(function() {
+window.dispatchEvent(new Event('resize'));
+})
+.catch(function(error) {
+console.error('Error loading league data:', error);
+targets.forEach(function(element) {
+element.innerHTML = "<p class='no-data-message'>Could not load the latest results. Please try again later.</p>";
+});
+});
+}
+document.addEventListener('DOMContentLoaded', renderFeeds);
+})();
\ No newline at end of file
@@ -0,0 +1,49 @@
+// --- Report pages: frozen columns and hamburger menu ---
+window.addEventListener('load', function() {
+    function adjustFrozenColumns() {
+        document.querySelectorAll('.data-table').forEach(function(table) {
+            var firstCol = table.querySelector('th:nth-child(1)');
+            if (firstCol) {
+                var firstColWidth = firstCol.offsetWidth;
+                var secondCols = table.querySelectorAll('th:nth-child(2), td:nth-child(2)');
+                secondCols.forEach(function(cell) {
+                    cell.style.left = firstColWidth + 'px';
+                });
+            }
+        });
+    }
+    
+    adjustFrozenColumns();
+    window.addEventListener('resize', adjustFrozenColumns);
+    
+    // Hamburger menu toggle - slides in from right
+    var menuToggle = document.querySelector('.menu-toggle');
+    var navMenu = document.querySelector('nav');
+    
+    if (menuToggle && navMenu) {
+        menuToggle.addEventListener('click', function(e) {
+            e.stopPropagation();
+            navMenu.classList.toggle('active');
+            
+            var isExpanded = navMenu.classList.contains('active');
+            menuToggle.setAttribute('aria-expanded', isExpanded);
+        });
+        
+        // Close menu when clicking on overlay
+        navMenu.addEventListener('click', function(e) {
+            if (e.target === navMenu) {
+                navMenu.classList.remove('active');
+                menuToggle.setAttribute('aria-expanded', 'false');
+            }
+        });
+        
+        // Close menu when clicking on a navigation link
+        var navLinks = navMenu.querySelectorAll('a');
+        navLinks.forEach(function(link) {
+            link.addEventListener('click', function() {
+                navMenu.classList.remove('active');
+                menuToggle.setAttribute('aria-expanded', 'false');
+            });
+        });
+    }
+});
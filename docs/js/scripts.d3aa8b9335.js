@@ -0,0 +1,70 @@
+document.addEventListener('DOMContentLoaded', function() {
+initializeNavigationMenu();
+if (document.getElementById('roles-nav')) {
+attachRoleClickListener();
+}
+});
+function initializeNavigationMenu() {
+var menuToggle = document.querySelector('.menu-toggle');
+var navMenu = document.querySelector('nav');
+if (menuToggle && navMenu) {
+menuToggle.addEventListener('click', function(e) {
+e.stopPropagation();
+navMenu.classList.toggle('active');
+menuToggle.setAttribute('aria-expanded', navMenu.classList.contains('active'));
+});
+navMenu.addEventListener('click', function(e) {
+if (e.target === navMenu) {
+navMenu.classList.remove('active');
+menuToggle.setAttribute('aria-expanded', 'false');
+navMenu.querySelectorAll('.dropdown').forEach(function(d) {
+d.classList.remove('open');
+});
+}
+});
+navMenu.querySelectorAll('a:not(.dropdown > a)').forEach(function(link) {
+link.addEventListener('click', function() {
+navMenu.classList.remove('active');
+menuToggle.setAttribute('aria-expanded', 'false');
+navMenu.querySelectorAll('.dropdown').forEach(function(d) {
+d.classList.remove('open');
+});
+});
+});
+navMenu.querySelectorAll('.dropdown > a').forEach(function(link) {
+link.addEventListener('click', function(e) {
+if (window.innerWidth <= 768) {
+e.preventDefault();
+e.stopPropagation();
+var parentLi = this.parentElement;
+var wasOpen = parentLi.classList.contains('open');
+navMenu.querySelectorAll('.dropdown').forEach(function(d) {
+d.classList.remove('open');
+});
+if (!wasOpen) {
+parentLi.classList.add('open');
+}
+}
+});
+});
+}
+}
+function attachRoleClickListener() {
+const rolesNav = document.getElementById('roles-nav');
+if (rolesNav) {
+rolesNav.addEventListener('click', (event) => {
+const clickedButton = event.target.closest('.tab-button');
+if (clickedButton) {
+const roleId = clickedButton.getAttribute('data-role-id');
+showRoleDetails(roleId, clickedButton);
+}
+});
+}
+}
+function showRoleDetails(roleId, clickedButtonElement) {
+document.querySelectorAll('.role-advert').forEach(advert => advert.classList.add('hidden'));
+document.querySelectorAll('.tab-button').forEach(button => button.classList.remove('active'));
+const selectedAdvert = document.getElementById(roleId);
+if (selectedAdvert) selectedAdvert.classList.remove('hidden');
+if (clickedButtonElement) clickedButtonElement.classList.add('active');
+}
\ No newline at end of file
@@ -1,81 +1,19 @@
 // --- Shared initialisation on DOM ready ---
+// The header, footer and volunteer roles are written into each page at build
+// time by site_includes.py, so only the behaviour is wired up here.
 document.addEventListener('DOMContentLoaded', function() {
 
-    // 1. LOAD SHARED HEADER & INITIALIZE MENU LOGIC
-    var headerPlaceholder = document.getElementById('header-placeholder');
-    if (headerPlaceholder) {
-        fetch('header.html')
-            .then(function(response) {
-                if (!response.ok) throw new Error('Header load failed');
-                return response.text();
-            })
-            .then(function(data) {
-                headerPlaceholder.innerHTML = data;
-                
-                // Set the active class styling automatically based on current page
-                setActiveNavigationLink();
+    // 1. NAVIGATION MENU
+    initializeNavigationMenu();
 
-                // Run your interactive navigation menu script now that elements exist!
-                initializeNavigationMenu();
-            })
-            .catch(function(error) {
-                console.error('Error loading header:', error);
-            });
-    }
-
-    // 2. LOAD SHARED FOOTER
-    var footerPlaceholder = document.getElementById('footer-placeholder');
-    if (footerPlaceholder) {
-        fetch('footer.html')
-            .then(function(response) {
-                if (!response.ok) throw new Error('Footer load failed');
-                return response.text();
-            })
-            .then(function(data) {
-                footerPlaceholder.innerHTML = data;
-            })
-            .catch(function(error) {
-                console.error('Error loading footer:', error);
-            });
-    }
-
-    // 3. VOLUNTEER ROLES MODULE (Only runs if element exists on page)
-    var rolesContent = document.getElementById('roles-content');
-    if (rolesContent) {
-        fetch('roles.json')
-            .then(function(response) {
-                if (!response.ok) throw new Error('Could not load roles.json');
-                return response.json();
-            })
-            .then(function(roles) {
-                generateRoleContent(roles);
-                attachRoleClickListener();
-            })
-            .catch(function(error) {
-                console.error('Error loading roles:', error);
-                rolesContent.innerHTML = '<p style="padding: 20px; color: red; font-weight: bold;">Error: Failed to load opportunities. Please check the roles.json file.</p>';
-            });
+    // 2. VOLUNTEER ROLES MODULE (Only runs if element exists on page)
+    if (document.getElementById('roles-nav')) {
+        attachRoleClickListener();
     }
 
 });
 
 
-// --- Helper: Dynamic Active Link Selector ---
-function setActiveNavigationLink() {
-    var currentPath = window.location.pathname.split("/").pop();
-    var currentPage = currentPath === "" ? "index.html" : currentPath;
-    var navLinks = document.querySelectorAll('#header-placeholder nav a');
-
-    navLinks.forEach(function(link) {
-        if (link.getAttribute('href') === currentPage) {
-            link.classList.add('active');
-        } else {
-            link.classList.remove('active');
-        }
-    });
-}
-
-
 // --- Helper: Modularized Navigation Menu Controls ---
 function initializeNavigationMenu() {
     var menuToggle = document.querySelector('.menu-toggle');
@@ -150,42 +88,3 @@ function showRoleDetails(roleId, clickedButtonElement) {
     if (selectedAdvert) selectedAdvert.classList.remove('hidden');
     if (clickedButtonElement) clickedButtonElement.classList.add('active');
 }
-
-function generateRoleContent(roles) {
-    const rolesNav = document.getElementById('roles-nav');
-    const rolesContent = document.getElementById('roles-content');
-
-    if (!rolesNav || !rolesContent) return;
-
-    rolesContent.innerHTML = '';
-
-    roles.forEach((role, index) => {
-        const isActive = index === 0;
-        const buttonClass = isActive ? 'tab-button active' : 'tab-button';
-
-        rolesNav.insertAdjacentHTML('beforeend', `
-            <button class="${buttonClass}" data-role-id="${role.id}">
-                <strong>${role.title}</strong>
-                <p>${role.subtitle}</p>
-            </button>
-        `);
-
-        const advertClass = isActive ? 'role-advert active' : 'role-advert hidden';
-        const mailtoLink = `mailto:hello@tennisnerds.org?subject=${role.linkSubject}`;
-        const detailsList = role.details.map(detail => `<li>${detail}</li>`).join('');
-
-        rolesContent.insertAdjacentHTML('beforeend', `
-            <article id="${role.id}" class="${advertClass}">
-                <h2>${role.heading}</h2>
-                <p>${role.description}</p>
-                <ul>${detailsList}</ul>
-                <a href="${mailtoLink}" class="cta-button ${role.buttonClass}">${role.linkText}</a>
-            </article>
-        `);
-    });
-
-    if (roles.length > 0) {
-        const firstButton = document.querySelector(`.tab-button[data-role-id="${roles[0].id}"]`);
-        showRoleDetails(roles[0].id, firstButton);
-    }
-}
\ No newline at end of file
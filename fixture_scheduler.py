@@ -0,0 +1,146 @@
+import datetime
+from collections import defaultdict
+
+# Matches are scheduled by the week; week 1 starts on the round's start_date.
+WEEK_DAYS = 7
+
+
+def round_weeks(start_date, end_date):
+    """
+    Splits a round into weeks starting on start_date; a final partial week counts.
+
+    Returns:
+        list: The start date of each week.
+    """
+    days = (end_date - start_date).days + 1
+    week_count = max(1, -(-days // WEEK_DAYS))
+    return [start_date + datetime.timedelta(days=WEEK_DAYS * week) for week in range(week_count)]
+
+
+def circle_method_slots(player_ids):
+    """
+    Splits a round robin into slots in which every player plays at most once
+    (the circle method): one player stays fixed while the others rotate.
+
+    Args:
+        player_ids (list): Players of one box.
+
+    Returns:
+        list: Slots, each a list of (player1_id, player2_id) pairs. An odd box
+            gets one slot per player, each with one player on a bye.
+    """
+    players = list(player_ids)
+    if len(players) < 2:
+        return []
+    if len(players) % 2:
+        players.append(None)
+    count = len(players)
+    slots = []
+    for slot in range(count - 1):
+        pairs = []
+        for index in range(count // 2):
+            player1, player2 = players[index], players[count - 1 - index]
+            if player1 is None or player2 is None:
+                continue
+            # Alternate who is listed first, so the fixed player is not always player 1.
+            pairs.append((player2, player1) if (slot + index) % 2 else (player1, player2))
+        slots.append(pairs)
+        players.insert(1, players.pop())
+    return slots
+
+
+def blocked_weeks(blackouts, week_starts):
+    """
+    Turns blackout periods into the weeks each player cannot play.
+
+    Args:
+        blackouts (list): (player_id, start_date, end_date) rows.
+        week_starts (list): From round_weeks().
+
+    Returns:
+        dict: player_id -> set of week indexes.
+    """
+    blocked = defaultdict(set)
+    for player_id, start_date, end_date in blackouts:
+        for week, week_start in enumerate(week_starts):
+            week_end = week_start + datetime.timedelta(days=WEEK_DAYS - 1)
+            if start_date <= week_end and end_date >= week_start:
+                blocked[player_id].add(week)
+    return blocked
+
+
+def schedule_box(player_ids, week_count, blocked=None):
+    """
+    Spreads one box's round robin over the round's weeks so nobody plays
+    twice in a week, then moves matches out of players' blackout weeks.
+
+    Circle-method slots are laid out evenly over the weeks. A match that
+    falls in a week one of its players has blocked moves to the nearest week
+    where both players are free and neither already plays. Failing that, it
+    goes to the free week where they already have the fewest matches (then
+    the nearest), doubling up as the even layout itself does when there are
+    fewer weeks than slots. Only a match with no week free of both players'
+    blackouts is left unscheduled.
+
+    Args:
+        player_ids (list): Players of the box.
+        week_count (int): Number of weeks in the round.
+        blocked (dict): player_id -> set of week indexes they cannot play.
+
+    Returns:
+        list: (player1_id, player2_id, week_index) with week_index None for
+            matches that could not be placed.
+    """
+    blocked = blocked or {}
+    slots = circle_method_slots(player_ids)
+    # (player_id, week) -> matches that player already has that week
+    games = defaultdict(int)
+    scheduled = []
+    to_repair = []
+    for slot_index, pairs in enumerate(slots):
+        # With fewer weeks than slots some weeks take two slots; that cannot be avoided.
+        week = slot_index * week_count // len(slots)
+        for player1, player2 in pairs:
+            if week in blocked.get(player1, ()) or week in blocked.get(player2, ()):
+                to_repair.append((player1, player2, week))
+                continue
+            games[(player1, week)] += 1
+            games[(player2, week)] += 1
+            scheduled.append((player1, player2, week))
+
+    for player1, player2, week in to_repair:
+        unavailable = blocked.get(player1, set()) | blocked.get(player2, set())
+        candidates = sorted(
+            (candidate for candidate in range(week_count) if candidate not in unavailable),
+            key=lambda candidate: (games[(player1, candidate)] + games[(player2, candidate)],
+                                   abs(candidate - week), candidate),
+        )
+        new_week = candidates[0] if candidates else None
+        if new_week is not None:
+            games[(player1, new_week)] += 1
+            games[(player2, new_week)] += 1
+        scheduled.append((player1, player2, new_week))
+    return scheduled
+
+
+def schedule_round(players_by_box, start_date, end_date, blackouts=()):
+    """
+    Schedules every box of a round.
+
+    Args:
+        players_by_box (dict): box_id -> list of player ids.
+        start_date (datetime.date): The round's start_date.
+        end_date (datetime.date): The round's end_date.
+        blackouts (list): (player_id, start_date, end_date) periods players cannot play.
+
+    Returns:
+        list: (box_id, player1_id, player2_id, week_start) with week_start None
+            for matches that could not be placed around blackouts.
+    """
+    week_starts = round_weeks(start_date, end_date)
+    blocked = blocked_weeks(blackouts, week_starts)
+    fixtures = []
+    for box_id, player_ids in players_by_box.items():
+        for player1, player2, week in schedule_box(player_ids, len(week_starts), blocked):
+            fixtures.append((box_id, player1, player2, None if week is None else week_starts[week]))
+    return fixtures
@@ -1,4 +1,44 @@
+import argparse
 import itertools # This library is great for generating combinations
+from collections import defaultdict
+
+import fixture_scheduler
+import league_db
+
+# SQL Server accepts at most 1000 rows in one INSERT ... VALUES list.
+MAX_VALUES_ROWS = 1000
+
+ROUND_ASSIGNMENTS_SQL = """
+    SELECT box_id, player_id
+    FROM dbo.box_assignments
+    WHERE round_id = ?
+    ORDER BY box_id, box_assignment_id
+"""
+
+ROUND_DATES_SQL = """
+    SELECT start_date, end_date
+    FROM dbo.rounds
+    WHERE id = ?
+"""
+
+# Blackouts of the round's players that overlap the round.
+ROUND_BLACKOUTS_SQL = """
+    SELECT PB.player_id, PB.start_date, PB.end_date
+    FROM dbo.player_blackouts PB
+    JOIN dbo.box_assignments BA ON BA.player_id = PB.player_id AND BA.round_id = ?
+    WHERE PB.start_date <= ? AND PB.end_date >= ?
+"""
+
+ROUND_PAIRS_SQL = """
+    SELECT player1_id, player2_id
+    FROM dbo.matches
+    WHERE round_id = ?
+"""
+
+INSERT_FIXTURE_SQL = """
+    INSERT INTO dbo.matches (round_id, box_id, player1_id, player2_id, scheduled_week)
+    VALUES (?, ?, ?, ?, ?)
+"""
 
 def generate_fixture_sql(round_id, box_id, player_ids):
     """
@@ -40,29 +80,145 @@ def generate_fixture_sql(round_id, box_id, player_ids):
 
     print("\n-- Remember: These matches are initially unplayed. Update them with scores later.")
 
+def plan_round_fixtures(db, round_id):
+    """
+    Works out the round-robin fixtures of every box in a round from
+    dbo.box_assignments, scheduled week by week between the round's dates
+    around players' blackouts (see fixture_scheduler.py). Pairs that already
+    have a match in the round (in either order) are left out, so the batch
+    can be re-run safely.
+
+    Args:
+        db (PooledConnection): Connection to read from.
+        round_id (int): The round to set up.
+
+    Returns:
+        tuple: (fixtures, box_count, existing_count) where fixtures is a list of
+            (round_id, box_id, player1_id, player2_id, scheduled_week) rows
+            still to insert; scheduled_week is None if no free week was found.
+    """
+    round_dates = db.fetch_one(ROUND_DATES_SQL, (round_id,))
+    if round_dates is None:
+        raise ValueError(f"Round {round_id} does not exist.")
+    start_date, end_date = round_dates
+
+    players_by_box = defaultdict(list)
+    for box_id, player_id in db.fetch_all(ROUND_ASSIGNMENTS_SQL, (round_id,)):
+        players_by_box[box_id].append(player_id)
+    blackouts = db.fetch_all(ROUND_BLACKOUTS_SQL, (round_id, end_date, start_date))
+    existing_pairs = {frozenset(pair) for pair in db.fetch_all(ROUND_PAIRS_SQL, (round_id,))}
+
+    fixtures = []
+    existing_count = 0
+    for box_id, player1, player2, scheduled_week in fixture_scheduler.schedule_round(
+            players_by_box, start_date, end_date, blackouts):
+        if frozenset((player1, player2)) in existing_pairs:
+            existing_count += 1
+        else:
+            fixtures.append((round_id, box_id, player1, player2, scheduled_week))
+    return fixtures, len(players_by_box), existing_count
+
+
+def print_fixture_sql(fixtures):
+    """Prints the fixtures as INSERT statements of at most MAX_VALUES_ROWS rows each."""
+    for start in range(0, len(fixtures), MAX_VALUES_ROWS):
+        chunk = fixtures[start:start + MAX_VALUES_ROWS]
+        print("INSERT INTO dbo.matches (round_id, box_id, player1_id, player2_id, scheduled_week) VALUES")
+        print(",\n".join(
+            f"({round_id}, {box_id}, {player1}, {player2}, "
+            f"{'NULL' if week is None else repr(week.isoformat())})"
+            for round_id, box_id, player1, player2, week in chunk
+        ) + ";")
+
+
+def generate_round_fixtures(round_id, execute=False):
+    """
+    Sets up a whole round in one pass: the round-robin fixtures of every box
+    in dbo.box_assignments, spread over the round's weeks, either printed as
+    SQL or inserted directly with a batched executemany in one transaction.
+
+    Args:
+        round_id (int): The round to set up.
+        execute (bool): Insert into dbo.matches instead of printing the SQL.
+
+    Returns:
+        list: The (round_id, box_id, player1_id, player2_id, scheduled_week) fixtures that were new.
+    """
+    with league_db.connection() as db:
+        fixtures, box_count, existing_count = plan_round_fixtures(db, round_id)
+        if not box_count:
+            print(f"-- Warning: No box assignments found for round {round_id}.")
+            return []
+        if execute and fixtures:
+            db.executemany(INSERT_FIXTURE_SQL, fixtures)
+            db.commit()
+
+    if execute:
+        print(f"Inserted {len(fixtures)} fixture(s) for round {round_id} across {box_count} box(es); "
+              f"{existing_count} already existed.")
+    else:
+        print(f"-- SQL INSERT statements for Round ID: {round_id} ({box_count} boxes, "
+              f"{existing_count} existing fixtures skipped)\n")
+        if fixtures:
+            print_fixture_sql(fixtures)
+            print("\n-- Remember: These matches are initially unplayed. Update them with scores later.")
+        else:
+            print("-- Every fixture of this round already exists.")
+    unplaced = sum(1 for fixture in fixtures if fixture[4] is None)
+    if unplaced:
+        print(f"-- Warning: {unplaced} fixture(s) clash with blackouts in every week; "
+              f"scheduled_week is left empty for the organiser to arrange.")
+    return fixtures
+
+
 # --- Main execution block ---
 if __name__ == "__main__":
-    try:
-        print("--- Generate Match Fixtures SQL ---")
+    parser = argparse.ArgumentParser(
+        description="Generate round-robin match fixtures. Without --round, asks for one box interactively."
+    )
+    parser.add_argument('--round', type=int, metavar='ROUND_ID',
+                        help="Generate the fixtures of every box in this round from dbo.box_assignments.")
+    parser.add_argument('--execute', action='store_true',
+                        help="With --round, insert the fixtures into dbo.matches instead of printing SQL.")
+    parser.add_argument('--sqlite', metavar='PATH',
+                        help="Use a local SQLite database file instead of SQL Server.")
+    args = parser.parse_args()
+    if args.execute and args.round is None:
+        parser.error("--execute needs --round")
+    if args.sqlite:
+        league_db.use_sqlite(args.sqlite)
+
+    if args.round is not None:
+        try:
+            generate_round_fixtures(args.round, execute=args.execute)
+        except ValueError as e:
+            print(f"Error: {e}")
+        except league_db.DatabaseError as ex:
+            print(f"Database error: {ex}")
+        finally:
+            league_db.close_pool()
+    else:
+        try:
+            print("--- Generate Match Fixtures SQL ---")
 
-        # Get inputs from the user
-        current_round_id = int(input("Enter the Round ID (e.g., 1): "))
-        current_box_id = int(input("Enter the Box ID (e.g., 10): "))
+            # Get inputs from the user
+            current_round_id = int(input("Enter the Round ID (e.g., 1): "))
+            current_box_id = int(input("Enter the Box ID (e.g., 10): "))
 
-        # Get player IDs as a comma-separated string, then convert to a list of integers
-        players_input = input("Enter player IDs for this box, comma-separated (e.g., 1,2,3,4,5): ")
+            # Get player IDs as a comma-separated string, then convert to a list of integers
+            players_input = input("Enter player IDs for this box, comma-separated (e.g., 1,2,3,4,5): ")
         
-        # Clean and convert player IDs
-        player_ids_list = [
-            int(p.strip()) for p in players_input.split(',') if p.strip().isdigit()
-        ]
+            # Clean and convert player IDs
+            player_ids_list = [
+                int(p.strip()) for p in players_input.split(',') if p.strip().isdigit()
+            ]
 
-        if not player_ids_list:
-            print("Error: No valid player IDs entered. Please try again.")
-        else:
-            generate_fixture_sql(current_round_id, current_box_id, player_ids_list)
+            if not player_ids_list:
+                print("Error: No valid player IDs entered. Please try again.")
+            else:
+                generate_fixture_sql(current_round_id, current_box_id, player_ids_list)
 
-    except ValueError:
-        print("Invalid input. Please ensure IDs are numbers and player IDs are comma-separated numbers.")
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
\ No newline at end of file
+        except ValueError:
+            print("Invalid input. Please ensure IDs are numbers and player IDs are comma-separated numbers.")
+        except Exception as e:
+            print(f"An unexpected error occurred: {e}")
\ No newline at end of file
@@ -1,13 +1,25 @@
-import pyodbc
+import argparse
+import cProfile
 import datetime
 import os
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import asset_pipeline
+import build_manifest
+import build_metrics
+import build_runner
+import data_feeds
+import html_writer
+import image_pipeline
+import league_db
+import league_snapshot
+import player_history
+import site_includes
 
 # --- Configuration ---
-# Update these with your SQL Server details
-DB_SERVER = 'tariqhassan2022\SQLEXPRESS'
-DB_NAME = 'DTC Box League'
-ODBC_DRIVER = 'ODBC Driver 17 for SQL Server'
+# Database settings live in league_db.py, shared with the Instagram post generator.
 
 # Output directory for HTML reports
 output_dir = 'docs'
@@ -22,59 +34,31 @@ if not os.path.exists(css_dir):
 # Path to logo
 IMAGE_PATH = 'assets/TNL_logo_white.png'
 
-# JavaScript for frozen columns and hamburger menu
-FROZEN_COLUMNS_JS = """
-<script>
-window.addEventListener('load', function() {
-    function adjustFrozenColumns() {
-        document.querySelectorAll('.data-table').forEach(function(table) {
-            var firstCol = table.querySelector('th:nth-child(1)');
-            if (firstCol) {
-                var firstColWidth = firstCol.offsetWidth;
-                var secondCols = table.querySelectorAll('th:nth-child(2), td:nth-child(2)');
-                secondCols.forEach(function(cell) {
-                    cell.style.left = firstColWidth + 'px';
-                });
-            }
-        });
-    }
-    
-    adjustFrozenColumns();
-    window.addEventListener('resize', adjustFrozenColumns);
-    
-    // Hamburger menu toggle - slides in from right
-    var menuToggle = document.querySelector('.menu-toggle');
-    var navMenu = document.querySelector('nav');
-    
-    if (menuToggle && navMenu) {
-        menuToggle.addEventListener('click', function(e) {
-            e.stopPropagation();
-            navMenu.classList.toggle('active');
-            
-            var isExpanded = navMenu.classList.contains('active');
-            menuToggle.setAttribute('aria-expanded', isExpanded);
-        });
-        
-        // Close menu when clicking on overlay
-        navMenu.addEventListener('click', function(e) {
-            if (e.target === navMenu) {
-                navMenu.classList.remove('active');
-                menuToggle.setAttribute('aria-expanded', 'false');
-            }
-        });
-        
-        // Close menu when clicking on a navigation link
-        var navLinks = navMenu.querySelectorAll('a');
-        navLinks.forEach(function(link) {
-            link.addEventListener('click', function() {
-                navMenu.classList.remove('active');
-                menuToggle.setAttribute('aria-expanded', 'false');
-            });
-        });
-    }
-});
-</script>
-"""
+# docs/footer.html as every page embeds it; read once per build by build_assets().
+SHARED_FOOTER_HTML = None
+
+# Part of every page's input hash, so editing the templates below also triggers a rebuild.
+# build_assets() extends it with the current asset and image names.
+SOURCE_FINGERPRINT = build_manifest.hash_file(__file__)
+GENERATOR_FINGERPRINT = SOURCE_FINGERPRINT
+
+# When True (--client-render), the standings, fixtures and leaderboard pages
+# are written as shells whose tables docs/js/league-data.js fills from the
+# JSON feeds, so a score update rewrites only the feeds, not the pages.
+CLIENT_RENDERED = False
+
+# Threads writing player profiles; pages whose data is unchanged are skipped before this.
+PROFILE_RENDER_THREADS = 4
+
+
+def get_report_script_html():
+    """The frozen-columns and hamburger-menu script (docs/js/report-page.js) every report page loads."""
+    return f'<script src="{asset_pipeline.asset_url("js/report-page.js")}" defer></script>'
+
+
+def get_logo_html():
+    return image_pipeline.picture_html(f'<img src="{IMAGE_PATH}" alt="Tennis Nerds League Logo" class="header-logo">')
+
 
 def get_nav_items(current_page_name):
     """Generates the navigation items as list items."""
@@ -83,6 +67,7 @@ def get_nav_items(current_page_name):
         "standings": {"text": "Current Standings", "file": "index.html"},
         "leaderboard": {"text": "Overall Leaderboard", "file": "leaderboard.html"},
         "previous": {"text": "Previous Rounds", "file": "previous_rounds.html"},
+        "players": {"text": "Players", "file": "players.html"},
         "info": {"text": "Info & Rules", "file": "info_rules.html"}
     }
 
@@ -108,70 +93,30 @@ def get_nav_html(current_page_name):
     '''
 
 
-def get_footer_html(show_last_updated=True):
-    """Generates the HTML for the footer."""
-    current_time = datetime.datetime.now().strftime("%d %b %Y, %H:%M:%S")
-    current_year = datetime.datetime.now().year
-    
-    last_updated = f'<p>Data last updated: <span id="last-updated">{current_time}</span></p>' if show_last_updated else ''
-    
-    footer_html = f'''
-        <footer>
-            <div class="footer-content">
-                <div class="footer-section">
-                    <h4>About</h4>
-                    <p>🎾 Community Tennis League</p>
-                    <p>📍 Welwyn Garden City & surroundings!</p>
-                </div>
-                
-                <div class="footer-section">
-                    <h4>Quick Links</h4>
-                    <ul>
-                        <li><a href="https://docs.google.com/forms/d/e/1FAIpQLSfaBiGWHBvGYVIXNhWPffa0pb-NuMT_CkdPfyxRXj8ZDwWJQQ/viewform?usp=dialog" target="_blank">League Signup</a></li>
-                        <li><a href="https://forms.gle/4SxqB9DoL93L6W4Z7" target="_blank">Submit Scores</a></li>
-                        <li><a href="https://www.lta.org.uk/advantage-home/my-game/self-submission/" target="_blank">LTA Self-Submission</a></li>
-                        <li><a href="social_doubles.html">Social Doubles</a></li> 
-                        <li><a href="privacy_policy.html">Privacy Policy</a></li>
-                        <li><a href="constitution.html">Constitution</a></li>
-                    </ul>
-                </div>
-                
-                <div class="footer-section">
-                    <h4>Social Media</h4>
-                    <div class="social-links">
-                        <a href="https://www.instagram.com/tennisnerdsuk/" target="_blank" aria-label="Instagram" title="Follow us on Instagram">
-                            <svg width="24" height="24" viewBox="0 0 24 24" fill="currentColor">
-                                <path d="M12 2.163c3.204 0 3.584.012 4.85.07 3.252.148 4.771 1.691 4.919 4.919.058 1.265.069 1.645.069 4.849 0 3.205-.012 3.584-.069 4.849-.149 3.225-1.664 4.771-4.919 4.919-1.266.058-1.644.07-4.85.07-3.204 0-3.584-.012-4.849-.07-3.26-.149-4.771-1.699-4.919-4.92-.058-1.265-.07-1.644-.07-4.849 0-3.204.013-3.583.07-4.849.149-3.227 1.664-4.771 4.919-4.919 1.266-.057 1.645-.069 4.849-.069zm0-2.163c-3.259 0-3.667.014-4.947.072-4.358.2-6.78 2.618-6.98 6.98-.059 1.281-.073 1.689-.073 4.948 0 3.259.014 3.668.072 4.948.2 4.358 2.618 6.78 6.98 6.98 1.281.058 1.689.072 4.948.072 3.259 0 3.668-.014 4.948-.072 4.354-.2 6.782-2.618 6.979-6.98.059-1.28.073-1.689.073-4.948 0-3.259-.014-3.667-.072-4.947-.196-4.354-2.617-6.78-6.979-6.98-1.281-.059-1.69-.073-4.949-.073zm0 5.838c-3.403 0-6.162 2.759-6.162 6.162s2.759 6.163 6.162 6.163 6.162-2.759 6.162-6.163c0-3.403-2.759-6.162-6.162-6.162zm0 10.162c-2.209 0-4-1.79-4-4 0-2.209 1.791-4 4-4s4 1.791 4 4c0 2.21-1.791 4-4 4zm6.406-11.845c-.796 0-1.441.645-1.441 1.44s.645 1.44 1.441 1.44c.795 0 1.439-.645 1.439-1.44s-.644-1.44-1.439-1.44z"/>
-                            </svg>
-                        </a>
-                        <a href="https://chat.whatsapp.com/FASdYjTNTcO2ctSF6zKiwJ" target="_blank" aria-label="WhatsApp" title="League WhatsApp group">
-                            <svg width="24" height="24" viewBox="0 0 24 24" fill="currentColor">
-                                <path d="M17.472 14.382c-.297-.149-1.758-.867-2.03-.967-.273-.099-.471-.148-.67.15-.197.297-.767.966-.94 1.164-.173.199-.347.223-.644.075-.297-.15-1.255-.463-2.39-1.475-.883-.788-1.48-1.761-1.653-2.059-.173-.297-.018-.458.13-.606.134-.133.298-.347.446-.52.149-.174.198-.298.298-.497.099-.198.05-.371-.025-.52-.075-.149-.669-1.612-.916-2.207-.242-.579-.487-.5-.669-.51-.173-.008-.371-.01-.57-.01-.198 0-.52.074-.792.372-.272.297-1.04 1.016-1.04 2.479 0 1.462 1.065 2.875 1.213 3.074.149.198 2.096 3.2 5.077 4.487.709.306 1.262.489 1.694.625.712.227 1.36.195 1.871.118.571-.085 1.758-.719 2.006-1.413.248-.694.248-1.289.173-1.413-.074-.124-.272-.198-.57-.347m-5.421 7.403h-.004a9.87 9.87 0 01-5.031-1.378l-.361-.214-3.741.982.998-3.648-.235-.374a9.86 9.86 0 01-1.51-5.26c.001-5.45 4.436-9.884 9.888-9.884 2.64 0 5.122 1.03 6.988 2.898a9.825 9.825 0 012.893 6.994c-.003 5.45-4.437 9.884-9.885 9.884m8.413-18.297A11.815 11.815 0 0012.05 0C5.495 0 .16 5.335.157 11.892c0 2.096.547 4.142 1.588 5.945L.057 24l6.305-1.654a11.882 11.882 0 005.683 1.448h.005c6.554 0 11.89-5.335 11.893-11.893a11.821 11.821 0 00-3.48-8.413z"/>
-                            </svg>
-                        </a>
-                    </div>
-                </div>
-                
-                <div class="footer-section">
-                    <h4>Partners</h4>
-                    <p style="font-weight: bold; margin-bottom: 10px;">Commitment Champion Award</p>
-                    <p style="font-size: 0.85em; margin-bottom: 10px;">Generously Sponsored by</p>
-                    <a href="https://goode-sport.co.uk/" target="_blank">
-                        <img src="assets/volkl-logo.png" alt="Völkl - Goode Sport" class="partner-logo">
-                    </a>
-                    <div class="partner-info">
-                        <a href="https://goode-sport.co.uk/" target="_blank">Goode Sport (Völkl UK)</a>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="footer-bottom">
-                {last_updated}
-                <p>&copy; {current_year} Tennis Nerds League. All rights reserved.</p>
-            </div>
-        </footer>
+def get_footer_html(last_updated_at=None, show_last_updated=True):
+    """
+    Generates the HTML for the footer: the site's shared footer (docs/footer.html,
+    the same partial site_includes.py writes into the static pages) followed by
+    the league's "Data last updated" line.
+
+    last_updated_at is when the page's data last changed (not the build time),
+    so rebuilding unchanged data produces identical bytes.
+    """
+    global SHARED_FOOTER_HTML
+    if SHARED_FOOTER_HTML is None:
+        SHARED_FOOTER_HTML = site_includes.partial_html('footer-placeholder', output_dir)
+    if not show_last_updated:
+        return SHARED_FOOTER_HTML
+
+    if last_updated_at is None:
+        last_updated_at = datetime.datetime.now()
+    current_time = last_updated_at.strftime("%d %b %Y, %H:%M:%S")
+    return f'''
+        {SHARED_FOOTER_HTML}
+        <div class="footer-bottom">
+            <p>Data last updated: <span id="last-updated">{current_time}</span></p>
+        </div>
     '''
-    return footer_html
     """Generates the navigation items as list items."""
     nav_links = {
         "fixtures": {"text": "Current Round Fixtures", "file": "current_round_fixtures.html"},
@@ -203,26 +148,45 @@ def get_nav_html(current_page_name):
     '''
 
 
-def generate_current_round_fixtures_report():
-    conn = None
-    cursor = None
+def get_feed_placeholder_html(feed, box_name=None):
+    """An element league-data.js fills with a table from the named JSON feed."""
+    box_attribute = f' data-box="{data_feeds.slugify(box_name)}"' if box_name is not None else ''
+    return f'''
+    <div class="table-wrapper" data-feed="{feed}"{box_attribute}>
+        <noscript><p class='no-data-message'>Enable JavaScript to see the latest results.</p></noscript>
+    </div>
+    '''
+
+
+def get_feed_script_html():
+    if not CLIENT_RENDERED:
+        return ''
+    return f'<script src="{asset_pipeline.asset_url("js/league-data.js")}" defer></script>'
+
+
+def _box_names(rows):
+    return sorted({row[1] for row in rows})
+
+
+def generate_current_round_fixtures_report(snapshot=None):
     try:
-        conn_str = (
-            f"DRIVER={{{ODBC_DRIVER}}};"
-            f"SERVER={DB_SERVER};"
-            f"DATABASE={DB_NAME};"
-            f"Trusted_Connection=yes;"
-        )
-        conn = pyodbc.connect(conn_str)
-        cursor = conn.cursor()
+        if snapshot is None:
+            with build_metrics.stage('extract'):
+                snapshot = league_snapshot.extract_league_snapshot()
 
-        cursor.execute("""
-            SELECT TOP 1 [name], [start_date], [end_date]
-            FROM dbo.rounds
-            WHERE GETDATE() BETWEEN start_date AND end_date
-            ORDER BY start_date DESC
-        """)
-        round_info = cursor.fetchone()
+        output_file_path = os.path.join(output_dir, 'current_round_fixtures.html')
+        with build_metrics.stage('hash'):
+            manifest = build_manifest.get_manifest()
+            if CLIENT_RENDERED:
+                input_hash = build_manifest.hash_inputs(
+                    GENERATOR_FINGERPRINT, 'client', snapshot.current_round, _box_names(snapshot.current_matches))
+            else:
+                input_hash = build_manifest.hash_inputs(GENERATOR_FINGERPRINT, snapshot.current_round, snapshot.current_matches)
+            if manifest.is_unchanged('current_round_fixtures.html', input_hash, output_file_path):
+                print(f"Skipped {output_file_path}: data unchanged since the last build.")
+                return output_file_path
+
+        round_info = snapshot.current_round
 
         round_name = "Current Round"
         round_start_date = None
@@ -238,68 +202,18 @@ def generate_current_round_fixtures_report():
             if end_date_obj:
                 round_end_date = end_date_obj.strftime("%d %b")
 
-        cursor.execute("SELECT RoundName, BoxName, Player1Name, Player2Name, Score, WinnerName, PlayedOn FROM dbo.vw_CurrentRoundMatches ORDER BY BoxName ASC, CASE WHEN PlayedOn IS NULL THEN 1 ELSE 0 END ASC, PlayedOn ASC, Player1Name ASC")
-        matches_data = cursor.fetchall()
+        matches_data = snapshot.current_matches
 
-        html_sections = ""
-        
         current_round_display_name = "Current Round Fixtures"
         if round_name and round_start_date and round_end_date:
             current_round_display_name = f"{round_name} Fixtures <br>({round_start_date} - {round_end_date})"
         elif round_name:
             current_round_display_name = f"{round_name} Fixtures"
         
-        if not matches_data:
-            print("No active round fixtures found to generate report.")
-            html_sections = "<p class='no-data-message'>No matches recorded for the active round yet. Please ensure there is a round with a start date before today and an end date after today, and matches are assigned to it.</p>"
-        else:
-            grouped_matches = defaultdict(list)
-            for row in matches_data:
-                box_name = row[1]
-                match_details = row[2:]
-                grouped_matches[box_name].append(match_details)
-            
-            for box_name in sorted(grouped_matches.keys()):
-                html_sections += f'<h3>{box_name}</h3>\n'
-                html_sections += """
-                <div class="table-wrapper">
-                <table class="data-table">
-                    <thead>
-                        <tr>
-                            <th>Player 1</th>
-                            <th>Player 2</th>
-                            <th>Score (P1-P2)</th>
-                            <th>Winner</th>
-                            <th>Played On</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                """
-                for match in grouped_matches[box_name]:
-                    player1_name = match[0]
-                    player2_name = match[1]
-                    score = match[2]
-                    winner = match[3]
-                    played_on = match[4].strftime("%Y-%m-%d") if match[4] is not None else 'Not Played'
-
-                    html_sections += f"""
-                        <tr>
-                            <td>{player1_name}</td>
-                            <td>{player2_name}</td>
-                            <td>{score}</td>
-                            <td>{winner}</td>
-                            <td>{played_on}</td>
-                        </tr>
-                    """
-                html_sections += """
-                    </tbody>
-                </table>
-                </div>
-                """
-
-        current_time = datetime.datetime.now().strftime("%d %b %Y, %H:%M:%S")
+        last_updated_at = manifest.data_changed_at('current_round_fixtures.html', input_hash, snapshot.extracted_at)
 
-        html_content = f"""
+        with build_metrics.stage('render'), html_writer.PageWriter(output_file_path) as page:
+            page.write(f"""
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -309,14 +223,14 @@ def generate_current_round_fixtures_report():
     
     <link href="https://fonts.googleapis.com/css2?family=Montserrat:wght@400;700&display=swap" rel="stylesheet">
     
-    <link rel="stylesheet" href="css/style.css">
+    <link rel="stylesheet" href="{asset_pipeline.asset_url('css/style.css')}">
     <link rel="icon" type="image/png" href="dtc-favicon.png">
 </head>
 <body>
     <div class="container">
         <header>
             <a href="/" class="header-logo-link">
-                <img src="{IMAGE_PATH}" alt="Tennis Nerds League Logo" class="header-logo">
+                {get_logo_html()}
             </a>
             
             <h1 class="league-title">
@@ -328,53 +242,104 @@ def generate_current_round_fixtures_report():
 
         <main>
             <h2>{current_round_display_name}</h2>
-            {html_sections}
+            """)
+            if not matches_data:
+                print("No active round fixtures found to generate report.")
+                page.write("<p class='no-data-message'>No matches recorded for the active round yet. Please ensure there is a round with a start date before today and an end date after today, and matches are assigned to it.</p>")
+            else:
+                with build_metrics.stage('group'):
+                    grouped_matches = defaultdict(list)
+                    for row in matches_data:
+                        box_name = row[1]
+                        match_details = row[2:]
+                        grouped_matches[box_name].append(match_details)
+            
+                for box_name in sorted(grouped_matches.keys()):
+                    page.write(f'<h3>{box_name}</h3>\n')
+                    if CLIENT_RENDERED:
+                        page.write(get_feed_placeholder_html('fixtures', box_name))
+                        continue
+                    page.write("""
+                    <div class="table-wrapper">
+                    <table class="data-table">
+                        <thead>
+                            <tr>
+                                <th>Player 1</th>
+                                <th>Player 2</th>
+                                <th>Score (P1-P2)</th>
+                                <th>Winner</th>
+                                <th>Played On</th>
+                            </tr>
+                        </thead>
+                        <tbody>
+                    """)
+                    for match in grouped_matches[box_name]:
+                        player1_name = match[0]
+                        player2_name = match[1]
+                        score = match[2]
+                        winner = match[3]
+                        played_on = match[4].strftime("%Y-%m-%d") if match[4] is not None else 'Not Played'
+
+                        page.write(f"""
+                            <tr>
+                                <td>{player1_name}</td>
+                                <td>{player2_name}</td>
+                                <td>{score}</td>
+                                <td>{winner}</td>
+                                <td>{played_on}</td>
+                            </tr>
+                        """)
+                    page.write("""
+                        </tbody>
+                    </table>
+                    </div>
+                    """)
+
+            page.write(f"""
         </main>
 
-        {get_footer_html(current_time)}
+        {get_footer_html(last_updated_at)}
     </div>
-    {FROZEN_COLUMNS_JS}
+    {get_report_script_html()}
+    {get_feed_script_html()}
 </body>
 </html>
-        """
-        output_file_path = os.path.join(output_dir, 'current_round_fixtures.html')
-        with open(output_file_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            """)
+            written = manifest.commit_page('current_round_fixtures.html', page, input_hash, last_updated_at)
 
-        print(f"Generated {output_file_path} successfully!")
+        if written:
+            print(f"Generated {output_file_path} successfully!")
+        else:
+            print(f"Rendered {output_file_path} identical to the existing file; left untouched.")
+        return output_file_path
 
-    except pyodbc.Error as ex:
+    except league_db.DatabaseError as ex:
         sqlstate = ex.args[0]
-        print(f"Database error in generate_current_round_fixtures_report: {sqlstate} - {ex}")
+        build_runner.note_error(f"Database error in generate_current_round_fixtures_report: {sqlstate} - {ex}")
     except Exception as e:
-        print(f"An unexpected error occurred in generate_current_round_fixtures_report: {e}")
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+        build_runner.note_error(f"An unexpected error occurred in generate_current_round_fixtures_report: {e}")
+    return None
 
 
-def generate_current_round_standings_report():
-    conn = None
-    cursor = None
+def generate_current_round_standings_report(snapshot=None):
     try:
-        conn_str = (
-            f"DRIVER={{{ODBC_DRIVER}}};"
-            f"SERVER={DB_SERVER};"
-            f"DATABASE={DB_NAME};"
-            f"Trusted_Connection=yes;"
-        )
-        conn = pyodbc.connect(conn_str)
-        cursor = conn.cursor()
+        if snapshot is None:
+            with build_metrics.stage('extract'):
+                snapshot = league_snapshot.extract_league_snapshot()
 
-        cursor.execute("""
-            SELECT TOP 1 [name], [start_date], [end_date]
-            FROM dbo.rounds
-            WHERE GETDATE() BETWEEN start_date AND end_date
-            ORDER BY start_date DESC
-        """)
-        round_info = cursor.fetchone()
+        output_file_path = os.path.join(output_dir, 'index.html')
+        with build_metrics.stage('hash'):
+            manifest = build_manifest.get_manifest()
+            if CLIENT_RENDERED:
+                input_hash = build_manifest.hash_inputs(
+                    GENERATOR_FINGERPRINT, 'client', snapshot.current_round, _box_names(snapshot.current_standings))
+            else:
+                input_hash = build_manifest.hash_inputs(GENERATOR_FINGERPRINT, snapshot.current_round, snapshot.current_standings)
+            if manifest.is_unchanged('index.html', input_hash, output_file_path):
+                print(f"Skipped {output_file_path}: data unchanged since the last build.")
+                return output_file_path
+
+        round_info = snapshot.current_round
 
         round_name = "Current Round"
         round_start_date = None
@@ -390,82 +355,18 @@ def generate_current_round_standings_report():
             if end_date_obj:
                 round_end_date = end_date_obj.strftime("%d %b")
 
-        cursor.execute("""
-            SELECT
-                RoundName, BoxName, PlayerName, MatchesPlayed, Wins, Losses, Draws, Points, RankInBox
-            FROM dbo.vw_CurrentStandings
-            ORDER BY RoundName ASC, BoxName ASC, RankInBox ASC
-        """)
-        standings_data = cursor.fetchall()
+        standings_data = snapshot.current_standings
 
-        html_sections = ""
-        
         report_title = "Current Round Standings"
         if round_name and round_start_date and round_end_date:
             report_title = f"{round_name} Standings <br>({round_start_date} - {round_end_date})"
         elif round_name:
             report_title = f"{round_name} Standings"
         
-        if not standings_data:
-            print("No current round standings found to generate report.")
-            html_sections = "<p class='no-data-message'>No standings available for the current round. Ensure matches have been played and a round is active.</p>"
-        else:
-            grouped_by_round = defaultdict(lambda: defaultdict(list))
-            for row in standings_data:
-                round_name_from_db = row[0]
-                box_name = row[1]
-                player_standings = row[2:]
-                grouped_by_round[round_name_from_db][box_name].append(player_standings)
-
-            for r_name in sorted(grouped_by_round.keys()):
-                for box_name in sorted(grouped_by_round[r_name].keys()):
-                    html_sections += f'<h3>{box_name}</h3>\n'
-
-                    html_sections += """
-                    <div class="table-wrapper">
-                    <table class="data-table">
-                        <thead>
-                            <tr>
-                                <th>Rank</th>
-                                <th>Player</th>
-                                <th>Played</th>
-                                <th>Wins</th>
-                                <th>Losses</th>
-                                <th>Draws</th>
-                                <th>Points</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                    """
-                    for player_stats in grouped_by_round[r_name][box_name]:
-                        rank = player_stats[6]
-                        player_name = player_stats[0]
-                        matches_played = player_stats[1]
-                        wins = player_stats[2]
-                        losses = player_stats[3]
-                        draws = player_stats[4]
-                        points = player_stats[5]
-
-                        html_sections += f"""
-                            <tr>
-                                <td>{rank}</td>
-                                <td>{player_name}</td>
-                                <td>{matches_played}</td>
-                                <td>{wins}</td>
-                                <td>{losses}</td>
-                                <td>{draws}</td>
-                                <td>{points}</td>
-                            </tr>
-                        """
-                    html_sections += """
-                        </tbody>
-                    </table>
-                    </div>
-                    """
-
-        current_time = datetime.datetime.now().strftime("%d %b %Y, %H:%M:%S")
+        last_updated_at = manifest.data_changed_at('index.html', input_hash, snapshot.extracted_at)
 
-        html_content = f"""
+        with build_metrics.stage('render'), html_writer.PageWriter(output_file_path) as page:
+            page.write(f"""
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -475,14 +376,14 @@ def generate_current_round_standings_report():
     
     <link href="https://fonts.googleapis.com/css2?family=Montserrat:wght@400;700&display=swap" rel="stylesheet">
     
-    <link rel="stylesheet" href="css/style.css">
+    <link rel="stylesheet" href="{asset_pipeline.asset_url('css/style.css')}">
     <link rel="icon" type="image/png" href="dtc-favicon.png">
 </head>
 <body>
     <div class="container">
         <header>
             <a href="/" class="header-logo-link">
-                <img src="{IMAGE_PATH}" alt="Tennis Nerds League Logo" class="header-logo">
+                {get_logo_html()}
             </a>
             
             <h1 class="league-title">
@@ -494,112 +395,117 @@ def generate_current_round_standings_report():
 
         <main>
             <h2>{report_title}</h2>
-            {html_sections}
+            """)
+            if not standings_data:
+                print("No current round standings found to generate report.")
+                page.write("<p class='no-data-message'>No standings available for the current round. Ensure matches have been played and a round is active.</p>")
+            else:
+                with build_metrics.stage('group'):
+                    grouped_by_round = defaultdict(lambda: defaultdict(list))
+                    for row in standings_data:
+                        round_name_from_db = row[0]
+                        box_name = row[1]
+                        player_standings = row[2:]
+                        grouped_by_round[round_name_from_db][box_name].append(player_standings)
+
+                for r_name in sorted(grouped_by_round.keys()):
+                    for box_name in sorted(grouped_by_round[r_name].keys()):
+                        page.write(f'<h3>{box_name}</h3>\n')
+                        if CLIENT_RENDERED:
+                            page.write(get_feed_placeholder_html('standings', box_name))
+                            continue
+
+                        page.write("""
+                        <div class="table-wrapper">
+                        <table class="data-table">
+                            <thead>
+                                <tr>
+                                    <th>Rank</th>
+                                    <th>Player</th>
+                                    <th>Played</th>
+                                    <th>Wins</th>
+                                    <th>Losses</th>
+                                    <th>Draws</th>
+                                    <th>Points</th>
+                                </tr>
+                            </thead>
+                            <tbody>
+                        """)
+                        for player_stats in grouped_by_round[r_name][box_name]:
+                            rank = player_stats[6]
+                            player_name = player_stats[0]
+                            matches_played = player_stats[1]
+                            wins = player_stats[2]
+                            losses = player_stats[3]
+                            draws = player_stats[4]
+                            points = player_stats[5]
+
+                            page.write(f"""
+                                <tr>
+                                    <td>{rank}</td>
+                                    <td>{player_name}</td>
+                                    <td>{matches_played}</td>
+                                    <td>{wins}</td>
+                                    <td>{losses}</td>
+                                    <td>{draws}</td>
+                                    <td>{points}</td>
+                                </tr>
+                            """)
+                        page.write("""
+                            </tbody>
+                        </table>
+                        </div>
+                        """)
+
+            page.write(f"""
         </main>
 
-        {get_footer_html(current_time)}
+        {get_footer_html(last_updated_at)}
     </div>
-    {FROZEN_COLUMNS_JS}
+    {get_report_script_html()}
+    {get_feed_script_html()}
 </body>
 </html>
-        """
-        output_file_path = os.path.join(output_dir, 'index.html')
-        with open(output_file_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            """)
+            written = manifest.commit_page('index.html', page, input_hash, last_updated_at)
 
-        print(f"Generated {output_file_path} successfully!")
+        if written:
+            print(f"Generated {output_file_path} successfully!")
+        else:
+            print(f"Rendered {output_file_path} identical to the existing file; left untouched.")
+        return output_file_path
 
-    except pyodbc.Error as ex:
+    except league_db.DatabaseError as ex:
         sqlstate = ex.args[0]
-        print(f"Database error in generate_current_round_standings_report: {sqlstate} - {ex}")
+        build_runner.note_error(f"Database error in generate_current_round_standings_report: {sqlstate} - {ex}")
     except Exception as e:
-        print(f"An unexpected error occurred in generate_current_round_standings_report: {e}")
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+        build_runner.note_error(f"An unexpected error occurred in generate_current_round_standings_report: {e}")
+    return None
 
 
-def generate_leaderboard_report():
-    conn = None
-    cursor = None
+def generate_leaderboard_report(snapshot=None):
     try:
-        conn_str = (
-            f"DRIVER={{{ODBC_DRIVER}}};"
-            f"SERVER={DB_SERVER};"
-            f"DATABASE={DB_NAME};"
-            f"Trusted_Connection=yes;"
-        )
-        conn = pyodbc.connect(conn_str)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT
-                PlayerName, MatchesPlayed, MatchesWon, GamesWon, SetsWon, MatchesLost, MatchesDraw, TotalPoints, OverallRank
-            FROM dbo.vw_OverallLeaderboard
-            ORDER BY OverallRank ASC
-        """)
-        leaderboard_data = cursor.fetchall()
-
-        html_sections = ""
-
-        if not leaderboard_data:
-            print("No leaderboard data found to generate report.")
-            html_sections = "<p class='no-data-message'>No players have played enough matches to appear on the leaderboard yet.</p>"
-        else:
-            html_sections += """
-            <h2>Overall Leaderboard</h2>
-            <div class="table-wrapper">
-            <table class="data-table">
-                <thead>
-                    <tr>
-                        <th>Rank</th>
-                        <th>Player</th>
-                        <th>Played</th>
-                        <th>Won</th>
-                        <th>Lost</th>
-                        <th>Draw</th>
-                        <th>Games Won</th>
-                        <th>Sets Won</th>
-                        <th>Points</th>
-                    </tr>
-                </thead>
-                <tbody>
-            """
-            for row in leaderboard_data:
-                player_name = row[0]
-                matches_played = row[1]
-                matches_won = row[2]
-                games_won = row[3]
-                sets_won = row[4]
-                matches_lost = row[5]
-                matches_draw = row[6]
-                total_points = row[7]
-                overall_rank = row[8]
-
-                html_sections += f"""
-                    <tr>
-                        <td>{overall_rank}</td>
-                        <td>{player_name}</td>
-                        <td>{matches_played}</td>
-                        <td>{matches_won}</td>
-                        <td>{matches_lost}</td>
-                        <td>{matches_draw}</td>
-                        <td>{games_won}</td>
-                        <td>{sets_won}</td>
-                        <td>{total_points}</td>
-                    </tr>
-                """
-            html_sections += """
-                </tbody>
-            </table>
-            </div>
-            """
-
-        current_time = datetime.datetime.now().strftime("%d %b %Y, %H:%M:%S")
+        if snapshot is None:
+            with build_metrics.stage('extract'):
+                snapshot = league_snapshot.extract_league_snapshot()
 
-        html_content = f"""
+        output_file_path = os.path.join(output_dir, 'leaderboard.html')
+        with build_metrics.stage('hash'):
+            manifest = build_manifest.get_manifest()
+            if CLIENT_RENDERED:
+                input_hash = build_manifest.hash_inputs(GENERATOR_FINGERPRINT, 'client', bool(snapshot.leaderboard))
+            else:
+                input_hash = build_manifest.hash_inputs(GENERATOR_FINGERPRINT, snapshot.leaderboard)
+            if manifest.is_unchanged('leaderboard.html', input_hash, output_file_path):
+                print(f"Skipped {output_file_path}: data unchanged since the last build.")
+                return output_file_path
+
+        leaderboard_data = snapshot.leaderboard
+
+        last_updated_at = manifest.data_changed_at('leaderboard.html', input_hash, snapshot.extracted_at)
+
+        with build_metrics.stage('render'), html_writer.PageWriter(output_file_path) as page:
+            page.write(f"""
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -609,14 +515,14 @@ def generate_leaderboard_report():
     
     <link href="https://fonts.googleapis.com/css2?family=Montserrat:wght@400;700&display=swap" rel="stylesheet">
     
-    <link rel="stylesheet" href="css/style.css">
+    <link rel="stylesheet" href="{asset_pipeline.asset_url('css/style.css')}">
     <link rel="icon" type="image/png" href="dtc-favicon.png">
 </head>
 <body>
     <div class="container">
         <header>
             <a href="/" class="header-logo-link">
-                <img src="{IMAGE_PATH}" alt="Tennis Nerds League Logo" class="header-logo">
+                {get_logo_html()}
             </a>
             
             <h1 class="league-title">
@@ -627,255 +533,724 @@ def generate_leaderboard_report():
         </header>
 
         <main>
-            {html_sections}
+            """)
+            if not leaderboard_data:
+                print("No leaderboard data found to generate report.")
+                page.write("<p class='no-data-message'>No players have played enough matches to appear on the leaderboard yet.</p>")
+            elif CLIENT_RENDERED:
+                page.write("<h2>Overall Leaderboard</h2>")
+                page.write(get_feed_placeholder_html('leaderboard'))
+            else:
+                page.write("""
+                <h2>Overall Leaderboard</h2>
+                <div class="table-wrapper">
+                <table class="data-table">
+                    <thead>
+                        <tr>
+                            <th>Rank</th>
+                            <th>Player</th>
+                            <th>Played</th>
+                            <th>Won</th>
+                            <th>Lost</th>
+                            <th>Draw</th>
+                            <th>Games Won</th>
+                            <th>Sets Won</th>
+                            <th>Points</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                """)
+                for row in leaderboard_data:
+                    player_name = row[0]
+                    matches_played = row[1]
+                    matches_won = row[2]
+                    games_won = row[3]
+                    sets_won = row[4]
+                    matches_lost = row[5]
+                    matches_draw = row[6]
+                    total_points = row[7]
+                    overall_rank = row[8]
+
+                    page.write(f"""
+                        <tr>
+                            <td>{overall_rank}</td>
+                            <td>{player_name}</td>
+                            <td>{matches_played}</td>
+                            <td>{matches_won}</td>
+                            <td>{matches_lost}</td>
+                            <td>{matches_draw}</td>
+                            <td>{games_won}</td>
+                            <td>{sets_won}</td>
+                            <td>{total_points}</td>
+                        </tr>
+                    """)
+                page.write("""
+                    </tbody>
+                </table>
+                </div>
+                """)
+
+            page.write(f"""
         </main>
 
-        {get_footer_html(current_time)}
+        {get_footer_html(last_updated_at)}
     </div>
-    {FROZEN_COLUMNS_JS}
+    {get_report_script_html()}
+    {get_feed_script_html()}
 </body>
 </html>
-        """
-        output_file_path = os.path.join(output_dir, 'leaderboard.html')
-        with open(output_file_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            """)
+            written = manifest.commit_page('leaderboard.html', page, input_hash, last_updated_at)
 
-        print(f"Generated {output_file_path} successfully!")
+        if written:
+            print(f"Generated {output_file_path} successfully!")
+        else:
+            print(f"Rendered {output_file_path} identical to the existing file; left untouched.")
+        return output_file_path
 
-    except pyodbc.Error as ex:
+    except league_db.DatabaseError as ex:
         sqlstate = ex.args[0]
-        print(f"Database error in generate_leaderboard_report: {sqlstate} - {ex}")
+        build_runner.note_error(f"Database error in generate_leaderboard_report: {sqlstate} - {ex}")
     except Exception as e:
-        print(f"An unexpected error occurred in generate_leaderboard_report: {e}")
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+        build_runner.note_error(f"An unexpected error occurred in generate_leaderboard_report: {e}")
+    return None
 
 
-def generate_previous_rounds_report():
-    conn = None
-    cursor = None
-    try:
-        conn_str = (
-            f"DRIVER={{{ODBC_DRIVER}}};"
-            f"SERVER={DB_SERVER};"
-            f"DATABASE={DB_NAME};"
-            f"Trusted_Connection=yes;"
-        )
-        conn = pyodbc.connect(conn_str)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT
-                RoundID, RoundName, RoundStartDate, RoundEndDate, BoxName,
-                PlayerName, MatchesPlayed, Wins, Losses, Draws, Points, RankInBox
-            FROM dbo.vw_PreviousRoundStandings
-            ORDER BY RoundEndDate DESC, RoundID DESC, BoxName ASC, RankInBox ASC
-        """)
-        previous_standings_data = cursor.fetchall()
-
-        cursor.execute("""
-            SELECT
-                RoundID, RoundName, RoundStartDate, RoundEndDate, BoxName,
-                Player1Name, Player2Name, Score, WinnerName, PlayedOn
-            FROM dbo.vw_PreviousRoundMatches
-            ORDER BY RoundEndDate DESC, RoundID DESC, BoxName ASC, PlayedOn ASC, Player1Name ASC
-        """)
-        previous_matches_data = cursor.fetchall()
-
-        html_sections = ""
-
-        if not previous_standings_data and not previous_matches_data:
-            print("No previous rounds data found to generate report.")
-            html_sections = "<p class='no-data-message'>No previous rounds have been completed yet.</p>"
-        else:
-            grouped_standings = defaultdict(lambda: defaultdict(list))
-            for row in previous_standings_data:
-                round_id = row[0]
-                round_name = row[1]
-                round_start_date_str = row[2].strftime("%d %b") if row[2] else 'N/A'
-                round_end_date_str = row[3].strftime("%d %b") if row[3] else 'N/A'
-                box_name = row[4]
-                player_stats = row[5:]
-                grouped_standings[(round_id, round_name, round_start_date_str, round_end_date_str)][box_name].append(player_stats)
+def _format_round_date(value):
+    return value.strftime("%d %b %Y") if value else 'N/A'
 
-            grouped_matches = defaultdict(lambda: defaultdict(list))
-            for row in previous_matches_data:
-                round_id = row[0]
-                round_name = row[1]
-                round_start_date_str = row[2].strftime("%d %b") if row[2] else 'N/A'
-                round_end_date_str = row[3].strftime("%d %b") if row[3] else 'N/A'
-                box_name = row[4]
-                match_details = row[5:]
-                grouped_matches[(round_id, round_name, round_start_date_str, round_end_date_str)][box_name].append(match_details)
-
-            all_round_keys = sorted(list(set(grouped_standings.keys()) | set(grouped_matches.keys())),
-                                     key=lambda x: datetime.datetime.strptime(x[3], "%d %b") if x[3] != 'N/A' else datetime.datetime.min,
-                                     reverse=True)
-
-            for round_key in all_round_keys:
-                round_id, round_name, round_start_date, round_end_date = round_key
-                html_sections += f'<h2>{round_name} ({round_start_date} - {round_end_date})</h2>\n'
-
-                boxes_in_round = set(grouped_standings[round_key].keys()) | set(grouped_matches[round_key].keys())
-
-                for box_name in sorted(boxes_in_round):
-                    html_sections += f'<h3>{box_name}</h3>\n'
-
-                    if box_name in grouped_standings[round_key]:
-                        html_sections += """
-                        <h4>Standings</h4>
-                        <div class="table-wrapper">
-                        <table class="data-table">
-                            <thead>
-                                <tr>
-                                    <th>Rank</th>
-                                    <th>Player</th>
-                                    <th>Played</th>
-                                    <th>Wins</th>
-                                    <th>Losses</th>
-                                    <th>Draws</th>
-                                    <th>Points</th>
-                                </tr>
-                            </thead>
-                            <tbody>
-                        """
-                        for player_stats in grouped_standings[round_key][box_name]:
-                            rank = player_stats[6]
-                            player_name = player_stats[0]
-                            matches_played = player_stats[1]
-                            wins = player_stats[2]
-                            losses = player_stats[3]
-                            draws = player_stats[4]
-                            points = player_stats[5]
-
-                            html_sections += f"""
-                                <tr>
-                                    <td>{rank}</td>
-                                    <td>{player_name}</td>
-                                    <td>{matches_played}</td>
-                                    <td>{wins}</td>
-                                    <td>{losses}</td>
-                                    <td>{draws}</td>
-                                    <td>{points}</td>
-                                </tr>
-                            """
-                        html_sections += """
-                            </tbody>
-                        </table>
-                        </div>
-                        """
-                    else:
-                        html_sections += "<p>No standings available for this box in this round.</p>"
 
-                    if box_name in grouped_matches[round_key]:
-                        html_sections += """
-                        <h4>Matches</h4>
-                        <div class="table-wrapper">
-                        <table class="data-table">
-                            <thead>
-                                <tr>
-                                    <th>Player 1</th>
-                                    <th>Player 2</th>
-                                    <th>Score (P1-P2)</th>
-                                    <th>Winner</th>
-                                    <th>Played On</th>
-                                </tr>
-                            </thead>
-                            <tbody>
-                        """
-                        for match in grouped_matches[round_key][box_name]:
-                            player1_name = match[0]
-                            player2_name = match[1]
-                            score = match[2]
-                            winner = match[3]
-                            played_on = match[4].strftime("%Y-%m-%d") if match[4] is not None else 'Not Played'
-
-                            html_sections += f"""
-                                <tr>
-                                    <td>{player1_name}</td>
-                                    <td>{player2_name}</td>
-                                    <td>{score}</td>
-                                    <td>{winner}</td>
-                                    <td>{played_on}</td>
-                                </tr>
-                            """
-                        html_sections += """
-                            </tbody>
-                        </table>
-                        </div>
-                        """
-                    else:
-                        html_sections += "<p>No matches available for this box in this round.</p>"
+def _previous_round_page_name(round_id):
+    return f'previous_round_{round_id}.html'
 
-        current_time = datetime.datetime.now().strftime("%d %b %Y, %H:%M:%S")
 
-        html_content = f"""
+def _page_head_html(title, nav_page):
+    return f"""
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Tennis Nerds League - Previous Rounds</title>
+    <title>{title}</title>
     
     <link href="https://fonts.googleapis.com/css2?family=Montserrat:wght@400;700&display=swap" rel="stylesheet">
     
-    <link rel="stylesheet" href="css/style.css">
+    <link rel="stylesheet" href="{asset_pipeline.asset_url('css/style.css')}">
     <link rel="icon" type="image/png" href="dtc-favicon.png">
 </head>
 <body>
     <div class="container">
         <header>
             <a href="/" class="header-logo-link">
-                <img src="{IMAGE_PATH}" alt="Tennis Nerds League Logo" class="header-logo">
+                {get_logo_html()}
             </a>
             
             <h1 class="league-title">
                 <span class="tennis">tennis</span><span class="nerds">nerds</span><span class="league">league</span>
             </h1>
             
-            {get_nav_html("previous")}
+            {get_nav_html(nav_page)}
         </header>
+"""
 
-        <main>
-            <h1>Previous Rounds Overview</h1>
-            {html_sections}
+
+def _page_tail_html(last_updated_at):
+    return f"""
         </main>
 
-        {get_footer_html(current_time)}
+        {get_footer_html(last_updated_at)}
     </div>
-    {FROZEN_COLUMNS_JS}
+    {get_report_script_html()}
 </body>
 </html>
-        """
-        output_file_path = os.path.join(output_dir, 'previous_rounds.html')
-        with open(output_file_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            """
 
+
+def _write_previous_round_page(manifest, round_info, checksum, standings_by_box, matches_by_box, extracted_at):
+    """
+    Writes the archive page of one closed round: standings and matches per box.
+
+    Args:
+        manifest (BuildManifest): Records the page and the archived round.
+        round_info (tuple): (id, name, start_date, end_date) from the snapshot's previous_rounds.
+        checksum (list): [match_count, checksum] of the round's matches.
+        standings_by_box (dict): Box name -> vw_PreviousRoundStandings rows (from PlayerName on).
+        matches_by_box (dict): Box name -> vw_PreviousRoundMatches rows (from Player1Name on).
+        extracted_at (datetime.datetime): When the snapshot was read.
+
+    Returns:
+        str: Path of the page.
+    """
+    round_id, round_name, round_start_date, round_end_date = round_info
+    page_name = _previous_round_page_name(round_id)
+    output_file_path = os.path.join(output_dir, page_name)
+    input_hash = build_manifest.hash_inputs(
+        GENERATOR_FINGERPRINT, round_info, sorted(standings_by_box.items()), sorted(matches_by_box.items()),
+    )
+    if manifest.is_unchanged(page_name, input_hash, output_file_path):
+        manifest.record_archived_round(round_id, output_file_path, GENERATOR_FINGERPRINT, checksum)
+        return output_file_path
+
+    last_updated_at = manifest.data_changed_at(page_name, input_hash, extracted_at)
+    round_dates = f"{_format_round_date(round_start_date)} - {_format_round_date(round_end_date)}"
+
+    with html_writer.PageWriter(output_file_path) as page:
+        page.write(_page_head_html(f"Tennis Nerds League - {round_name}", "previous"))
+        page.write(f"""
+        <main>
+            <h1>{round_name} ({round_dates})</h1>
+            <p><a href="previous_rounds.html">&larr; All previous rounds</a></p>
+            """)
+        boxes_in_round = set(standings_by_box) | set(matches_by_box)
+        if not boxes_in_round:
+            page.write("<p class='no-data-message'>No standings or matches were recorded for this round.</p>")
+
+        for box_name in sorted(boxes_in_round):
+            page.write(f'<h3>{box_name}</h3>\n')
+
+            if box_name in standings_by_box:
+                page.write("""
+                <h4>Standings</h4>
+                <div class="table-wrapper">
+                <table class="data-table">
+                    <thead>
+                        <tr>
+                            <th>Rank</th>
+                            <th>Player</th>
+                            <th>Played</th>
+                            <th>Wins</th>
+                            <th>Losses</th>
+                            <th>Draws</th>
+                            <th>Points</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                """)
+                for player_stats in standings_by_box[box_name]:
+                    rank = player_stats[6]
+                    player_name = player_stats[0]
+                    matches_played = player_stats[1]
+                    wins = player_stats[2]
+                    losses = player_stats[3]
+                    draws = player_stats[4]
+                    points = player_stats[5]
+
+                    page.write(f"""
+                        <tr>
+                            <td>{rank}</td>
+                            <td>{player_name}</td>
+                            <td>{matches_played}</td>
+                            <td>{wins}</td>
+                            <td>{losses}</td>
+                            <td>{draws}</td>
+                            <td>{points}</td>
+                        </tr>
+                    """)
+                page.write("""
+                    </tbody>
+                </table>
+                </div>
+                """)
+            else:
+                page.write("<p>No standings available for this box in this round.</p>")
+
+            if box_name in matches_by_box:
+                page.write("""
+                <h4>Matches</h4>
+                <div class="table-wrapper">
+                <table class="data-table">
+                    <thead>
+                        <tr>
+                            <th>Player 1</th>
+                            <th>Player 2</th>
+                            <th>Score (P1-P2)</th>
+                            <th>Winner</th>
+                            <th>Played On</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                """)
+                for match in matches_by_box[box_name]:
+                    player1_name = match[0]
+                    player2_name = match[1]
+                    score = match[2]
+                    winner = match[3]
+                    played_on = match[4].strftime("%Y-%m-%d") if match[4] is not None else 'Not Played'
+
+                    page.write(f"""
+                        <tr>
+                            <td>{player1_name}</td>
+                            <td>{player2_name}</td>
+                            <td>{score}</td>
+                            <td>{winner}</td>
+                            <td>{played_on}</td>
+                        </tr>
+                    """)
+                page.write("""
+                    </tbody>
+                </table>
+                </div>
+                """)
+            else:
+                page.write("<p>No matches available for this box in this round.</p>")
+
+        page.write(_page_tail_html(last_updated_at))
+        written = manifest.commit_page(page_name, page, input_hash, last_updated_at)
+
+    manifest.record_archived_round(round_id, output_file_path, GENERATOR_FINGERPRINT, checksum)
+    if written:
         print(f"Generated {output_file_path} successfully!")
+    return output_file_path
 
-    except pyodbc.Error as ex:
+
+def generate_previous_rounds_report(snapshot=None):
+    """
+    Writes one archive page per closed round plus previous_rounds.html, an
+    index linking to them. A closed round only changes if its matches are
+    edited, so only rounds that closed since the last build, whose matches'
+    checksum changed or whose page is missing are rendered; the snapshot does
+    not even read the history of the other rounds.
+    """
+    try:
+        manifest = build_manifest.get_manifest()
+        archived_rounds = manifest.archived_round_checksums(GENERATOR_FINGERPRINT)
+        if snapshot is None:
+            with build_metrics.stage('extract'):
+                snapshot = league_snapshot.extract_league_snapshot(archived_rounds)
+        archived_round_ids = {
+            round_id for round_id, checksum in archived_rounds.items()
+            if snapshot.round_checksums.get(round_id) == checksum
+        }
+
+        # Closed rounds, newest first, plus any round the views return that the rounds table query did not.
+        rounds = {row[0]: tuple(row) for row in snapshot.previous_rounds}
+        with build_metrics.stage('group'):
+            grouped_standings = defaultdict(lambda: defaultdict(list))
+            for row in snapshot.previous_standings:
+                rounds.setdefault(row[0], tuple(row[0:4]))
+                grouped_standings[row[0]][row[4]].append(row[5:])
+
+            grouped_matches = defaultdict(lambda: defaultdict(list))
+            for row in snapshot.previous_matches:
+                rounds.setdefault(row[0], tuple(row[0:4]))
+                grouped_matches[row[0]][row[4]].append(row[5:])
+
+        all_rounds = sorted(rounds.values(), key=lambda info: (info[3] or datetime.date.min, info[0]), reverse=True)
+        pending_rounds = [info for info in all_rounds if info[0] not in archived_round_ids]
+
+        with build_metrics.stage('render'):
+            for round_info in pending_rounds:
+                round_id = round_info[0]
+                _write_previous_round_page(
+                    manifest, round_info, snapshot.round_checksums.get(round_id, [0, 0]),
+                    grouped_standings.get(round_id, {}),
+                    grouped_matches.get(round_id, {}), snapshot.extracted_at,
+                )
+        print(f"Archived {len(pending_rounds)} round page(s); "
+              f"{len(all_rounds) - len(pending_rounds)} already archived.")
+
+        output_file_path = os.path.join(output_dir, 'previous_rounds.html')
+        with build_metrics.stage('hash'):
+            input_hash = build_manifest.hash_inputs(GENERATOR_FINGERPRINT, all_rounds)
+            if manifest.is_unchanged('previous_rounds.html', input_hash, output_file_path):
+                print(f"Skipped {output_file_path}: data unchanged since the last build.")
+                return output_file_path
+
+        last_updated_at = manifest.data_changed_at('previous_rounds.html', input_hash, snapshot.extracted_at)
+
+        with build_metrics.stage('render'), html_writer.PageWriter(output_file_path) as page:
+            page.write(_page_head_html("Tennis Nerds League - Previous Rounds", "previous"))
+            page.write("""
+        <main>
+            <h1>Previous Rounds Overview</h1>
+            """)
+            if not all_rounds:
+                print("No previous rounds data found to generate report.")
+                page.write("<p class='no-data-message'>No previous rounds have been completed yet.</p>")
+            else:
+                page.write("""
+                <div class="table-wrapper">
+                <table class="data-table">
+                    <thead>
+                        <tr>
+                            <th>Round</th>
+                            <th>Start</th>
+                            <th>End</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                """)
+                for round_id, round_name, round_start_date, round_end_date in all_rounds:
+                    page.write(f"""
+                        <tr>
+                            <td><a href="{_previous_round_page_name(round_id)}">{round_name}</a></td>
+                            <td>{_format_round_date(round_start_date)}</td>
+                            <td>{_format_round_date(round_end_date)}</td>
+                        </tr>
+                    """)
+                page.write("""
+                    </tbody>
+                </table>
+                </div>
+                """)
+
+            page.write(_page_tail_html(last_updated_at))
+            written = manifest.commit_page('previous_rounds.html', page, input_hash, last_updated_at)
+
+        if written:
+            print(f"Generated {output_file_path} successfully!")
+        else:
+            print(f"Rendered {output_file_path} identical to the existing file; left untouched.")
+        return output_file_path
+
+    except league_db.DatabaseError as ex:
+        sqlstate = ex.args[0]
+        build_runner.note_error(f"Database error in generate_previous_rounds_report: {sqlstate} - {ex}")
+    except Exception as e:
+        build_runner.note_error(f"An unexpected error occurred in generate_previous_rounds_report: {e}")
+    return None
+
+
+def _player_page_name(player_id):
+    return f"player_{player_id}.html"
+
+
+def _write_player_profile(manifest, profile, extracted_at):
+    """
+    Writes one player's profile page: totals, box history per round and
+    every match, unless the profile's data is unchanged since the last build.
+
+    Returns:
+        bool: True if the page was (re)written.
+    """
+    page_name = _player_page_name(profile.player_id)
+    output_file_path = os.path.join(output_dir, page_name)
+    input_hash = build_manifest.hash_inputs(GENERATOR_FINGERPRINT, profile)
+    if manifest.is_unchanged(page_name, input_hash, output_file_path):
+        return False
+
+    last_updated_at = manifest.data_changed_at(page_name, input_hash, extracted_at)
+    rounds_played, matches_played, wins, losses, draws, points = profile.totals
+    player_name = profile.name or f"Player {profile.player_id}"
+
+    with html_writer.PageWriter(output_file_path) as page:
+        page.write(_page_head_html(f"Tennis Nerds League - {player_name}", "players"))
+        page.write(f"""
+        <main>
+            <h1>{player_name}</h1>
+            <p><a href="players.html">&larr; All players</a></p>
+            <p>{rounds_played} round(s), {matches_played} match(es) played: {wins} won, {losses} lost, {draws} drawn, {points} points.</p>
+            """)
+
+        if not profile.rounds:
+            page.write("<p class='no-data-message'>This player has not played in a round yet.</p>")
+        else:
+            page.write("""
+            <h3>Rounds</h3>
+            <div class="table-wrapper">
+            <table class="data-table">
+                <thead>
+                    <tr>
+                        <th>Round</th>
+                        <th>Box</th>
+                        <th>Rank</th>
+                        <th>Played</th>
+                        <th>Wins</th>
+                        <th>Losses</th>
+                        <th>Draws</th>
+                        <th>Points</th>
+                    </tr>
+                </thead>
+                <tbody>
+            """)
+            for (_, round_name, _, _, box_name, rank, box_size,
+                 round_played, round_wins, round_losses, round_draws, round_points) in profile.rounds:
+                page.write(f"""
+                    <tr>
+                        <td>{round_name}</td>
+                        <td>{box_name}</td>
+                        <td>{rank} of {box_size}</td>
+                        <td>{round_played}</td>
+                        <td>{round_wins}</td>
+                        <td>{round_losses}</td>
+                        <td>{round_draws}</td>
+                        <td>{round_points}</td>
+                    </tr>
+                """)
+            page.write("""
+                </tbody>
+            </table>
+            </div>
+            """)
+
+        if profile.matches:
+            page.write("""
+            <h3>Matches</h3>
+            <div class="table-wrapper">
+            <table class="data-table">
+                <thead>
+                    <tr>
+                        <th>Round</th>
+                        <th>Opponent</th>
+                        <th>Box</th>
+                        <th>Score</th>
+                        <th>Result</th>
+                        <th>Played On</th>
+                    </tr>
+                </thead>
+                <tbody>
+            """)
+            for round_name, box_name, opponent_id, opponent_name, score, result, played_on in profile.matches:
+                page.write(f"""
+                    <tr>
+                        <td>{round_name}</td>
+                        <td><a href="{_player_page_name(opponent_id)}">{opponent_name}</a></td>
+                        <td>{box_name}</td>
+                        <td>{score or ''}</td>
+                        <td>{result}</td>
+                        <td>{_format_round_date(played_on) if played_on is not None else 'Not Played'}</td>
+                    </tr>
+                """)
+            page.write("""
+                </tbody>
+            </table>
+            </div>
+            """)
+
+        page.write(_page_tail_html(last_updated_at))
+        return manifest.commit_page(page_name, page, input_hash, last_updated_at)
+
+
+def _write_player_profiles(manifest, profiles, extracted_at):
+    # Runs on a worker thread: charge its page writes to this report in the build metrics.
+    with build_metrics.report('player_profiles'):
+        return sum(_write_player_profile(manifest, profile, extracted_at) for profile in profiles)
+
+
+def generate_player_profiles_report():
+    """
+    Generates a profile page per dbo.Players row (player_<id>.html) and the
+    players.html index linking them.
+
+    All profiles come from one bulk pull of players, rounds, boxes, box
+    assignments and matches, indexed by player id in memory
+    (player_history.py). A profile whose data hash is unchanged is skipped;
+    the rest are written by PROFILE_RENDER_THREADS threads.
+
+    Returns:
+        str: Path of players.html, or None on error.
+    """
+    try:
+        with build_metrics.stage('extract'):
+            extracted_at, players, rounds, boxes, assignments, matches = player_history.extract_player_history()
+        with build_metrics.stage('group'):
+            profiles = player_history.build_player_profiles(players, rounds, boxes, assignments, matches)
+        manifest = build_manifest.get_manifest()
+
+        with build_metrics.stage('render'):
+            ordered = sorted(profiles.values(), key=lambda profile: profile.player_id)
+            chunks = [ordered[start::PROFILE_RENDER_THREADS] for start in range(PROFILE_RENDER_THREADS)]
+            with ThreadPoolExecutor(max_workers=PROFILE_RENDER_THREADS) as executor:
+                written = sum(executor.map(
+                    lambda chunk: _write_player_profiles(manifest, chunk, extracted_at), chunks))
+
+            # Players removed from dbo.Players lose their page and its manifest entry.
+            current_pages = {_player_page_name(player_id) for player_id in profiles}
+            for file_name in set(os.listdir(output_dir)) | set(manifest.page_names()):
+                if file_name.startswith('player_') and file_name.endswith('.html') and file_name not in current_pages:
+                    file_path = os.path.join(output_dir, file_name)
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+                    manifest.forget_page(file_name)
+        print(f"Generated {written} player profile(s); {len(profiles) - written} unchanged.")
+
+        output_file_path = os.path.join(output_dir, 'players.html')
+        index_rows = sorted(
+            ((profile.name or f"Player {profile.player_id}", profile.player_id, profile.totals)
+             for profile in ordered),
+            key=lambda row: (row[0].casefold(), row[1]),
+        )
+        input_hash = build_manifest.hash_inputs(GENERATOR_FINGERPRINT, index_rows)
+        if manifest.is_unchanged('players.html', input_hash, output_file_path):
+            print(f"Skipped {output_file_path}: data unchanged since the last build.")
+            return output_file_path
+        last_updated_at = manifest.data_changed_at('players.html', input_hash, extracted_at)
+
+        with build_metrics.stage('render'), html_writer.PageWriter(output_file_path) as page:
+            page.write(_page_head_html("Tennis Nerds League - Players", "players"))
+            page.write("""
+        <main>
+            <h1>Players</h1>
+            """)
+            if not index_rows:
+                page.write("<p class='no-data-message'>No players have registered yet.</p>")
+            else:
+                page.write("""
+                <div class="table-wrapper">
+                <table class="data-table">
+                    <thead>
+                        <tr>
+                            <th>Player</th>
+                            <th>Rounds</th>
+                            <th>Played</th>
+                            <th>Wins</th>
+                            <th>Points</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                """)
+                for player_name, player_id, totals in index_rows:
+                    page.write(f"""
+                        <tr>
+                            <td><a href="{_player_page_name(player_id)}">{player_name}</a></td>
+                            <td>{totals[0]}</td>
+                            <td>{totals[1]}</td>
+                            <td>{totals[2]}</td>
+                            <td>{totals[5]}</td>
+                        </tr>
+                    """)
+                page.write("""
+                    </tbody>
+                </table>
+                </div>
+                """)
+
+            page.write(_page_tail_html(last_updated_at))
+            written = manifest.commit_page('players.html', page, input_hash, last_updated_at)
+
+        if written:
+            print(f"Generated {output_file_path} successfully!")
+        else:
+            print(f"Rendered {output_file_path} identical to the existing file; left untouched.")
+        return output_file_path
+
+    except league_db.DatabaseError as ex:
         sqlstate = ex.args[0]
-        print(f"Database error in generate_previous_rounds_report: {sqlstate} - {ex}")
+        build_runner.note_error(f"Database error in generate_player_profiles_report: {sqlstate} - {ex}")
     except Exception as e:
-        print(f"An unexpected error occurred in generate_previous_rounds_report: {e}")
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+        build_runner.note_error(f"An unexpected error occurred in generate_player_profiles_report: {e}")
+    return None
+
+def build_assets():
+    """
+    Builds the hashed assets and responsive images and reads the shared
+    footer. Pages link the assets by their hashed names and embed the footer,
+    so both become part of GENERATOR_FINGERPRINT and a new version re-renders
+    the pages.
+    """
+    global GENERATOR_FINGERPRINT, SHARED_FOOTER_HTML
+    with build_metrics.report('assets'):
+        asset_pipeline.build_assets(output_dir)
+        image_pipeline.build_images(output_dir, site_includes.referenced_images(output_dir) | {IMAGE_PATH})
+        SHARED_FOOTER_HTML = site_includes.partial_html('footer-placeholder', output_dir)
+    GENERATOR_FINGERPRINT = build_manifest.hash_inputs(
+        SOURCE_FINGERPRINT, asset_pipeline.ASSET_URLS, image_pipeline.IMAGE_VARIANTS, SHARED_FOOTER_HTML)
+
+
+def extract_snapshot():
+    """
+    Reads every view once; all reports render from the same snapshot.
+    History is only read for closed rounds that have no archive page yet.
+
+    Returns:
+        LeagueSnapshot: The league data, or None on a database error.
+    """
+    try:
+        archived_rounds = build_manifest.get_manifest().archived_round_checksums(GENERATOR_FINGERPRINT)
+        with build_metrics.report('snapshot'), build_metrics.stage('extract'):
+            return league_snapshot.extract_league_snapshot(archived_rounds)
+    except league_db.DatabaseError as ex:
+        print(f"Database error while extracting league data: {ex}")
+    return None
+
+
+def report_tasks(snapshot):
+    """
+    The build tasks for build_runner.run_tasks. They share nothing but the
+    snapshot, so they can run side by side; league_watcher.py runs only the
+    ones a database change affects.
+    """
+    return [
+        ("current_round_fixtures", generate_current_round_fixtures_report, (snapshot,)),
+        ("current_round_standings", generate_current_round_standings_report, (snapshot,)),
+        ("leaderboard", generate_leaderboard_report, (snapshot,)),
+        ("previous_rounds", generate_previous_rounds_report, (snapshot,)),
+        ("data_feeds", data_feeds.generate_data_feeds, (snapshot,)),
+        ("player_profiles", generate_player_profiles_report, ()),
+    ]
+
+
+def site_tasks():
+    """
+    The build tasks that rewrite pages in docs in place. They read and
+    replace whole pages, so they run after report_tasks have finished and
+    never beside the page writers.
+    """
+    return [
+        ("site_includes", site_includes.expand_site_includes, (output_dir,)),
+    ]
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the league HTML reports.")
+    parser.add_argument('--force', action='store_true',
+                        help="Re-render every page, even those whose data has not changed.")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="Number of reports to generate at the same time (default 1).")
+    parser.add_argument('--sqlite', metavar='PATH',
+                        help="Read from a local SQLite database file instead of SQL Server.")
+    parser.add_argument('--metrics-json', metavar='PATH',
+                        help="Write per-report stage timings, rows fetched and bytes written as JSON.")
+    parser.add_argument('--profile', metavar='PATH',
+                        help="Write a cProfile dump of the build (use with --jobs 1 to see the reports).")
+    parser.add_argument('--client-render', action='store_true',
+                        help="Write standings, fixtures and leaderboard as shells filled from the JSON feeds.")
+    parser.add_argument('--standings-source', choices=league_snapshot.STANDINGS_SOURCES,
+                        default=league_snapshot.STANDINGS_SOURCE,
+                        help="Where current-round standings are read from (default "
+                             f"{league_snapshot.STANDINGS_SOURCE}); 'ranking' needs players_ranking kept "
+                             "current by ranking_updater.py.")
+    parser.add_argument('--history-source', choices=league_snapshot.HISTORY_SOURCES,
+                        default=league_snapshot.HISTORY_SOURCE,
+                        help="Where closed rounds' standings are read from (default "
+                             f"{league_snapshot.HISTORY_SOURCE}); 'ranking' reads rounds closed with "
+                             "ranking_updater.py --close from players_ranking and the rest from the view.")
+    args = parser.parse_args()
+    if args.sqlite:
+        league_db.use_sqlite(args.sqlite)
+    league_snapshot.STANDINGS_SOURCE = args.standings_source
+    league_snapshot.HISTORY_SOURCE = args.history_source
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    build_manifest.FORCE_REBUILD = args.force
+    CLIENT_RENDERED = args.client_render
+    league_db.set_pool_size(args.jobs)
+
     image_dir = os.path.join(output_dir, 'images')
     if not os.path.exists(image_dir):
         os.makedirs(image_dir)
 
     print("Starting HTML report generation...")
-    generate_current_round_fixtures_report()
-    generate_current_round_standings_report()
-    generate_leaderboard_report()
-    generate_previous_rounds_report()
-    print("All HTML reports generated!")
\ No newline at end of file
+    build_start = time.perf_counter()
+    build_assets()
+    snapshot = extract_snapshot()
+
+    if snapshot:
+        results = build_runner.run_tasks(report_tasks(snapshot), jobs=args.jobs)
+        results += build_runner.run_tasks(site_tasks())
+        build_manifest.save_manifest()
+        build_runner.print_summary(results, time.perf_counter() - build_start)
+    league_db.close_pool()
+    print("All HTML reports generated!")
+    league_db.print_db_stats()
+
+    if args.profile:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        print(f"Wrote profile to {args.profile}")
+    if args.metrics_json:
+        build_metrics.write_metrics_json(
+            args.metrics_json, time.perf_counter() - build_start,
+            backend=league_db.get_backend().name, jobs=args.jobs, database=league_db.get_db_stats(),
+        )
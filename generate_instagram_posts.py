@@ -1,15 +1,20 @@
-import pyodbc
 import datetime
 import os
-from collections import defaultdict
-from playwright.sync_api import sync_playwright 
+import sys
+from collections import defaultdict, namedtuple
+import argparse
+import asyncio
+import cProfile
 import time
 import shutil
 
+import build_metrics
+import insta_png_renderer
+import league_db
+import league_snapshot
+
 # --- Configuration ---
-DB_SERVER = 'tariqhassan2022\SQLEXPRESS'
-DB_NAME = 'DTC Box League'
-ODBC_DRIVER = 'ODBC Driver 17 for SQL Server' 
+# Database settings live in league_db.py, shared with the HTML report generator.
 
 # Output directory 
 output_dir = 'docs_test'
@@ -34,6 +39,9 @@ LOGO_PATH = 'assets/TNL_logo.png'
 INSTA_WIDTH = 1080
 INSTA_HEIGHT = 1920 
 
+# Pages rendered at once in the shared browser when capturing a batch of posts
+MAX_CONCURRENT_CAPTURES = 8
+
 # Local source of your background image (developer-provided path in container)
 LOCAL_BK_IMAGE_SRC = '/mnt/data/bk-image.PNG'   # <-- local path provided by developer
 COPIED_BK_IMAGE_NAME = 'bk-image.png'           # name inside docs_test/assets
@@ -213,101 +221,248 @@ def create_instagram_post_css():
         f.write(css_content)
     print(f"Wrote CSS to {css_file_path}")
 
-# --- Post 1: Current Round Standings (UNIFIED HTML with overlay removed) ---
-def generate_current_standings_post():
-    """Generates the Current Round Top Box Standings post HTML."""
-    conn = None
-    cursor = None
-    html_sections = ""
-    output_file_path = os.path.join(output_dir, 'insta_post_1_standings.html')
+# --- Post Models ---
+# Each post is built once from the snapshot and then rendered either as HTML
+# (captured with Playwright) or straight to PNG with Pillow.
+#   kind: 'table' for plain rows of cell values, 'matches' for
+#         (matchup, comment, winner, score) rows
+InstaPost = namedtuple('InstaPost', ['post_id', 'page_title', 'title_lines', 'report_date', 'sections', 'empty_message'])
+PostSection = namedtuple('PostSection', ['heading', 'kind', 'columns', 'rows'])
 
-    try:
-        today_date = datetime.date.today().strftime('%d %b %Y').lstrip('0')
-        
-        conn_str = (
-            f"DRIVER={{{ODBC_DRIVER}}};"
-            f"SERVER={DB_SERVER};"
-            f"DATABASE={DB_NAME};"
-            f"Trusted_Connection=yes;"
-        )
-        conn = pyodbc.connect(conn_str)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-             SELECT TOP 1 [name], [start_date], [end_date]
-             FROM dbo.rounds
-             WHERE GETDATE() BETWEEN start_date AND end_date
-             ORDER BY start_date DESC
-        """)
-        round_info = cursor.fetchone()
-        
-        round_name = "Current Round"
-        round_date_range = ""
-        if round_info:
-            round_name = round_info[0]
-            start_date_obj = round_info[1]
-            end_date_obj = round_info[2]
-            round_date_range = f"({start_date_obj.strftime('%d %b')} - {end_date_obj.strftime('%d %b')})"
-
-        cursor.execute("""
-             SELECT
-                 BoxName, PlayerName, MatchesPlayed, Wins, Losses, Points, RankInBox
-             FROM dbo.vw_CurrentStandings
-             ORDER BY BoxName ASC, RankInBox ASC
-        """)
-        standings_data = cursor.fetchall()
-        
-        if not standings_data:
-            html_sections = "<p style='font-size:2em; margin-top:200px;'>No standings available for the current round.</p>"
-        else:
-            grouped_standings = defaultdict(list)
-            for row in standings_data:
-                grouped_standings[row[0]].append(row[1:]) 
-            
-            top_boxes = sorted(grouped_standings.keys())[:3] 
-            
-            for box_name in top_boxes:
-                html_sections += f"<h3>{box_name} Standings</h3>"
-                html_sections += """
+# Rendering backends selectable per run
+RENDERERS = ('playwright', 'pillow')
+DEFAULT_RENDERER = 'playwright'
+
+# Boxes that fit on one 1080x1920 post
+MAX_BOXES_PER_POST = 3
+
+
+def parse_time_filter(text):
+    """
+    Validates a matches-post time window: 'all', 'week' or 'YYYY-MM-DD:YYYY-MM-DD'
+    (both dates inclusive).
+
+    Returns:
+        str: The normalised window.
+
+    Raises:
+        ValueError: If the window is not in one of those forms.
+    """
+    time_filter = text.lower().strip()
+    if time_filter in ('all', 'week'):
+        return time_filter
+    start_text, separator, end_text = time_filter.partition(':')
+    if not separator:
+        raise ValueError(f"Invalid time window '{text}': use 'all', 'week' or YYYY-MM-DD:YYYY-MM-DD.")
+    start_date = datetime.date.fromisoformat(start_text)
+    end_date = datetime.date.fromisoformat(end_text)
+    if end_date < start_date:
+        raise ValueError(f"Invalid time window '{text}': the end date is before the start date.")
+    return f"{start_date.isoformat()}:{end_date.isoformat()}"
+
+
+def _time_window_label(time_filter):
+    """File-name friendly label for a window, e.g. 'week' or '20240501_20240507'."""
+    return time_filter.replace('-', '').replace(':', '_')
+
+
+def _as_date(value):
+    return value.date() if isinstance(value, datetime.datetime) else value
+
+
+def _select_boxes(box_names, boxes=None):
+    """The boxes a post shows: the requested ones (or all), in name order, at most MAX_BOXES_PER_POST."""
+    if boxes:
+        box_names = [box_name for box_name in box_names if box_name in boxes]
+    return sorted(box_names)[:MAX_BOXES_PER_POST]
+
+
+def build_current_standings_post(snapshot, boxes=None):
+    """
+    Builds the Current Round Top Box Standings post model from a LeagueSnapshot.
+
+    Args:
+        snapshot (LeagueSnapshot): The extracted league data.
+        boxes (list): Box names to show; defaults to the first boxes by name.
+    """
+    today_date = datetime.date.today().strftime('%d %b %Y').lstrip('0')
+    round_info = snapshot.current_round
+
+    round_name = "Current Round"
+    if round_info:
+        round_name = round_info[0]
+
+    # Rows: RoundName, BoxName, PlayerName, MatchesPlayed, Wins, Losses, Draws, Points, RankInBox
+    grouped_standings = defaultdict(list)
+    for row in snapshot.current_standings:
+        grouped_standings[row[1]].append(row[2:])
+
+    sections = []
+    for box_name in _select_boxes(grouped_standings.keys(), boxes):
+        rows = []
+        for player_stats in grouped_standings[box_name]:
+            player_name = format_player_name(player_stats[0])
+            matches_played = player_stats[1]
+            points = int(player_stats[5])
+            rank = player_stats[6]
+            rows.append((f"#{rank}", player_name, matches_played, points))
+        sections.append(PostSection(f"{box_name} Standings", 'table', ('Rank', 'Player', 'Played', 'Points'), rows))
+
+    return InstaPost(
+        'insta_post_1_standings', 'Standings', (round_name, 'Current Standings'), today_date, sections,
+        "No standings available for the current round.",
+    )
+
+
+def build_matches_summary_post(snapshot, time_filter='all', boxes=None, post_id='insta_post_2_matches_summary'):
+    """
+    Builds the played-matches summary post model from a LeagueSnapshot.
+
+    Args:
+        snapshot (LeagueSnapshot): The extracted league data.
+        time_filter (str): 'all' for every played match, 'week' for the last 7 days,
+            or 'YYYY-MM-DD:YYYY-MM-DD' for matches played between two dates.
+        boxes (list): Box names to show; defaults to the first boxes by name.
+        post_id (str): Output file name (without extension) and HTML element id.
+    """
+    today_date = datetime.date.today().strftime('%d %b %Y').lstrip('0')
+    round_info = snapshot.current_round
+    round_name = round_info[0] if round_info else "Current Round"
+
+    # Rows: RoundName, BoxName, Player1Name, Player2Name, Score, WinnerName, PlayedOn, Comments_Match_Summary
+    matches_data = [
+        row for row in snapshot.current_matches
+        if row[5] is not None and row[5] != 'Pending'
+    ]
+
+    heading_text = "Recent Results"
+
+    if time_filter == 'week':
+        # Same cut-off the view query used: PlayedOn >= DATEADD(day, -7, GETDATE())
+        week_start = snapshot.extracted_at - datetime.timedelta(days=7)
+        matches_data = [
+            row for row in matches_data
+            if row[6] is not None and datetime.datetime.combine(row[6], datetime.time.min) >= week_start
+        ]
+        heading_text = "Last Week's Results"
+    elif time_filter == 'all':
+        heading_text = "Match Results"
+    else:
+        start_date, end_date = (datetime.date.fromisoformat(part) for part in time_filter.split(':'))
+        matches_data = [
+            row for row in matches_data
+            if row[6] is not None and start_date <= _as_date(row[6]) <= end_date
+        ]
+        heading_text = f"Results {start_date.strftime('%d %b').lstrip('0')} - {end_date.strftime('%d %b').lstrip('0')}"
+
+    # ORDER BY BoxName ASC, PlayedOn DESC, Player1Name ASC (boxes are ordered when grouped below)
+    matches_data.sort(key=lambda row: row[2] or '')
+    matches_data.sort(key=lambda row: row[6] or datetime.date.min, reverse=True)
+
+    grouped_matches = defaultdict(list)
+    for row in matches_data:
+        grouped_matches[row[1]].append(row[2:])
+
+    sections = []
+    for box_name in _select_boxes(grouped_matches.keys(), boxes):
+        rows = []
+        for match in grouped_matches[box_name]:
+            player1_name = format_player_name(match[0])
+            player2_name = format_player_name(match[1])
+            score = match[2] if match[2] else 'Unknown Score'
+            formatted_winner = format_player_name(match[3])
+            comments = match[5].strip() if match[5] else None
+            rows.append((
+                f"{player1_name} vs {player2_name}",
+                comments if comments else "",
+                formatted_winner if formatted_winner else 'Draw',
+                score,
+            ))
+        sections.append(PostSection(f"{box_name} Results", 'matches', ('Matchup', 'Winner & Score'), rows))
+
+    return InstaPost(
+        post_id, 'Matches Summary', (round_name, heading_text), today_date, sections,
+        f"No matches found for {heading_text.lower()} in the current round yet.",
+    )
+
+
+def build_leaderboard_post(snapshot):
+    """Builds the overall top 10 players Leaderboard post model from a LeagueSnapshot."""
+    today_date = datetime.date.today().strftime('%d %b %Y').lstrip('0')
+
+    # Top 10 rows: PlayerName, MatchesPlayed, MatchesWon, GamesWon, SetsWon, MatchesLost, MatchesDraw, TotalPoints, OverallRank
+    rows = []
+    for row in snapshot.leaderboard[:10]:
+        player_name = format_player_name(row[0])
+        total_points = int(row[7])
+        rank = row[8]
+        rows.append((f"#{rank}", player_name, total_points))
+
+    sections = []
+    if rows:
+        sections.append(PostSection(None, 'table', ('Rank', 'Player', 'Overall Ranking Points'), rows))
+
+    return InstaPost(
+        'insta_post_3_leaderboard', 'Leaderboard', ('Overall League', 'Leaderboard'), today_date, sections,
+        "No overall leaderboard data available.",
+    )
+
+
+# --- Post Rendering ---
+def render_post_html(post):
+    """Renders a post model as the HTML page styled by css/insta_style.css."""
+    html_sections = []
+    if not post.sections:
+        html_sections.append(f"<p style='font-size:2em; margin-top:200px;'>{post.empty_message}</p>")
+
+    for section in post.sections:
+        if section.heading:
+            html_sections.append(f"<h3>{section.heading}</h3>")
+        header_cells = ''.join(f"<th>{column}</th>" for column in section.columns)
+        html_sections.append(f"""
                 <table class="data-table">
                     <thead>
-                        <tr>
-                            <th>Rank</th>
-                            <th>Player</th>
-                            <th>Played</th>
-                            <th>Points</th>
-                        </tr>
+                        <tr>{header_cells}</tr>
                     </thead>
                     <tbody>
-                """
-                for player_stats in grouped_standings[box_name]:
-                    player_name = format_player_name(player_stats[0]) 
-                    matches_played = player_stats[1]
-                    points = int(player_stats[4])
-                    rank = player_stats[5]
-                    html_sections += f"""
+                """)
+        for row in section.rows:
+            if section.kind == 'matches':
+                matchup, comment, winner, score = row
+                match_summary = f"""
+                        {matchup}
+                        <div class='match-comment-full'>
+                            <span class='comment-title'>Comments/Match Summary:</span> {comment}
+                        </div>
+                    """
+                result_cell = f"<strong style='color:#388e3c;'>{winner}</strong><br><small>({score})</small>"
+                html_sections.append(f"""
                         <tr>
-                            <td>#{rank}</td>
-                            <td>{player_name}</td>
-                            <td>{matches_played}</td>
-                            <td>{points}</td>
+                            <td style="text-align:left; vertical-align:top;">{match_summary}</td>
+                            <td style="text-align:center; vertical-align:top;">{result_cell}</td>
                         </tr>
-                    """
-                html_sections += "</tbody></table>"
-        post_html = f"""
+                    """)
+            else:
+                cells = ''.join(f"<td>{value}</td>" for value in row)
+                html_sections.append(f"""
+                        <tr>{cells}</tr>
+                    """)
+        html_sections.append("</tbody></table>")
+
+    return f"""
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Instagram Post - Standings</title>
+    <title>Instagram Post - {post.page_title}</title>
     <link rel="stylesheet" href="css/insta_style.css">
 </head>
 <body>
-    <div class="insta-post" id="insta_post_1_standings">
-        <h2>{round_name} <br> Current Standings</h2>
-        <div class="report-date">{today_date}</div>
-        {html_sections}
+    <div class="insta-post" id="{post.post_id}">
+        <h2>{' <br> '.join(post.title_lines)}</h2>
+        <div class="report-date">{post.report_date}</div>
+        {''.join(html_sections)}
         <div class="insta-footer">
             <img src="{LOGO_PATH}" alt="Logo" class="logo-img">
         </div>
@@ -315,314 +470,266 @@ def generate_current_standings_post():
 </body>
 </html>
         """
-        with open(output_file_path, 'w', encoding='utf-8') as f:
-            f.write(post_html)
+
+
+def write_post(post, renderer=DEFAULT_RENDERER):
+    """
+    Writes a post model to output_dir with the chosen backend.
+
+    Args:
+        post (InstaPost): The post to render.
+        renderer (str): 'playwright' writes the HTML page to be captured later;
+            'pillow' draws the PNG directly, with no browser involved.
+
+    Returns:
+        str: Path of the written .html (playwright) or .png (pillow) file.
+    """
+    if renderer == 'pillow':
+        output_file_path = os.path.join(output_dir, f"{post.post_id}.png")
+        with build_metrics.stage('render'):
+            insta_png_renderer.render_post_png(
+                post, output_file_path,
+                background_path=TARGET_BK_IMAGE_PATH,
+                logo_path=os.path.join(output_dir, LOGO_PATH),
+            )
+        build_metrics.add_bytes(os.path.getsize(output_file_path))
+    else:
+        output_file_path = os.path.join(output_dir, f"{post.post_id}.html")
+        with build_metrics.stage('render'):
+            post_html = render_post_html(post)
+        with build_metrics.stage('write'):
+            with open(output_file_path, 'w', encoding='utf-8') as f:
+                f.write(post_html)
+            build_metrics.add_bytes(os.path.getsize(output_file_path))
+    return output_file_path
+
+
+# --- Post 1: Current Round Standings ---
+def generate_current_standings_post(snapshot=None, renderer=DEFAULT_RENDERER, boxes=None):
+    """Generates the Current Round Top Box Standings post (HTML, or PNG with the pillow renderer)."""
+    try:
+        if snapshot is None:
+            with build_metrics.stage('extract'):
+                snapshot = league_snapshot.extract_league_snapshot()
+
+        with build_metrics.stage('build'):
+            post = build_current_standings_post(snapshot, boxes)
+        output_file_path = write_post(post, renderer)
         print(f"Generated {output_file_path} (Current Standings Post) successfully!")
         return output_file_path
 
-    except pyodbc.Error as ex:
+    except league_db.DatabaseError as ex:
         print(f"Database error in generate_current_standings_post: {ex}")
     except Exception as e:
         print(f"An unexpected error occurred in generate_current_standings_post: {e}")
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
     return None
 
 # ---------------------------------------------
 
-# --- Post 2: Summary of Matches Played So Far (UNIFIED HTML with overlay removed) ---
-def generate_matches_summary_post():
-    """
-    Generates a summary of played matches, filtered by user input ('all' or 'week').
-    """
-    conn = None
-    cursor = None
-    html_sections = ""
-    output_file_path = os.path.join(output_dir, 'insta_post_2_matches_summary.html')
-    
-    today_date = datetime.date.today().strftime('%d %b %Y').lstrip('0')
-
+# --- Post 2: Summary of Matches Played So Far ---
+def ask_time_filter():
+    """Asks on the terminal whether to summarise 'all' matches or the last 'week'."""
     time_filter = input("Show matches from 'all' time or last 'week'? Enter 'all' or 'week': ").lower().strip()
     
     if time_filter not in ['all', 'week']:
         print("Invalid input. Defaulting to 'all' matches.")
         time_filter = 'all'
+    return time_filter
 
-    try:
-        conn_str = (
-            f"DRIVER={{{ODBC_DRIVER}}};"
-            f"SERVER={DB_SERVER};"
-            f"DATABASE={DB_NAME};"
-            f"Trusted_Connection=yes;"
-        )
-        conn = pyodbc.connect(conn_str)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-             SELECT TOP 1 [name]
-             FROM dbo.rounds
-             WHERE GETDATE() BETWEEN start_date AND end_date
-             ORDER BY start_date DESC
-        """)
-        round_info = cursor.fetchone()
-        round_name = round_info[0] if round_info else "Current Round"
-
-        sql_query = """
-             SELECT BoxName, Player1Name, Player2Name, Score, WinnerName, PlayedOn, Comments_Match_Summary 
-             FROM dbo.vw_CurrentRoundMatches 
-             WHERE WinnerName IS NOT NULL AND WinnerName <> 'Pending' 
-        """
-        
-        heading_text = "Recent Results"
-        
-        if time_filter == 'week':
-            sql_query += "AND PlayedOn >= DATEADD(day, -7, GETDATE()) "
-            heading_text = "Last Week's Results"
-        elif time_filter == 'all':
-            heading_text = "Match Results"
-
-        sql_query += "ORDER BY BoxName ASC, PlayedOn DESC, Player1Name ASC"
-        
-        cursor.execute(sql_query)
-        matches_data = cursor.fetchall() 
-        
-        
-        if not matches_data:
-            html_sections = f"<p style='font-size:2em; margin-top:200px;'>No matches found for {heading_text.lower()} in the current round yet.</p>"
-        else:
-            grouped_matches = defaultdict(list)
-            for row in matches_data:
-                grouped_matches[row[0]].append(row[1:])
-            
-            top_boxes = sorted(grouped_matches.keys())[:3] 
-            
-            for box_name in top_boxes:
-                box_matches = grouped_matches[box_name]
-                
-                if not box_matches:
-                    html_sections += f"<h3>{box_name} Results</h3><p>No results posted yet.</p>"
-                    continue
-                    
-                html_sections += f"<h3>{box_name} Results</h3>"
-                html_sections += """
-                <table class="data-table">
-                    <thead>
-                        <tr>
-                            <th>Matchup</th>
-                            <th>Winner & Score</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                """
-                for match in box_matches:
-                    player1_name = format_player_name(match[0]) 
-                    player2_name = format_player_name(match[1]) 
-                    score = match[2] if match[2] else 'Unknown Score'
-                    
-                    winner_full_name = match[3] 
-                    formatted_winner = format_player_name(winner_full_name) 
-
-                    comments = match[5].strip() if match[5] else None 
-                    
-                    comment_content = comments if comments else ""
-                        
-                    comment_html = f"""
-                        <div class='match-comment-full'>
-                            <span class='comment-title'>Comments/Match Summary:</span> {comment_content}
-                        </div>
-                    """
-                    
-                    match_summary = f"""
-                        {player1_name} vs {player2_name}
-                        {comment_html}
-                    """
-                        
-                    result_cell = f"<strong style='color:#388e3c;'>{formatted_winner if formatted_winner else 'Draw'}</strong><br><small>({score})</small>" 
-                        
-                    html_sections += f"""
-                        <tr>
-                            <td style="text-align:left; vertical-align:top;">{match_summary}</td>
-                            <td style="text-align:center; vertical-align:top;">{result_cell}</td>
-                        </tr>
-                    """
-                html_sections += "</tbody></table>"
 
-        post_html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Instagram Post - Matches Summary</title>
-    <link rel="stylesheet" href="css/insta_style.css">
-</head>
-<body>
-    <div class="insta-post" id="insta_post_2_matches_summary">
-        <h2>{round_name} <br> {heading_text}</h2>
-        <div class="report-date">{today_date}</div>
-        {html_sections}
-        <div class="insta-footer">
-            <img src="{LOGO_PATH}" alt="Logo" class="logo-img">
-        </div>
-    </div>
-</body>
-</html>
-        """
-        with open(output_file_path, 'w', encoding='utf-8') as f:
-            f.write(post_html)
-        print(f"Generated {output_file_path} (Matches Summary Post - Filter: {time_filter}) successfully!")
-        return output_file_path
+def generate_matches_summary_post(snapshot=None, renderer=DEFAULT_RENDERER, time_filter=None, boxes=None):
+    """
+    Generates a summary of played matches for one time window.
 
-    except pyodbc.Error as ex:
-        print(f"Database error in generate_matches_summary_post: {ex}")
-    except Exception as e:
-        print(f"An unexpected error occurred in generate_matches_summary_post: {e}")
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
-    return None
+    Args:
+        snapshot (LeagueSnapshot): Extracted league data; read from the database if None.
+        renderer (str): 'playwright' (HTML) or 'pillow' (PNG).
+        time_filter (str): 'all', 'week' or 'YYYY-MM-DD:YYYY-MM-DD'. When None the
+            user is asked interactively, or 'all' is used if there is no terminal.
+        boxes (list): Box names to show; defaults to the first boxes by name.
+
+    Returns:
+        str: Path of the generated file, or None on error.
+    """
+    return generate_matches_summary_posts(snapshot, renderer, [time_filter], boxes)[0]
 
 
-# --- Post 3: Leaderboard Report (UNIFIED HTML with overlay removed) ---
-def generate_leaderboard_post():
-    """Generates the overall top 10 players Leaderboard post HTML."""
-    conn = None
-    cursor = None
-    html_sections = ""
-    output_file_path = os.path.join(output_dir, 'insta_post_3_leaderboard.html')
+def generate_matches_summary_posts(snapshot=None, renderer=DEFAULT_RENDERER, time_filters=('all',), boxes=None):
+    """
+    Generates one matches summary post per time window from the same snapshot.
+
+    Windows given explicitly get the window in their file name
+    (insta_post_2_matches_summary_week.html, ..._20240501_20240507.html) so
+    several can be produced in one run; a None window prompts for 'all' or
+    'week' and keeps the plain file name.
 
+    Returns:
+        list: The generated path for each window, or None where it failed.
+    """
     try:
-        today_date = datetime.date.today().strftime('%d %b %Y').lstrip('0')
-        
-        conn_str = (
-            f"DRIVER={{{ODBC_DRIVER}}};"
-            f"SERVER={DB_SERVER};"
-            f"DATABASE={DB_NAME};"
-            f"Trusted_Connection=yes;"
-        )
-        conn = pyodbc.connect(conn_str)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-             SELECT TOP 10 PlayerName, TotalPoints, OverallRank 
-             FROM dbo.vw_OverallLeaderboard 
-             ORDER BY OverallRank ASC
-        """)
-        leaderboard_data = cursor.fetchall()
-        
-        if not leaderboard_data:
-            html_sections = "<p style='font-size:2em; margin-top:200px;'>No overall leaderboard data available.</p>"
-        else:
-            html_sections += """
-            <table class="data-table">
-                <thead>
-                    <tr>
-                        <th>Rank</th>
-                        <th>Player</th>
-                        <th>Overall Ranking Points</th>
-                    </tr>
-                </thead>
-                <tbody>
-            """
-            for row in leaderboard_data:
-                player_name = format_player_name(row[0]) 
-                total_points = int(row[1])
-                rank = row[2] 
-                html_sections += f"""
-                    <tr>
-                        <td>#{rank}</td>
-                        <td>{player_name}</td>
-                        <td>{total_points}</td>
-                    </tr>
-                """
-            html_sections += "</tbody></table>"
-
-        post_html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Instagram Post - Leaderboard</title>
-    <link rel="stylesheet" href="css/insta_style.css">
-</head>
-<body>
-    <div class="insta-post" id="insta_post_3_leaderboard">
-        <h2>Overall League <br> Leaderboard</h2>
-        <div class="report-date">{today_date}</div>
-        {html_sections}
-        <div class="insta-footer">
-            <img src="{LOGO_PATH}" alt="Logo" class="logo-img">
-        </div>
-    </div>
-</body>
-</html>
-        """
-        with open(output_file_path, 'w', encoding='utf-8') as f:
-            f.write(post_html)
+        if snapshot is None:
+            with build_metrics.stage('extract'):
+                snapshot = league_snapshot.extract_league_snapshot()
+    except league_db.DatabaseError as ex:
+        print(f"Database error in generate_matches_summary_posts: {ex}")
+        return [None] * len(time_filters)
+
+    output_paths = []
+    for time_filter in time_filters:
+        post_id = 'insta_post_2_matches_summary'
+        try:
+            if time_filter is None:
+                time_filter = ask_time_filter() if sys.stdin.isatty() else 'all'
+            else:
+                time_filter = parse_time_filter(time_filter)
+                post_id = f"{post_id}_{_time_window_label(time_filter)}"
+
+            with build_metrics.stage('build'):
+                post = build_matches_summary_post(snapshot, time_filter, boxes, post_id)
+            output_file_path = write_post(post, renderer)
+            print(f"Generated {output_file_path} (Matches Summary Post - Filter: {time_filter}) successfully!")
+            output_paths.append(output_file_path)
+            continue
+
+        except ValueError as e:
+            print(f"Skipping matches summary post: {e}")
+        except Exception as e:
+            print(f"An unexpected error occurred in generate_matches_summary_posts: {e}")
+        output_paths.append(None)
+    return output_paths
+
+
+# --- Post 3: Leaderboard Report ---
+def generate_leaderboard_post(snapshot=None, renderer=DEFAULT_RENDERER):
+    """Generates the overall top 10 players Leaderboard post (HTML, or PNG with the pillow renderer)."""
+    try:
+        if snapshot is None:
+            with build_metrics.stage('extract'):
+                snapshot = league_snapshot.extract_league_snapshot()
+
+        with build_metrics.stage('build'):
+            post = build_leaderboard_post(snapshot)
+        output_file_path = write_post(post, renderer)
         print(f"Generated {output_file_path} (Leaderboard Post) successfully!")
         return output_file_path
 
-    except pyodbc.Error as ex:
+    except league_db.DatabaseError as ex:
         print(f"Database error in generate_leaderboard_post: {ex}")
     except Exception as e:
         print(f"An unexpected error occurred in generate_leaderboard_post: {e}")
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
     return None
 
 # ---------------------------------------------
 
 
-# --- Automated Screenshot Function (Unchanged) ---
-def capture_insta_post_png(html_file_path, output_png_name):
-    """
-    Uses Playwright (Chromium) to open the HTML file, capture the 
-    .insta-post element, and save it as a PNG.
-    """
-    output_png_path = os.path.join(output_dir, output_png_name)
-    
-    try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch()
-            context = browser.new_context(
-                viewport={'width': INSTA_WIDTH + 50, 'height': INSTA_HEIGHT + 50} 
-            )
-            page = context.new_page()
+# --- Automated Screenshot Functions ---
+def _print_playwright_help():
+    print("\n*** ACTION REQUIRED ***")
+    print("Please ensure Playwright is installed correctly:")
+    print("1. pip install playwright")
+    print("2. playwright install")
+    print("***********************\n")
+
 
+async def _capture_one(context, semaphore, html_file_path, output_png_name):
+    """Opens one post in its own page of the shared browser and screenshots it."""
+    output_png_path = os.path.join(output_dir, output_png_name)
+    async with semaphore:
+        page = await context.new_page()
+        try:
             full_path = 'file:///' + os.path.abspath(html_file_path).replace('\\', '/')
-            page.goto(full_path)
-            
-            page.wait_for_selector('.insta-post') 
-
-            page.locator('.insta-post').screenshot(path=output_png_path)
-            
-            browser.close()
-            
+            await page.goto(full_path)
+            await page.wait_for_selector('.insta-post')
+            await page.locator('.insta-post').screenshot(path=output_png_path)
+            build_metrics.add_bytes(os.path.getsize(output_png_path))
             print(f"Successfully captured PNG using Playwright: {output_png_path}")
             return output_png_path
+        except Exception as e:
+            print(f"Error capturing screenshot for {html_file_path}: {e}")
+            return None
+        finally:
+            await page.close()
+
+
+async def _capture_all(capture_jobs):
+    # Imported here so the pillow renderer works on hosts without Playwright.
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        try:
+            context = await browser.new_context(
+                viewport={'width': INSTA_WIDTH + 50, 'height': INSTA_HEIGHT + 50}
+            )
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_CAPTURES)
+            return await asyncio.gather(*(
+                _capture_one(context, semaphore, html_file_path, output_png_name)
+                for html_file_path, output_png_name in capture_jobs
+            ))
+        finally:
+            await browser.close()
+
+
+def capture_insta_posts_png(capture_jobs):
+    """
+    Uses Playwright (Chromium) to capture the .insta-post element of many HTML
+    files as PNGs. Chromium is launched once for the whole batch and every post
+    gets its own page, captured concurrently.
+
+    Args:
+        capture_jobs (list): (html_file_path, output_png_name) pairs.
 
+    Returns:
+        list: The PNG path for each job, or None where that capture failed.
+    """
+    if not capture_jobs:
+        return []
+    try:
+        with build_metrics.stage('screenshot'):
+            results = asyncio.run(_capture_all(capture_jobs))
     except Exception as e:
-        print(f"Error capturing screenshot for {html_file_path}: {e}")
-        print("\n*** ACTION REQUIRED ***")
-        print("Please ensure Playwright is installed correctly:")
-        print("1. pip install playwright")
-        print("2. playwright install")
-        print("***********************\n")
-        return None
+        print(f"Error starting Playwright for {len(capture_jobs)} screenshot(s): {e}")
+        _print_playwright_help()
+        return [None] * len(capture_jobs)
+    if None in results:
+        _print_playwright_help()
+    return results
+
+
+def capture_insta_post_png(html_file_path, output_png_name):
+    """
+    Uses Playwright (Chromium) to open the HTML file, capture the 
+    .insta-post element, and save it as a PNG.
+    """
+    return capture_insta_posts_png([(html_file_path, output_png_name)])[0]
 
 
 # --- Main Execution Block ---
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the Instagram story posts.")
+    parser.add_argument('--renderer', choices=RENDERERS, default=DEFAULT_RENDERER,
+                        help="'playwright' screenshots the HTML posts in Chromium; "
+                             "'pillow' draws the PNGs directly without a browser.")
+    parser.add_argument('--window', action='append', type=parse_time_filter, metavar='WINDOW',
+                        help="Time window for the matches summary post: 'all', 'week' or "
+                             "YYYY-MM-DD:YYYY-MM-DD. Repeat to render several variants in one run; "
+                             "without it the script asks interactively.")
+    parser.add_argument('--boxes', nargs='+', metavar='BOX',
+                        help="Only show these boxes (by name) on the standings and matches posts.")
+    parser.add_argument('--sqlite', metavar='PATH',
+                        help="Read from a local SQLite database file instead of SQL Server.")
+    parser.add_argument('--metrics-json', metavar='PATH',
+                        help="Write per-post stage timings, rows fetched and bytes written as JSON.")
+    parser.add_argument('--profile', metavar='PATH', help="Write a cProfile dump of the run.")
+    args = parser.parse_args()
+    if args.sqlite:
+        league_db.use_sqlite(args.sqlite)
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
     print("Starting Instagram post generation...")
+    build_start = time.perf_counter()
 
     # Copy the background image from the provided container path into docs_test/assets/
     try:
@@ -636,23 +743,50 @@ if __name__ == "__main__":
         print(f"Failed to copy background image: {e}")
 
     # 1. Create the dedicated CSS file
-    create_instagram_post_css()
-
-    # 2. Generate the three HTML files (The match summary will prompt for input)
-    standings_html_path = generate_current_standings_post()
-    matches_html_path = generate_matches_summary_post()
-    leaderboard_html_path = generate_leaderboard_post()
-    
-    print("\n--- Starting Automated PNG Capture (Using Playwright) ---\n")
+    if args.renderer == 'playwright':
+        create_instagram_post_css()
 
-    # 3. Capture the PNGs from the generated HTML files
-    if standings_html_path:
-        capture_insta_post_png(standings_html_path, 'insta_post_1_standings.png')
-        
-    if matches_html_path:
-        capture_insta_post_png(matches_html_path, 'insta_post_2_matches_summary.png')
-
-    if leaderboard_html_path:
-        capture_insta_post_png(leaderboard_html_path, 'insta_post_3_leaderboard.png')
+    # 2. Generate the posts from one snapshot (The match summary prompts for input unless --window is given)
+    standings_path = leaderboard_path = None
+    matches_paths = []
+    try:
+        with build_metrics.report('snapshot'), build_metrics.stage('extract'):
+            snapshot = league_snapshot.extract_league_snapshot()
+    except league_db.DatabaseError as ex:
+        print(f"Database error while extracting league data: {ex}")
+        snapshot = None
+
+    if snapshot:
+        with build_metrics.report('insta_standings'):
+            standings_path = generate_current_standings_post(snapshot, args.renderer, args.boxes)
+        with build_metrics.report('insta_matches_summary'):
+            matches_paths = generate_matches_summary_posts(snapshot, args.renderer, args.window or [None], args.boxes)
+        with build_metrics.report('insta_leaderboard'):
+            leaderboard_path = generate_leaderboard_post(snapshot, args.renderer)
+    league_db.close_pool()
+    league_db.print_db_stats()
+
+    if args.renderer == 'playwright':
+        print("\n--- Starting Automated PNG Capture (Using Playwright) ---\n")
+
+        # 3. Capture the PNGs from the generated HTML files in one browser session
+        capture_jobs = []
+        for html_path in [standings_path] + matches_paths + [leaderboard_path]:
+            if html_path:
+                png_name = os.path.splitext(os.path.basename(html_path))[0] + '.png'
+                capture_jobs.append((html_path, png_name))
+
+        with build_metrics.report('screenshots'):
+            capture_insta_posts_png(capture_jobs)
     
     print("\nGeneration Complete! Check the 'docs_test' folder for your PNG files.")
+
+    if args.profile:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        print(f"Wrote profile to {args.profile}")
+    if args.metrics_json:
+        build_metrics.write_metrics_json(
+            args.metrics_json, time.perf_counter() - build_start,
+            backend=league_db.get_backend().name, renderer=args.renderer, database=league_db.get_db_stats(),
+        )
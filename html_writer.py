@@ -0,0 +1,62 @@
+import hashlib
+import os
+import time
+
+import build_metrics
+
+
+class PageWriter:
+    """
+    Streams a page to disk fragment by fragment instead of concatenating one
+    big string, so memory stays flat however long the page gets.
+
+    Fragments are written to a temporary file next to the target and hashed on
+    the way through. The build manifest then either moves the file into place
+    or discards it when the existing page is byte-for-byte identical.
+    """
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self.temp_path = output_path + '.tmp'
+        self.bytes_written = 0
+        self.write_seconds = 0.0
+        self._digest = hashlib.sha256()
+        self._file = open(self.temp_path, 'wb')
+
+    def write(self, fragment):
+        start = time.perf_counter()
+        data = fragment.encode('utf-8')
+        self._digest.update(data)
+        self._file.write(data)
+        self.bytes_written += len(data)
+        self.write_seconds += time.perf_counter() - start
+
+    @property
+    def body_hash(self):
+        return self._digest.hexdigest()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+            build_metrics.add_stage_time('write', self.write_seconds)
+            build_metrics.add_bytes(self.bytes_written)
+
+    def commit(self):
+        """Moves the finished page into place."""
+        self.close()
+        os.replace(self.temp_path, self.output_path)
+
+    def discard(self):
+        """Throws the rendered page away, leaving any existing file untouched."""
+        self.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Never leave a half-written page behind.
+        if exc_type is not None or os.path.exists(self.temp_path):
+            self.discard()
+        return False
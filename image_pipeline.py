@@ -0,0 +1,212 @@
+import html
+import os
+import re
+from collections import namedtuple
+
+import build_manifest
+import build_metrics
+import build_runner
+
+try:
+    from PIL import Image, features
+except ImportError:
+    # Without Pillow the image stage is skipped and pages keep plain <img> tags.
+    Image = None
+
+# --- Configuration ---
+SITE_DIR = 'docs'
+IMAGE_SOURCE_DIR = 'assets'
+
+# Variants live in their own folder; every file in it is build output.
+IMAGE_OUTPUT_DIR = 'assets/responsive'
+
+# Source images that get variants (case-insensitive).
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+# Widths (in pixels) the variants are encoded at. An image is never enlarged:
+# smaller sources get the widths below their own plus their own width.
+IMAGE_WIDTHS = (160, 320, 640, 1280)
+
+# Most efficient first: browsers take the first <source> type they support.
+#   (extension, MIME type, Pillow save options)
+IMAGE_FORMATS = [
+    ('avif', 'image/avif', {'quality': 50}),
+    ('webp', 'image/webp', {'quality': 80, 'method': 4}),
+]
+
+# The sizes attribute per CSS class, from the widths style.css gives them.
+IMAGE_SIZES = {
+    'header-logo': '150px',
+    'partner-logo': '170px',
+}
+DEFAULT_IMAGE_SIZES = '(max-width: 768px) 100vw, 50vw'
+
+SOURCE_HASH_LENGTH = 10
+
+# Responsive versions of one source image.
+#   width, height: of the source, for the <img> width/height attributes
+#   sources: list of (MIME type, srcset) in IMAGE_FORMATS order
+ImageSet = namedtuple('ImageSet', ['width', 'height', 'sources'])
+
+# 'assets/<name>' -> ImageSet, filled by build_images() for the images pages show.
+IMAGE_VARIANTS = {}
+
+_PICTURE_RE = re.compile(r'<picture data-src="[^"]*">.*?(<img\b[^>]*>)\s*</picture>', re.DOTALL)
+_IMG_RE = re.compile(r'<img\b[^>]*>')
+_IMG_SRC_RE = re.compile(r'<img\b[^>]*?\bsrc="(' + re.escape(IMAGE_SOURCE_DIR) + r'/[^"/]+)"')
+
+
+def _available_formats():
+    return [image_format for image_format in IMAGE_FORMATS if features.check(image_format[0])]
+
+
+def _variant_widths(source_width):
+    widths = [width for width in IMAGE_WIDTHS if width < source_width]
+    if source_width <= IMAGE_WIDTHS[-1]:
+        widths.append(source_width)
+    return widths or [IMAGE_WIDTHS[-1]]
+
+
+def _encode_variants(source_path, source_hash, image_formats, output_dir):
+    """
+    Encodes the missing variants of one image. A variant's file name carries
+    the source hash, so an existing file is already up to date.
+
+    Returns:
+        tuple: (ImageSet, set of variant file names, number encoded)
+    """
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    encoded = 0
+    file_names = set()
+    # Image.open only reads the header; pixels are loaded on the first resize.
+    with Image.open(source_path) as image:
+        source_width, source_height = image.size
+        sources = []
+        for extension, mime_type, save_options in image_formats:
+            srcset = []
+            for width in _variant_widths(source_width):
+                file_name = f"{stem}.{source_hash}.{width}w.{extension}"
+                file_names.add(file_name)
+                output_path = os.path.join(output_dir, file_name)
+                if not os.path.exists(output_path):
+                    height = max(1, round(source_height * width / source_width))
+                    variant = image if width == source_width else image.resize((width, height), Image.LANCZOS)
+                    if variant.mode not in ('RGB', 'RGBA'):
+                        variant = variant.convert('RGBA')
+                    variant.save(output_path + '.tmp', format=extension.upper(), **save_options)
+                    os.replace(output_path + '.tmp', output_path)
+                    build_metrics.add_bytes(os.path.getsize(output_path))
+                    encoded += 1
+                srcset.append(f"{IMAGE_OUTPUT_DIR}/{file_name} {width}w")
+            sources.append((mime_type, ', '.join(srcset)))
+    return ImageSet(source_width, source_height, sources), file_names, encoded
+
+
+def image_sources(page_html):
+    """The 'assets/<name>' images a page shows through <img> tags, i.e. those picture_html can wrap."""
+    return set(_IMG_SRC_RE.findall(page_html))
+
+
+def build_images(site_dir=SITE_DIR, sources=()):
+    """
+    Encodes resized AVIF and WebP variants of the given images. Images only
+    used elsewhere (og:image previews, for one) get none. Results are cached
+    by source hash: an unchanged image costs one hash and a header read,
+    never a re-encode, and files with identical bytes share one set of
+    variants. Variants no longer wanted are deleted.
+
+    Args:
+        site_dir (str): Folder holding the assets folder.
+        sources (iterable): 'assets/<name>' paths of the images pages show,
+            e.g. from image_sources().
+
+    Returns:
+        dict: 'assets/<name>' -> ImageSet, or None on error.
+    """
+    if Image is None:
+        print("Pillow is not installed; skipping responsive images.")
+        return {}
+    try:
+        image_formats = _available_formats()
+        output_dir = os.path.join(site_dir, *IMAGE_OUTPUT_DIR.split('/'))
+        os.makedirs(output_dir, exist_ok=True)
+
+        variants = {}
+        wanted = set()
+        encoded = 0
+        with build_metrics.stage('render'):
+            by_hash = {}
+            for source in sorted(set(sources)):
+                source_path = os.path.join(site_dir, *source.split('/'))
+                if not source.lower().endswith(IMAGE_EXTENSIONS) or not os.path.exists(source_path):
+                    continue
+                source_hash = build_manifest.hash_file(source_path)[:SOURCE_HASH_LENGTH]
+                if source_hash not in by_hash:
+                    image_set, file_names, count = _encode_variants(source_path, source_hash, image_formats, output_dir)
+                    by_hash[source_hash] = image_set
+                    wanted |= file_names
+                    encoded += count
+                variants[source] = by_hash[source_hash]
+
+            for file_name in os.listdir(output_dir):
+                if file_name not in wanted:
+                    os.remove(os.path.join(output_dir, file_name))
+
+        IMAGE_VARIANTS.clear()
+        IMAGE_VARIANTS.update(variants)
+        print(f"Prepared responsive variants of {len(variants)} image(s) ({len(by_hash)} distinct), {encoded} newly encoded")
+        return variants
+
+    except (OSError, ValueError) as e:
+        build_runner.note_error(f"Error building responsive images: {e}")
+    return None
+
+
+def _sizes_for(css_class):
+    for name in (css_class or '').split():
+        if name in IMAGE_SIZES:
+            return IMAGE_SIZES[name]
+    return DEFAULT_IMAGE_SIZES
+
+
+def picture_html(img_tag):
+    """
+    Wraps an <img> tag pointing at a docs/assets image in a <picture> with
+    AVIF/WebP srcsets. The original file stays the fallback src, and width
+    and height are added so the layout does not jump while it loads.
+
+    Returns:
+        str: The <picture> markup, or img_tag unchanged for images without variants.
+    """
+    src_match = re.search(r'\bsrc="([^"]*)"', img_tag)
+    image_set = IMAGE_VARIANTS.get(src_match.group(1)) if src_match else None
+    if image_set is None:
+        return img_tag
+    class_match = re.search(r'\bclass="([^"]*)"', img_tag)
+    sizes = html.escape(_sizes_for(class_match.group(1) if class_match else None))
+
+    img = img_tag
+    if not re.search(r'\bwidth=', img):
+        img = re.sub(r'\s*/?>$', f' width="{image_set.width}" height="{image_set.height}">', img)
+    sources = ''.join(
+        f'<source type="{mime_type}" srcset="{srcset}" sizes="{sizes}">'
+        for mime_type, srcset in image_set.sources
+    )
+    return f'<picture data-src="{src_match.group(1)}">{sources}{img}</picture>'
+
+
+def rewrite_images(page_html):
+    """
+    Gives every <img> of a docs/assets image in the page its responsive
+    <picture>. Pictures from an earlier run are rebuilt from their <img>, so
+    running it again only changes pages whose images changed.
+    """
+    if not IMAGE_VARIANTS:
+        # The image stage did not run: keep whatever markup the page has.
+        return page_html
+    def replace(match):
+        if match.group(1) is not None:
+            return picture_html(match.group(1))
+        return picture_html(match.group(0))
+    pattern = re.compile(f"{_PICTURE_RE.pattern}|{_IMG_RE.pattern}", re.DOTALL)
+    return pattern.sub(replace, page_html)
@@ -0,0 +1,304 @@
+import functools
+import os
+
+from PIL import Image, ImageDraw, ImageFont
+
+# --- Layout (mirrors create_instagram_post_css in generate_instagram_posts.py) ---
+INSTA_WIDTH = 1080
+INSTA_HEIGHT = 1920
+SAFE_TOP = 250
+SIDE_PADDING = 50
+CONTENT_WIDTH = INSTA_WIDTH - 2 * SIDE_PADDING
+
+# CSS sizes are em of a 16px root font.
+TITLE_SIZE = 56          # h2: 3.5em
+DATE_SIZE = 29           # .report-date: 1.8em
+HEADING_SIZE = 40        # h3: 2.5em
+CELL_SIZE = 26           # th, td: 1.6em
+COMMENT_SIZE = 20        # .match-comment-full: 0.8em of a cell
+MESSAGE_SIZE = 32        # "no data" paragraphs: 2em
+CELL_PADDING = 18
+LINE_SPACING = 1.2
+LOGO_SIZE = 250
+LOGO_BOTTOM = 50
+# Rows are drawn down to the top of the logo; the rest are left out with a warning.
+CONTENT_BOTTOM = INSTA_HEIGHT - LOGO_BOTTOM - LOGO_SIZE
+
+GREEN = '#8bc34a'
+WINNER_GREEN = '#388e3c'
+TEXT_DARK = '#333333'
+TEXT_HEADER = '#555555'
+TEXT_COMMENT = '#222222'
+ROW_BORDER = '#eeeeee'
+COMMENT_BORDER = '#cccccc'
+PAGE_BACKGROUND = '#f5f5f5'
+
+# Montserrat, the font the HTML posts load from Google Fonts, committed as
+# TTFs (SIL Open Font License, docs/assets/fonts/OFL.txt) next to this file.
+FONTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'docs', 'assets', 'fonts')
+FONT_FILES = {
+    400: 'Montserrat-Regular.ttf',
+    600: 'Montserrat-SemiBold.ttf',
+    700: 'Montserrat-Bold.ttf',
+    800: 'Montserrat-ExtraBold.ttf',
+}
+
+
+@functools.lru_cache(maxsize=None)
+def get_font(weight, size):
+    """
+    Loads a bundled Montserrat weight.
+
+    Raises:
+        FileNotFoundError: If the font file is missing. Pillow's default font
+            has other metrics, so the post would not match the HTML version.
+    """
+    font_path = os.path.join(FONTS_DIR, FONT_FILES[weight])
+    if not os.path.exists(font_path):
+        raise FileNotFoundError(f"Font {font_path} not found; the pillow renderer needs the Montserrat TTFs in {FONTS_DIR}.")
+    return ImageFont.truetype(font_path, size)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_background(background_path, mtime):
+    """Scales and crops the background to the post size, like background-size: cover."""
+    if not background_path or mtime is None:
+        return Image.new('RGB', (INSTA_WIDTH, INSTA_HEIGHT), PAGE_BACKGROUND)
+    with Image.open(background_path) as source:
+        source = source.convert('RGB')
+        scale = max(INSTA_WIDTH / source.width, INSTA_HEIGHT / source.height)
+        resized = source.resize((round(source.width * scale), round(source.height * scale)), Image.LANCZOS)
+    left = (resized.width - INSTA_WIDTH) // 2
+    top = (resized.height - INSTA_HEIGHT) // 2
+    return resized.crop((left, top, left + INSTA_WIDTH, top + INSTA_HEIGHT))
+
+
+@functools.lru_cache(maxsize=None)
+def _load_logo(logo_path, mtime):
+    if not logo_path or mtime is None:
+        return None
+    with Image.open(logo_path) as source:
+        logo = source.convert('RGBA')
+    # object-fit: contain
+    logo.thumbnail((LOGO_SIZE, LOGO_SIZE), Image.LANCZOS)
+    return logo
+
+
+def _mtime(path):
+    """Part of the image cache keys, so an edited background or logo is reloaded."""
+    try:
+        return os.path.getmtime(path) if path else None
+    except OSError:
+        return None
+
+
+def _text_width(font, text):
+    return font.getlength(text)
+
+
+def _line_height(font):
+    ascent, descent = font.getmetrics()
+    return round((ascent + descent) * LINE_SPACING)
+
+
+def _draw_centered(draw, text, font, fill, center_x, y):
+    draw.text((center_x - _text_width(font, text) / 2, y), text, font=font, fill=fill)
+
+
+def _wrap(font, text, width):
+    """Greedy word wrap for white-space: normal cells."""
+    lines = []
+    for paragraph in text.splitlines() or ['']:
+        line = ''
+        for word in paragraph.split():
+            candidate = f"{line} {word}" if line else word
+            if line and _text_width(font, candidate) > width:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+    return lines
+
+
+def _column_widths(fonts, columns, rows):
+    """Shares the table width out in proportion to each column's widest text, like table-layout: auto."""
+    header_font, cell_font = fonts
+    natural = []
+    for index, column in enumerate(columns):
+        widest = _text_width(header_font, column)
+        for row in rows:
+            widest = max(widest, _text_width(cell_font, str(row[index])))
+        natural.append(widest + 2 * CELL_PADDING)
+    total = sum(natural)
+    return [CONTENT_WIDTH * width / total for width in natural]
+
+
+def _draw_table(draw, section, y, highlight_first_column):
+    """
+    Draws a plain data table, stopping at CONTENT_BOTTOM.
+
+    Returns:
+        tuple: (y below the table, number of rows that did not fit)
+    """
+    header_font = get_font(600, CELL_SIZE)
+    cell_font = get_font(600, CELL_SIZE)
+    first_font = get_font(800, CELL_SIZE) if highlight_first_column else cell_font
+    widths = _column_widths((header_font, cell_font), section.columns, section.rows)
+    row_height = _line_height(cell_font) + 2 * CELL_PADDING
+
+    y += 10
+    x = SIDE_PADDING
+    for column, width in zip(section.columns, widths):
+        _draw_centered(draw, column, header_font, TEXT_HEADER, x + width / 2, y + CELL_PADDING)
+        x += width
+    y += row_height
+    draw.rectangle((SIDE_PADDING, y, SIDE_PADDING + CONTENT_WIDTH, y + 4), fill=GREEN)
+    y += 5
+
+    for row_number, row in enumerate(section.rows):
+        if y + row_height + 1 > CONTENT_BOTTOM:
+            return y, len(section.rows) - row_number
+        x = SIDE_PADDING
+        for index, (value, width) in enumerate(zip(row, widths)):
+            if index == 0 and highlight_first_column:
+                font, fill = first_font, GREEN
+            else:
+                font, fill = cell_font, TEXT_DARK
+            _draw_centered(draw, str(value), font, fill, x + width / 2, y + CELL_PADDING)
+            x += width
+        y += row_height
+        draw.line((SIDE_PADDING, y, SIDE_PADDING + CONTENT_WIDTH, y), fill=ROW_BORDER)
+        y += 1
+    return y, 0
+
+
+def _draw_match_table(draw, section, y):
+    """
+    Draws the matches table: matchup plus comment on the left, winner and
+    score on the right. Stops at CONTENT_BOTTOM.
+
+    Returns:
+        tuple: (y below the table, number of rows that did not fit)
+    """
+    header_font = get_font(600, CELL_SIZE)
+    cell_font = get_font(600, CELL_SIZE)
+    comment_font = get_font(400, COMMENT_SIZE)
+    comment_title_font = get_font(700, COMMENT_SIZE)
+    winner_font = get_font(700, CELL_SIZE)
+    score_font = get_font(600, COMMENT_SIZE)
+    cell_line = _line_height(cell_font)
+    comment_line = _line_height(comment_font)
+
+    result_width = max(
+        [_text_width(header_font, section.columns[1])]
+        + [max(_text_width(winner_font, row[2]), _text_width(score_font, f"({row[3]})")) for row in section.rows]
+    ) + 2 * CELL_PADDING
+    widths = [CONTENT_WIDTH - result_width, result_width]
+
+    y += 10
+    x = SIDE_PADDING
+    for column, width in zip(section.columns, widths):
+        _draw_centered(draw, column, header_font, TEXT_HEADER, x + width / 2, y + CELL_PADDING)
+        x += width
+    y += cell_line + 2 * CELL_PADDING
+    draw.rectangle((SIDE_PADDING, y, SIDE_PADDING + CONTENT_WIDTH, y + 4), fill=GREEN)
+    y += 5
+
+    comment_title = 'Comments/Match Summary:'
+    text_x = SIDE_PADDING + CELL_PADDING
+    text_width = widths[0] - 2 * CELL_PADDING
+    title_width = _text_width(comment_title_font, comment_title) + 5
+    for row_number, (matchup, comment, winner, score) in enumerate(section.rows):
+        comment_lines = _wrap(comment_font, comment, text_width - title_width) if comment else ['']
+        left_height = cell_line + 10 + len(comment_lines) * comment_line
+        right_height = cell_line + comment_line
+        if y + max(left_height, right_height) + 2 * CELL_PADDING + 1 > CONTENT_BOTTOM:
+            return y, len(section.rows) - row_number
+
+        # Left cell: "A vs B" followed by the comment block under a dotted rule.
+        left_y = y + CELL_PADDING
+        draw.text((text_x, left_y), matchup, font=cell_font, fill=TEXT_DARK)
+        left_y += cell_line + 5
+        for dot_x in range(text_x, int(text_x + text_width), 4):
+            draw.point((dot_x, left_y), fill=COMMENT_BORDER)
+        left_y += 5
+        draw.text((text_x, left_y), comment_title, font=comment_title_font, fill=TEXT_DARK)
+        for line_number, line in enumerate(comment_lines):
+            draw.text((text_x + title_width, left_y), line, font=comment_font, fill=TEXT_COMMENT)
+            if line_number < len(comment_lines) - 1:
+                left_y += comment_line
+        left_y += comment_line
+
+        # Right cell: winner (or Draw) over the score.
+        center_x = SIDE_PADDING + widths[0] + widths[1] / 2
+        right_y = y + CELL_PADDING
+        _draw_centered(draw, winner, winner_font, WINNER_GREEN, center_x, right_y)
+        right_y += cell_line
+        _draw_centered(draw, f"({score})", score_font, TEXT_DARK, center_x, right_y)
+        right_y += comment_line
+
+        y = max(left_y, right_y) + CELL_PADDING
+        draw.line((SIDE_PADDING, y, SIDE_PADDING + CONTENT_WIDTH, y), fill=ROW_BORDER)
+        y += 1
+    return y, 0
+
+
+def render_post_png(post, output_path, background_path=None, logo_path=None):
+    """
+    Draws an Instagram story post straight to a PNG, without a browser.
+
+    Args:
+        post (InstaPost): The post model built in generate_instagram_posts.py.
+        output_path (str): Where to save the PNG.
+        background_path (str): Background image, scaled to cover the post.
+        logo_path (str): Logo drawn in the footer, if the file exists.
+
+    Returns:
+        str: output_path.
+    """
+    image = _load_background(background_path, _mtime(background_path)).copy()
+    draw = ImageDraw.Draw(image)
+    center_x = INSTA_WIDTH / 2
+
+    y = SAFE_TOP
+    title_font = get_font(800, TITLE_SIZE)
+    for line in post.title_lines:
+        _draw_centered(draw, line, title_font, GREEN, center_x, y)
+        y += _line_height(title_font)
+    y += 10  # h2 margin-bottom 20px, .report-date margin-top -10px
+
+    date_font = get_font(700, DATE_SIZE)
+    _draw_centered(draw, post.report_date, date_font, TEXT_DARK, center_x, y)
+    y += _line_height(date_font) + 20
+
+    if not post.sections:
+        _draw_centered(draw, post.empty_message, get_font(400, MESSAGE_SIZE), TEXT_DARK, center_x, y + 200)
+
+    heading_font = get_font(700, HEADING_SIZE)
+    left_out = 0
+    for section in post.sections:
+        heading_height = 25 + _line_height(heading_font) + 15 if section.heading else 0
+        if left_out or y + heading_height + _line_height(heading_font) > CONTENT_BOTTOM:
+            left_out += len(section.rows)
+            continue
+        if section.heading:
+            y += 25
+            _draw_centered(draw, section.heading, heading_font, TEXT_DARK, center_x, y)
+            y += _line_height(heading_font) + 15
+        if section.kind == 'matches':
+            y, dropped = _draw_match_table(draw, section, y)
+        else:
+            y, dropped = _draw_table(draw, section, y, highlight_first_column=True)
+        left_out += dropped
+    if left_out:
+        print(f"Warning: {post.post_id} is taller than {INSTA_HEIGHT}px; {left_out} row(s) left out of {output_path}.")
+
+    logo = _load_logo(logo_path, _mtime(logo_path))
+    if logo is not None:
+        logo_x = (INSTA_WIDTH - logo.width) // 2
+        logo_y = INSTA_HEIGHT - LOGO_BOTTOM - LOGO_SIZE + (LOGO_SIZE - logo.height) // 2
+        image.paste(logo, (logo_x, logo_y), logo)
+
+    image.save(output_path, 'PNG')
+    return output_path
@@ -0,0 +1,483 @@
+import datetime
+import functools
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import build_metrics
+
+try:
+    import pyodbc
+except ImportError:
+    # Only the SQL Server backend needs pyodbc; the SQLite backend runs anywhere.
+    pyodbc = None
+
+# --- Configuration ---
+# Which database the scripts read: 'mssql' (the live SQL Server) or 'sqlite'
+# (a local file created from schema_sqlite.sql). Scripts switch with --sqlite.
+DB_BACKEND = 'mssql'
+
+# Update these with your SQL Server details
+DB_SERVER = 'tariqhassan2022\SQLEXPRESS'
+DB_NAME = 'DTC Box League'
+ODBC_DRIVER = 'ODBC Driver 17 for SQL Server'
+
+# Default local database file, and the schema used to create it.
+SQLITE_PATH = 'league.sqlite3'
+SQLITE_SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schema_sqlite.sql')
+
+# Columns added to existing tables after schema_sqlite.sql was first used, as
+# (table, column, definition). CREATE TABLE IF NOT EXISTS skips tables an
+# older file already has, so create_sqlite_database adds these to them.
+SQLITE_ADDED_COLUMNS = (
+    ('matches', 'scheduled_week', 'DATE NULL'),
+    ('rounds', 'finalized_at', 'DATETIME NULL'),
+    ('players_ranking', 'games_won', 'INT DEFAULT 0'),
+    ('players_ranking', 'sets_won', 'INT DEFAULT 0'),
+    ('players_ranking', 'weighted_points', 'DECIMAL(9, 2) DEFAULT 0'),
+)
+
+# Number of connections the pool keeps open. A full build only ever needs one
+# or two, so the pool stays small on purpose.
+POOL_SIZE = 2
+
+# Number of distinct SQL statements kept prepared per connection.
+STATEMENT_CACHE_SIZE = 32
+
+# Rows sent per executemany batch, so bulk inserts stay within the driver's
+# and SQL Server's limits and memory use stays flat.
+EXECUTEMANY_CHUNK_SIZE = 1000
+
+
+def get_connection_string():
+    """Builds the ODBC connection string from the configuration above."""
+    return (
+        f"DRIVER={{{ODBC_DRIVER}}};"
+        f"SERVER={DB_SERVER};"
+        f"DATABASE={DB_NAME};"
+        f"Trusted_Connection=yes;"
+    )
+
+
+# Errors raised by either backend. Catch this rather than pyodbc.Error.
+DatabaseError = (sqlite3.Error,) if pyodbc is None else (pyodbc.Error, sqlite3.Error)
+
+
+# --- Backends ---
+class SqlServerBackend:
+    """The production SQL Server database, reached through pyodbc."""
+
+    name = 'mssql'
+
+    def connect(self):
+        if pyodbc is None:
+            raise ImportError("pyodbc is required for the SQL Server backend (pip install pyodbc).")
+        return pyodbc.connect(get_connection_string())
+
+    def execute(self, cursor, sql, params):
+        cursor.execute(sql, *params)
+
+    def executemany(self, cursor, sql, rows):
+        # Sends the whole batch as one parameter array instead of a round trip per row.
+        cursor.fast_executemany = True
+        cursor.executemany(sql, rows)
+
+    def set_isolation_level(self, pooled, level):
+        pooled.execute(f"SET TRANSACTION ISOLATION LEVEL {level}")
+
+    def has_column(self, pooled, table, column):
+        return pooled.fetch_one("SELECT COL_LENGTH(?, ?)", (f"dbo.{table}", column))[0] is not None
+
+
+# T-SQL constructs used by this repo's queries and the SQLite equivalents.
+_TOP_RE = re.compile(r'\bSELECT\s+TOP\s+(\d+)\s+', re.IGNORECASE)
+_CONCAT_BEFORE_LITERAL_RE = re.compile(r"\+(\s*)'")
+_CONCAT_AFTER_LITERAL_RE = re.compile(r"'(\s*)\+")
+
+
+@functools.lru_cache(maxsize=256)
+def translate_tsql_for_sqlite(sql):
+    """
+    Rewrites the T-SQL used by the report queries into SQLite:
+    SELECT TOP n becomes a LIMIT n on the same (sub)query, and + next to a
+    string literal becomes ||. Everything else (dbo. names, GETDATE(),
+    BINARY_CHECKSUM/CHECKSUM_AGG, [bracketed] names) works as-is on a
+    SqliteBackend connection.
+    """
+    while True:
+        match = _TOP_RE.search(sql)
+        if not match:
+            break
+        # The (sub)query ends at the first unbalanced ')' or at the end of the text.
+        depth = 0
+        end = len(sql)
+        for index in range(match.end(), len(sql)):
+            if sql[index] == '(':
+                depth += 1
+            elif sql[index] == ')':
+                if depth == 0:
+                    end = index
+                    break
+                depth -= 1
+        body = sql[match.end():end].rstrip()
+        trailing = ';' if body.endswith(';') else ''
+        body = body.rstrip(';')
+        sql = f"{sql[:match.start()]}SELECT {body} LIMIT {match.group(1)}{trailing} {sql[end:]}"
+    sql = _CONCAT_BEFORE_LITERAL_RE.sub(r"||\1'", sql)
+    return _CONCAT_AFTER_LITERAL_RE.sub(r"'\1||", sql)
+
+
+def _sqlite_getdate():
+    return datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _sqlite_binary_checksum(*values):
+    """Stand-in for T-SQL BINARY_CHECKSUM: a signed 32-bit hash of the values."""
+    checksum = zlib.crc32(repr(values).encode('utf-8'))
+    return checksum - (1 << 32) if checksum >= (1 << 31) else checksum
+
+
+class _SqliteChecksumAgg:
+    """Stand-in for T-SQL CHECKSUM_AGG: XORs the checksums of a group."""
+
+    def __init__(self):
+        self.checksum = 0
+
+    def step(self, value):
+        if value is not None:
+            self.checksum ^= value
+
+    def finalize(self):
+        return self.checksum
+
+
+# Store dates as ISO text and read DATE/DATETIME columns back as Python objects,
+# as pyodbc returns them.
+sqlite3.register_adapter(datetime.date, lambda value: value.isoformat())
+sqlite3.register_adapter(datetime.datetime, lambda value: value.isoformat(' '))
+sqlite3.register_converter('DATE', lambda value: datetime.date.fromisoformat(value.decode()))
+sqlite3.register_converter('DATETIME', lambda value: datetime.datetime.fromisoformat(value.decode()))
+
+
+class SqliteBackend:
+    """
+    A local SQLite file with the same tables and views as the SQL Server
+    database (schema_sqlite.sql). The file is attached as schema "dbo" so the
+    dbo.table names in the queries resolve unchanged.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path=SQLITE_PATH):
+        self.path = path
+
+    def connect(self):
+        conn = sqlite3.connect(':memory:', detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        conn.create_function('GETDATE', 0, _sqlite_getdate)
+        conn.create_function('BINARY_CHECKSUM', -1, _sqlite_binary_checksum, deterministic=True)
+        conn.create_aggregate('CHECKSUM_AGG', 1, _SqliteChecksumAgg)
+        conn.execute("ATTACH DATABASE ? AS dbo", (self.path,))
+        return conn
+
+    def execute(self, cursor, sql, params):
+        cursor.execute(translate_tsql_for_sqlite(sql), tuple(params))
+
+    def executemany(self, cursor, sql, rows):
+        cursor.executemany(translate_tsql_for_sqlite(sql), rows)
+
+    def set_isolation_level(self, pooled, level):
+        # SQLite reads are already serializable; a deferred transaction keeps
+        # every read on the same snapshot until commit.
+        if level.upper() != 'READ COMMITTED' and not pooled.conn.in_transaction:
+            pooled.conn.execute("BEGIN")
+
+    def has_column(self, pooled, table, column):
+        return pooled.fetch_one("SELECT COUNT(*) FROM pragma_table_info(?, 'dbo') WHERE name = ?",
+                                (table, column))[0] > 0
+
+
+def _add_missing_columns(conn):
+    """Adds the SQLITE_ADDED_COLUMNS an older file's tables lack, before any view reads them."""
+    for table, column, definition in SQLITE_ADDED_COLUMNS:
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if columns and column not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    conn.commit()
+
+
+def create_sqlite_database(path=SQLITE_PATH, schema_path=SQLITE_SCHEMA_PATH):
+    """
+    Creates the league tables and views in a SQLite file, and brings a file
+    created from an older schema_sqlite.sql up to date (a no-op otherwise).
+    """
+    with open(schema_path, 'r', encoding='utf-8') as f:
+        schema_sql = f.read()
+    conn = sqlite3.connect(path)
+    try:
+        _add_missing_columns(conn)
+        conn.executescript(schema_sql)
+    finally:
+        conn.close()
+
+
+_backend = SqlServerBackend() if DB_BACKEND == 'mssql' else SqliteBackend()
+
+
+def get_backend():
+    return _backend
+
+
+def use_sqlite(path=SQLITE_PATH):
+    """
+    Points every later connection at a local SQLite file instead of SQL Server,
+    creating any missing tables and views first.
+    """
+    global _backend
+    is_new = not os.path.exists(path)
+    create_sqlite_database(path)
+    if is_new:
+        print(f"Created SQLite database {path} from {os.path.basename(SQLITE_SCHEMA_PATH)}")
+    close_pool()
+    _backend = SqliteBackend(path)
+
+
+# --- Timing statistics ---
+_stats_lock = threading.Lock()
+_stats = {
+    "connections": 0,
+    "connect_seconds": 0.0,
+    "queries": 0,
+    "query_seconds": 0.0,
+}
+
+
+def _record(kind, seconds, sql=None, rows=0):
+    with _stats_lock:
+        if kind == "connect":
+            _stats["connections"] += 1
+            _stats["connect_seconds"] += seconds
+        else:
+            _stats["queries"] += 1
+            _stats["query_seconds"] += seconds
+    # Also charge the time (and rows) to the report being built, per view.
+    if kind == "connect":
+        build_metrics.add_stage_time("db.connect", seconds)
+    else:
+        build_metrics.add_stage_time(build_metrics.query_stage_name(sql), seconds)
+        if rows:
+            build_metrics.add_rows(rows)
+
+
+def get_db_stats():
+    """Returns a copy of the connect/query counters gathered so far."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def print_db_stats():
+    """Prints how much of the build went to connecting and to querying."""
+    stats = get_db_stats()
+    print(
+        f"Database time: connecting {stats['connect_seconds']:.2f}s "
+        f"({stats['connections']} connection(s)), "
+        f"querying {stats['query_seconds']:.2f}s "
+        f"({stats['queries']} query(ies))"
+    )
+
+
+# --- Pooled connections ---
+class PooledConnection:
+    """
+    Wraps one open database connection together with a small cache of cursors,
+    one per SQL statement. pyodbc keeps a statement prepared on its cursor and
+    reuses the prepared plan when the same SQL text is executed on it again, so
+    handing out the same cursor for the same statement avoids re-preparing it.
+    """
+
+    def __init__(self, conn, backend):
+        self.conn = conn
+        self.backend = backend
+        self._cursors = OrderedDict()
+
+    def _cursor_for(self, sql):
+        cursor = self._cursors.pop(sql, None)
+        if cursor is None:
+            cursor = self.conn.cursor()
+            if len(self._cursors) >= STATEMENT_CACHE_SIZE:
+                _, oldest = self._cursors.popitem(last=False)
+                oldest.close()
+        self._cursors[sql] = cursor
+        return cursor
+
+    def execute(self, sql, params=()):
+        """Executes a statement and returns the (cached) cursor it ran on."""
+        start = time.perf_counter()
+        cursor = self._cursor_for(sql)
+        self.backend.execute(cursor, sql, params)
+        _record("query", time.perf_counter() - start, sql)
+        return cursor
+
+    def executemany(self, sql, rows):
+        """
+        Runs a statement once per parameter row, EXECUTEMANY_CHUNK_SIZE rows
+        per batch (fast_executemany on SQL Server).
+
+        Returns:
+            int: Number of rows sent.
+        """
+        rows = [tuple(row) for row in rows]
+        for start_index in range(0, len(rows), EXECUTEMANY_CHUNK_SIZE):
+            start = time.perf_counter()
+            cursor = self._cursor_for(sql)
+            self.backend.executemany(cursor, sql, rows[start_index:start_index + EXECUTEMANY_CHUNK_SIZE])
+            _record("query", time.perf_counter() - start, sql)
+        return len(rows)
+
+    def fetch_all(self, sql, params=()):
+        start = time.perf_counter()
+        cursor = self._cursor_for(sql)
+        self.backend.execute(cursor, sql, params)
+        rows = cursor.fetchall()
+        _record("query", time.perf_counter() - start, sql, len(rows))
+        return rows
+
+    def fetch_one(self, sql, params=()):
+        start = time.perf_counter()
+        cursor = self._cursor_for(sql)
+        self.backend.execute(cursor, sql, params)
+        row = cursor.fetchone()
+        _record("query", time.perf_counter() - start, sql, 1 if row is not None else 0)
+        return row
+
+    def set_isolation_level(self, level):
+        """Sets the isolation level for the next transaction, e.g. 'SNAPSHOT'."""
+        self.backend.set_isolation_level(self, level)
+
+    def has_column(self, table, column):
+        """Whether dbo.<table> has the column, for reads of columns schema_migrations.sql adds."""
+        return self.backend.has_column(self, table, column)
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
+
+    def close(self):
+        for cursor in self._cursors.values():
+            try:
+                cursor.close()
+            except DatabaseError:
+                pass
+        self._cursors.clear()
+        self.conn.close()
+
+
+class ConnectionPool:
+    """A small thread-safe pool that opens connections lazily, up to max_size."""
+
+    def __init__(self, max_size=POOL_SIZE):
+        self.max_size = max_size
+        self._idle = []
+        self._open_count = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self._open_count < self.max_size:
+                    self._open_count += 1
+                    break
+                self._condition.wait()
+
+        try:
+            backend = _backend
+            start = time.perf_counter()
+            conn = backend.connect()
+            _record("connect", time.perf_counter() - start)
+            return PooledConnection(conn, backend)
+        except Exception:
+            with self._condition:
+                self._open_count -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, pooled, discard=False):
+        """Returns a connection to the pool, or closes it if it may be broken."""
+        if discard:
+            try:
+                pooled.close()
+            except DatabaseError:
+                pass
+        with self._condition:
+            if discard:
+                self._open_count -= 1
+            else:
+                self._idle.append(pooled)
+            self._condition.notify()
+
+    def close_all(self):
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._open_count -= len(idle)
+        for pooled in idle:
+            try:
+                pooled.close()
+            except DatabaseError:
+                pass
+
+
+_pool = ConnectionPool()
+
+
+def set_pool_size(max_size):
+    """Resizes the shared pool. Only takes effect for connections not yet opened."""
+    with _pool._condition:
+        _pool.max_size = max(1, max_size)
+        _pool._condition.notify_all()
+
+
+@contextmanager
+def connection():
+    """
+    Borrows a pooled connection for a group of statements, e.g. a transaction.
+
+    The connection is handed back to the pool afterwards; if an error escapes
+    the block it is rolled back and discarded instead of being reused.
+    """
+    pooled = _pool.acquire()
+    try:
+        yield pooled
+    except Exception:
+        try:
+            pooled.rollback()
+        except DatabaseError:
+            pass
+        _pool.release(pooled, discard=True)
+        raise
+    else:
+        _pool.release(pooled)
+
+
+def fetch_all(sql, params=()):
+    """Runs a query on a pooled connection and returns all rows."""
+    with connection() as db:
+        return db.fetch_all(sql, params)
+
+
+def fetch_one(sql, params=()):
+    """Runs a query on a pooled connection and returns the first row (or None)."""
+    with connection() as db:
+        return db.fetch_one(sql, params)
+
+
+def close_pool():
+    """Closes every idle pooled connection. Call once at the end of a build."""
+    _pool.close_all()
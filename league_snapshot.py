@@ -0,0 +1,314 @@
+import datetime
+from collections import namedtuple
+
+import league_db
+import round_archive
+import standings_engine
+
+# Isolation level used for the extract. SNAPSHOT gives every view the same
+# point-in-time picture without blocking score entry, but it needs
+#     ALTER DATABASE [DTC Box League] SET ALLOW_SNAPSHOT_ISOLATION ON;
+# to have been run once. Use 'SERIALIZABLE' if that is not an option.
+SNAPSHOT_ISOLATION_LEVEL = 'SNAPSHOT'
+
+# Where current-round standings come from:
+#   'view'   - dbo.vw_CurrentStandings
+#   'engine'  - standings_engine.py, computed from one scan of dbo.matches
+#   'ranking' - dbo.players_ranking, kept current by ranking_updater.py
+#               --match. Scores entered any other way leave it behind until
+#               ranking_updater.py --rebuild ROUND_ID; a table whose totals
+#               no longer match the round's matches is not used (see
+#               _ranking_is_current) and the view is read instead.
+# Set with --standings-source on generate_html_reports.py and league_watcher.py.
+STANDINGS_SOURCES = ('view', 'engine', 'ranking')
+STANDINGS_SOURCE = 'view'
+
+# Where closed rounds' standings come from:
+#   'view'    - vw_PreviousRoundStandings, which aggregates every match of
+#               the closed rounds on each read
+#   'ranking' - players_ranking rows of rounds closed with
+#               ranking_updater.py --close, plus the view for rounds not closed
+# Set with --history-source on generate_html_reports.py and league_watcher.py.
+HISTORY_SOURCES = ('view', 'ranking')
+HISTORY_SOURCE = 'ranking'
+
+# Where the overall leaderboard comes from:
+#   'view'    - vw_OverallLeaderboard, which aggregates every match ever played
+#   'ranking' - vw_OverallLeaderboardFromRanking. Its TotalPoints formula is
+#               taken from the SQLite port of vw_OverallLeaderboard, since the
+#               SQL Server definition is not in schema.sql; switch only after
+#               ranking_updater.py --check-leaderboard reports no differences
+#               against the production database.
+LEADERBOARD_SOURCE = 'view'
+
+# Everything the HTML reports and Instagram posts render from, read once per run.
+#   current_round:      (name, start_date, end_date) or None
+#   current_standings:  vw_CurrentStandings rows
+#   current_matches:    vw_CurrentRoundMatches rows
+#   leaderboard:        vw_OverallLeaderboard rows
+#   previous_standings: vw_PreviousRoundStandings rows, for rounds not yet archived
+#   previous_matches:   vw_PreviousRoundMatches rows, for rounds not yet archived
+#   previous_rounds:    (id, name, start_date, end_date) of every closed round
+#   round_checksums:    closed round id -> [match_count, checksum] of its matches
+LeagueSnapshot = namedtuple('LeagueSnapshot', [
+    'extracted_at',
+    'current_round',
+    'current_standings',
+    'current_matches',
+    'leaderboard',
+    'previous_standings',
+    'previous_matches',
+    'previous_rounds',
+    'round_checksums',
+])
+
+CURRENT_ROUND_SQL = """
+    SELECT TOP 1 [name], [start_date], [end_date]
+    FROM dbo.rounds
+    WHERE GETDATE() BETWEEN start_date AND end_date
+    ORDER BY start_date DESC
+"""
+
+CURRENT_STANDINGS_SQL = """
+    SELECT
+        RoundName, BoxName, PlayerName, MatchesPlayed, Wins, Losses, Draws, Points, RankInBox
+    FROM dbo.vw_CurrentStandings
+    ORDER BY RoundName ASC, BoxName ASC, RankInBox ASC
+"""
+
+CURRENT_MATCHES_SQL = """
+    SELECT
+        RoundName, BoxName, Player1Name, Player2Name, Score, WinnerName, PlayedOn, Comments_Match_Summary
+    FROM dbo.vw_CurrentRoundMatches
+    ORDER BY BoxName ASC, CASE WHEN PlayedOn IS NULL THEN 1 ELSE 0 END ASC, PlayedOn ASC, Player1Name ASC
+"""
+
+# Same columns and round as vw_CurrentStandings, read from the pre-aggregated table.
+CURRENT_STANDINGS_FROM_RANKING_SQL = """
+    SELECT
+        R.name AS RoundName, B.box_name AS BoxName, P.FirstName + ' ' + P.LastName AS PlayerName,
+        PR.matches_played, PR.wins, PR.losses, PR.draws, PR.points, PR.final_rank
+    FROM dbo.players_ranking PR
+    JOIN dbo.rounds R ON R.id = PR.round_id
+    JOIN dbo.box_assignments BA ON BA.round_id = PR.round_id AND BA.player_id = PR.player_id
+    JOIN dbo.boxes B ON B.id = BA.box_id
+    JOIN dbo.Players P ON P.PlayerID = PR.player_id
+    WHERE PR.round_id = (
+        SELECT TOP 1 id FROM dbo.rounds WHERE start_date <= GETDATE() ORDER BY start_date DESC, id DESC
+    )
+    AND PR.matches_played > 0
+    ORDER BY RoundName ASC, BoxName ASC, PR.final_rank ASC
+"""
+
+# Played, won and drawn match sides of a round, against the sums players_ranking
+# holds for it: a result recorded without ranking_updater.py changes the first.
+RANKING_FRESHNESS_SQL = """
+    SELECT
+        2 * COUNT(*), COUNT(M.winner_id), 2 * COALESCE(SUM(CASE WHEN M.is_draw = 1 THEN 1 ELSE 0 END), 0),
+        (SELECT COALESCE(SUM(PR.matches_played), 0) FROM dbo.players_ranking PR WHERE PR.round_id = ?),
+        (SELECT COALESCE(SUM(PR.wins), 0) FROM dbo.players_ranking PR WHERE PR.round_id = ?),
+        (SELECT COALESCE(SUM(PR.draws), 0) FROM dbo.players_ranking PR WHERE PR.round_id = ?)
+    FROM dbo.matches M
+    WHERE M.round_id = ? AND M.played_on IS NOT NULL
+"""
+
+LEADERBOARD_SQL = """
+    SELECT
+        PlayerName, MatchesPlayed, MatchesWon, GamesWon, SetsWon, MatchesLost, MatchesDraw, TotalPoints, OverallRank
+    FROM dbo.vw_OverallLeaderboard
+    ORDER BY OverallRank ASC
+"""
+
+# Same columns as vw_OverallLeaderboard; finalized rounds come from players_ranking.
+LEADERBOARD_FROM_RANKING_SQL = """
+    SELECT
+        PlayerName, MatchesPlayed, MatchesWon, GamesWon, SetsWon, MatchesLost, MatchesDraw, TotalPoints, OverallRank
+    FROM dbo.vw_OverallLeaderboardFromRanking
+    ORDER BY OverallRank ASC
+"""
+
+# {round_filter} is replaced by _read_previous_rounds with the rounds to read.
+PREVIOUS_STANDINGS_SQL = """
+    SELECT
+        RoundID, RoundName, RoundStartDate, RoundEndDate, BoxName,
+        PlayerName, MatchesPlayed, Wins, Losses, Draws, Points, RankInBox
+    FROM dbo.vw_PreviousRoundStandings
+    {round_filter}
+    ORDER BY RoundEndDate DESC, RoundID DESC, BoxName ASC, RankInBox ASC
+"""
+
+# Finalized rounds from players_ranking, any other closed round from the view.
+PREVIOUS_STANDINGS_FROM_RANKING_SQL = """
+    SELECT
+        RoundID, RoundName, RoundStartDate, RoundEndDate, BoxName,
+        PlayerName, MatchesPlayed, Wins, Losses, Draws, Points, RankInBox
+    FROM (
+        SELECT
+            RoundID, RoundName, RoundStartDate, RoundEndDate, BoxName,
+            PlayerName, MatchesPlayed, Wins, Losses, Draws, Points, RankInBox
+        FROM dbo.vw_FinalizedRoundStandings
+        UNION ALL
+        SELECT
+            V.RoundID, V.RoundName, V.RoundStartDate, V.RoundEndDate, V.BoxName,
+            V.PlayerName, V.MatchesPlayed, V.Wins, V.Losses, V.Draws, V.Points, V.RankInBox
+        FROM dbo.vw_PreviousRoundStandings V
+        JOIN dbo.rounds R ON R.id = V.RoundID
+        WHERE R.finalized_at IS NULL
+    ) AS History
+    {round_filter}
+    ORDER BY RoundEndDate DESC, RoundID DESC, BoxName ASC, RankInBox ASC
+"""
+
+PREVIOUS_MATCHES_SQL = """
+    SELECT
+        RoundID, RoundName, RoundStartDate, RoundEndDate, BoxName,
+        Player1Name, Player2Name, Score, WinnerName, PlayedOn
+    FROM dbo.vw_PreviousRoundMatches
+    {round_filter}
+    ORDER BY RoundEndDate DESC, RoundID DESC, BoxName ASC, PlayedOn ASC, Player1Name ASC
+"""
+
+# Rounds the previous-rounds views cover, listed on the archive index page,
+# with a count and checksum of each round's matches. A closed round only
+# changes if someone edits its matches, which changes one of the two.
+PREVIOUS_ROUNDS_SQL = """
+    SELECT
+        r.id, r.name, r.start_date, r.end_date,
+        COUNT(m.id) AS MatchCount,
+        CHECKSUM_AGG(BINARY_CHECKSUM(
+            m.id, m.box_id, m.player1_id, m.player2_id, m.winner_id, m.is_draw,
+            m.player1_set1_games, m.player2_set1_games, m.player1_set2_games,
+            m.player2_set2_games, m.player1_set3_games, m.player2_set3_games, m.played_on
+        )) AS MatchChecksum
+    FROM dbo.rounds r
+    LEFT JOIN dbo.matches m ON m.round_id = r.id
+    WHERE r.end_date < GETDATE()
+    GROUP BY r.id, r.name, r.start_date, r.end_date
+    ORDER BY r.end_date DESC, r.id DESC
+"""
+
+# Rounds per "RoundID IN (...)" query; SQL Server allows at most 2100 parameters.
+ROUND_FILTER_CHUNK_SIZE = 1000
+
+
+def _fetch_rounds(db, sql, round_ids):
+    """Runs a previous-rounds view query for the given rounds only."""
+    rows = []
+    for start in range(0, len(round_ids), ROUND_FILTER_CHUNK_SIZE):
+        chunk = round_ids[start:start + ROUND_FILTER_CHUNK_SIZE]
+        placeholders = ', '.join('?' for _ in chunk)
+        rows.extend(db.fetch_all(sql.format(round_filter=f"WHERE RoundID IN ({placeholders})"), chunk))
+    return rows
+
+
+def _read_previous_rounds(db, round_checksums, archived_rounds):
+    """
+    Collects the history of closed rounds that have no up-to-date archive page.
+    Rounds frozen in round_archive with the same checksum are read from disk;
+    the rest are queried and then frozen for the next build.
+
+    Returns:
+        tuple: (standings_rows, matches_rows)
+    """
+    standings = []
+    matches = []
+    to_query = []
+    for round_id, checksum in round_checksums.items():
+        if archived_rounds.get(round_id) == checksum:
+            continue
+        frozen = round_archive.load_round(round_id, checksum)
+        if frozen is None:
+            to_query.append(round_id)
+        else:
+            standings.extend(frozen[0])
+            matches.extend(frozen[1])
+
+    if to_query:
+        standings_sql = PREVIOUS_STANDINGS_FROM_RANKING_SQL if HISTORY_SOURCE == 'ranking' else PREVIOUS_STANDINGS_SQL
+        queried_standings = _fetch_rounds(db, standings_sql, to_query)
+        queried_matches = _fetch_rounds(db, PREVIOUS_MATCHES_SQL, to_query)
+        standings_by_round = {round_id: [] for round_id in to_query}
+        matches_by_round = {round_id: [] for round_id in to_query}
+        for row in queried_standings:
+            standings_by_round.setdefault(row[0], []).append(row)
+        for row in queried_matches:
+            matches_by_round.setdefault(row[0], []).append(row)
+        for round_id in to_query:
+            round_archive.freeze_round(
+                round_id, round_checksums[round_id], standings_by_round[round_id], matches_by_round[round_id],
+            )
+        standings.extend(queried_standings)
+        matches.extend(queried_matches)
+    return standings, matches
+
+
+def _ranking_is_current(db, round_id):
+    """
+    Whether players_ranking still adds up to the round's played matches, wins
+    and draws. A score entered without ranking_updater.py changes at least
+    one of those totals; a corrected score that leaves them all unchanged is
+    only caught by ranking_updater.py --rebuild.
+    """
+    row = db.fetch_one(RANKING_FRESHNESS_SQL, (round_id, round_id, round_id, round_id))
+    return tuple(row[:3]) == tuple(row[3:])
+
+
+def _read_current_standings(db):
+    if STANDINGS_SOURCE == 'engine':
+        return standings_engine.compute_current_standings(db)
+    if STANDINGS_SOURCE == 'ranking':
+        round_row = db.fetch_one(standings_engine.VIEW_ROUND_SQL)
+        if round_row is None or _ranking_is_current(db, round_row[0]):
+            return db.fetch_all(CURRENT_STANDINGS_FROM_RANKING_SQL)
+        print(f"players_ranking is behind dbo.matches for round {round_row[0]}; reading vw_CurrentStandings "
+              f"instead. Run ranking_updater.py --rebuild {round_row[0]} to bring it up to date.")
+    return db.fetch_all(CURRENT_STANDINGS_SQL)
+
+
+def extract_league_snapshot(archived_rounds=None):
+    """
+    Reads every view the reports and posts need, each exactly once, inside a
+    single read transaction so all outputs describe the same moment in time.
+
+    Args:
+        archived_rounds (dict): Closed round id -> [match_count, checksum] of the
+            rounds whose archive pages are already built. Their standings and
+            matches are not read unless the checksum has changed since.
+
+    Returns:
+        LeagueSnapshot: The extracted rows, ready to be rendered.
+    """
+    with league_db.connection() as db:
+        # End any implicit transaction left open on this pooled connection so
+        # the isolation level applies to every read below.
+        db.commit()
+        db.set_isolation_level(SNAPSHOT_ISOLATION_LEVEL)
+        try:
+            extracted_at = datetime.datetime.now()
+            closed_rounds = db.fetch_all(PREVIOUS_ROUNDS_SQL)
+            round_checksums = {row[0]: [row[4], row[5]] for row in closed_rounds}
+            previous_standings, previous_matches = _read_previous_rounds(db, round_checksums, archived_rounds or {})
+            snapshot = LeagueSnapshot(
+                extracted_at=extracted_at,
+                current_round=db.fetch_one(CURRENT_ROUND_SQL),
+                current_standings=_read_current_standings(db),
+                current_matches=db.fetch_all(CURRENT_MATCHES_SQL),
+                leaderboard=db.fetch_all(
+                    LEADERBOARD_FROM_RANKING_SQL if LEADERBOARD_SOURCE == 'ranking' else LEADERBOARD_SQL
+                ),
+                previous_standings=previous_standings,
+                previous_matches=previous_matches,
+                previous_rounds=[tuple(row[:4]) for row in closed_rounds],
+                round_checksums=round_checksums,
+            )
+            db.commit()
+        finally:
+            db.set_isolation_level('READ COMMITTED')
+
+    print(
+        f"Extracted league snapshot: {len(snapshot.current_standings)} standings rows, "
+        f"{len(snapshot.current_matches)} current matches, "
+        f"{len(snapshot.leaderboard)} leaderboard rows, "
+        f"{len(snapshot.previous_standings) + len(snapshot.previous_matches)} history rows"
+    )
+    return snapshot
@@ -0,0 +1,282 @@
+import argparse
+import datetime
+import glob
+import os
+import time
+
+import asset_pipeline
+import build_manifest
+import build_runner
+import generate_html_reports
+import image_pipeline
+import league_db
+import league_snapshot
+import site_includes
+
+# --- Configuration ---
+# Seconds between polls. A poll is a handful of grouped aggregate queries,
+# so the site follows score entry within seconds at almost no idle cost.
+WATCH_INTERVAL_SECONDS = 10
+
+# High-water marks per round: row count, highest id and a checksum of the
+# columns the pages show, so inserts, edits and deletes all register.
+MATCH_MARKS_SQL = """
+    SELECT round_id, COUNT(*), MAX(id), CHECKSUM_AGG(BINARY_CHECKSUM(
+        id, box_id, player1_id, player2_id, winner_id, is_draw,
+        player1_set1_games, player2_set1_games, player1_set2_games,
+        player2_set2_games, player1_set3_games, player2_set3_games,
+        played_on, Comments_Match_Summary
+    ))
+    FROM dbo.matches
+    GROUP BY round_id
+"""
+
+ASSIGNMENT_MARKS_SQL = """
+    SELECT round_id, COUNT(*), MAX(box_assignment_id),
+           CHECKSUM_AGG(BINARY_CHECKSUM(box_assignment_id, box_id, player_id))
+    FROM dbo.box_assignments
+    GROUP BY round_id
+"""
+
+# {finalized_at} is ", finalized_at" once schema_migrations.sql has added the
+# column, so the watcher also runs against a database that has not been migrated.
+ROUND_MARKS_SQL = """
+    SELECT id, start_date, end_date, BINARY_CHECKSUM(id, name, start_date, end_date{finalized_at})
+    FROM dbo.rounds
+"""
+
+PLAYER_MARKS_SQL = """
+    SELECT COUNT(*), MAX(PlayerID), CHECKSUM_AGG(BINARY_CHECKSUM(PlayerID, FirstName, LastName))
+    FROM dbo.Players
+"""
+
+BOX_MARKS_SQL = """
+    SELECT COUNT(*), MAX(id), CHECKSUM_AGG(BINARY_CHECKSUM(id, box_name, points_weight))
+    FROM dbo.boxes
+"""
+
+# What each kind of change makes stale (task names of generate_html_reports.report_tasks
+# and site_tasks).
+# The current round is the latest one to have started, as in vw_CurrentStandings.
+CURRENT_ROUND_OUTPUTS = {'current_round_fixtures', 'current_round_standings', 'leaderboard', 'data_feeds',
+                         'player_profiles'}
+CLOSED_ROUND_OUTPUTS = {'previous_rounds', 'leaderboard', 'player_profiles'}
+# Round dates and names, player and box names show on every page; the date
+# matters because rounds open and close as days pass.
+GLOBAL_SOURCES = ('rounds', 'players', 'boxes', 'today')
+# Edits to the shared header, footer, roles, stylesheet, scripts or images
+# ('site_files') rebuild the assets, then every page, then the static pages.
+SITE_OUTPUTS = {'site_includes'}
+
+# Each Instagram post is redrawn with the page showing the same data.
+POST_TASKS = {
+    'insta_standings': 'current_round_standings',
+    'insta_matches_summary': 'current_round_fixtures',
+    'insta_leaderboard': 'leaderboard',
+}
+
+
+def read_site_marks(site_dir=site_includes.SITE_DIR):
+    """Size and modification time of every file in docs the build reads, which no table marker covers."""
+    sources = [*site_includes.PARTIALS.values(), site_includes.ROLES_FILE, *asset_pipeline.ASSETS]
+    paths = [os.path.join(site_dir, *source.split('/')) for source in sources]
+    for pattern in ('*.png', '*.jpg', '*.jpeg'):
+        paths += glob.glob(os.path.join(site_dir, image_pipeline.IMAGE_SOURCE_DIR, pattern))
+    marks = []
+    for path in sorted(paths):
+        try:
+            stat = os.stat(path)
+            marks.append((path, stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            marks.append((path, None, None))
+    return tuple(marks)
+
+
+def read_marks(db):
+    """
+    Reads the cheap change markers of every table the pages depend on, and
+    of the site files in docs.
+
+    Returns:
+        dict: (source, round_id or None) -> marker values.
+    """
+    marks = {('today', None): (datetime.date.today(),)}
+    for round_id, *values in db.fetch_all(MATCH_MARKS_SQL):
+        marks[('matches', round_id)] = tuple(values)
+    for round_id, *values in db.fetch_all(ASSIGNMENT_MARKS_SQL):
+        marks[('box_assignments', round_id)] = tuple(values)
+    finalized_at = ', finalized_at' if db.has_column('rounds', 'finalized_at') else ''
+    for round_id, *values in db.fetch_all(ROUND_MARKS_SQL.format(finalized_at=finalized_at)):
+        marks[('rounds', round_id)] = tuple(values)
+    marks[('players', None)] = tuple(db.fetch_one(PLAYER_MARKS_SQL))
+    marks[('boxes', None)] = tuple(db.fetch_one(BOX_MARKS_SQL))
+    marks[('site_files', None)] = read_site_marks()
+    return marks
+
+
+def changed_sources(old_marks, new_marks):
+    """The (source, round_id) keys that appeared, disappeared or changed between two polls."""
+    return {
+        key for key in set(old_marks) | set(new_marks)
+        if old_marks.get(key) != new_marks.get(key)
+    }
+
+
+def _as_date(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, str):
+        return datetime.date.fromisoformat(value[:10])
+    return value
+
+
+def affected_outputs(changed, marks):
+    """
+    Maps changed sources to the report tasks that show them.
+
+    Args:
+        changed (set): From changed_sources().
+        marks (dict): The latest marks, for the rounds' dates.
+
+    Returns:
+        set: Task names to re-run; every task for a change to rounds,
+            players, boxes, the date or the site files.
+    """
+    every_output = CURRENT_ROUND_OUTPUTS | CLOSED_ROUND_OUTPUTS
+    if any(source == 'site_files' for source, _ in changed):
+        return every_output | SITE_OUTPUTS
+    if any(source in GLOBAL_SOURCES for source, _ in changed):
+        return every_output
+
+    today = datetime.date.today()
+    rounds = {
+        round_id: (_as_date(values[0]), _as_date(values[1]))
+        for (source, round_id), values in marks.items() if source == 'rounds'
+    }
+    started = [(start_date, round_id) for round_id, (start_date, _) in rounds.items() if start_date <= today]
+    current_round_id = max(started)[1] if started else None
+
+    outputs = set()
+    for _, round_id in changed:
+        if round_id == current_round_id:
+            outputs |= CURRENT_ROUND_OUTPUTS
+        if round_id in rounds and rounds[round_id][1] <= today:
+            outputs |= CLOSED_ROUND_OUTPUTS
+        # Changes to future rounds only show up in the leaderboard's box weights.
+        outputs.add('leaderboard')
+    return outputs
+
+
+def _post_tasks(snapshot):
+    # Imported only when posts are wanted: the module sets up its output folders on import.
+    import generate_instagram_posts
+    return [
+        ('insta_standings', generate_instagram_posts.generate_current_standings_post, (snapshot, 'pillow')),
+        ('insta_matches_summary', generate_instagram_posts.generate_matches_summary_post, (snapshot, 'pillow', 'all')),
+        ('insta_leaderboard', generate_instagram_posts.generate_leaderboard_post, (snapshot, 'pillow')),
+    ]
+
+
+def rebuild(outputs=None, jobs=1, posts=False):
+    """
+    Re-extracts the league snapshot and runs the given report tasks (all of
+    them when outputs is None), plus the Instagram posts that depend on them.
+    The assets are rebuilt first and the site tasks run last, once the page
+    writers are done, when outputs include them.
+
+    Returns:
+        list: TaskResults, or None if the snapshot could not be read.
+    """
+    build_start = time.perf_counter()
+    if outputs is None or outputs & SITE_OUTPUTS:
+        generate_html_reports.build_assets()
+    snapshot = generate_html_reports.extract_snapshot()
+    if snapshot is None:
+        return None
+    tasks = [task for task in generate_html_reports.report_tasks(snapshot)
+             if outputs is None or task[0] in outputs]
+    if posts:
+        tasks += [task for task in _post_tasks(snapshot)
+                  if outputs is None or POST_TASKS[task[0]] in outputs]
+    results = build_runner.run_tasks(tasks, jobs=jobs)
+    results += build_runner.run_tasks([task for task in generate_html_reports.site_tasks()
+                                       if outputs is None or task[0] in outputs])
+    build_manifest.save_manifest()
+    build_runner.print_summary(results, time.perf_counter() - build_start)
+    return results
+
+
+def watch(interval=WATCH_INTERVAL_SECONDS, jobs=1, posts=False):
+    """
+    Builds everything once, then polls the change markers every interval
+    seconds and rebuilds only the outputs a change affects. Markers are read
+    before each build and kept only once it succeeds, so a change made
+    during a build, or a failed build (the first one included), is caught
+    next poll. Runs until interrupted.
+    """
+    marks = None
+    while True:
+        try:
+            with league_db.connection() as db:
+                new_marks = read_marks(db)
+        except league_db.DatabaseError as ex:
+            print(f"Database error while polling: {ex}")
+            new_marks = None
+
+        if new_marks is not None and marks is None:
+            if rebuild(jobs=jobs, posts=posts) is not None:
+                marks = new_marks
+                print(f"Watching the league database every {interval}s (Ctrl+C to stop)...")
+            else:
+                print(f"Initial build failed; retrying in {interval}s.")
+        elif new_marks is not None:
+            changed = changed_sources(marks, new_marks)
+            if changed:
+                outputs = affected_outputs(changed, new_marks)
+                sources = ', '.join(sorted(f"{source}" + (f" (round {round_id})" if round_id is not None else '')
+                                           for source, round_id in changed))
+                print(f"\n[{datetime.datetime.now():%H:%M:%S}] Changed: {sources}. Rebuilding: {', '.join(sorted(outputs))}")
+                if rebuild(outputs, jobs=jobs, posts=posts) is not None:
+                    marks = new_marks
+        time.sleep(interval)
+
+
+# --- Main execution block ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Keep the league site up to date: rebuild the pages a database change affects."
+    )
+    parser.add_argument('--interval', type=float, default=WATCH_INTERVAL_SECONDS,
+                        help=f"Seconds between polls (default {WATCH_INTERVAL_SECONDS}).")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="Number of reports to generate at the same time (default 1).")
+    parser.add_argument('--posts', action='store_true',
+                        help="Also redraw the affected Instagram posts (with the pillow renderer).")
+    parser.add_argument('--client-render', action='store_true',
+                        help="Write standings, fixtures and leaderboard as shells filled from the JSON feeds.")
+    parser.add_argument('--standings-source', choices=league_snapshot.STANDINGS_SOURCES,
+                        default=league_snapshot.STANDINGS_SOURCE,
+                        help="Where current-round standings are read from (default "
+                             f"{league_snapshot.STANDINGS_SOURCE}); 'ranking' needs players_ranking kept "
+                             "current by ranking_updater.py.")
+    parser.add_argument('--history-source', choices=league_snapshot.HISTORY_SOURCES,
+                        default=league_snapshot.HISTORY_SOURCE,
+                        help="Where closed rounds' standings are read from (default "
+                             f"{league_snapshot.HISTORY_SOURCE}); 'ranking' reads rounds closed with "
+                             "ranking_updater.py --close from players_ranking and the rest from the view.")
+    parser.add_argument('--sqlite', metavar='PATH',
+                        help="Read from a local SQLite database file instead of SQL Server.")
+    args = parser.parse_args()
+    if args.sqlite:
+        league_db.use_sqlite(args.sqlite)
+    league_snapshot.STANDINGS_SOURCE = args.standings_source
+    league_snapshot.HISTORY_SOURCE = args.history_source
+    generate_html_reports.CLIENT_RENDERED = args.client_render
+    league_db.set_pool_size(args.jobs)
+
+    try:
+        watch(args.interval, args.jobs, args.posts)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        league_db.close_pool()
@@ -0,0 +1,150 @@
+import datetime
+from collections import defaultdict, namedtuple
+
+import league_db
+import league_snapshot
+import standings_engine
+
+# --- Configuration ---
+# Everything the player profiles show, read in one bulk pull: five scans,
+# however many players there are, instead of a set of queries per player.
+HISTORY_PLAYERS_SQL = "SELECT PlayerID, FirstName, LastName FROM dbo.Players"
+
+HISTORY_ROUNDS_SQL = "SELECT id, name, start_date, end_date FROM dbo.rounds"
+
+HISTORY_BOXES_SQL = "SELECT id, box_name FROM dbo.boxes"
+
+HISTORY_ASSIGNMENTS_SQL = "SELECT round_id, box_id, player_id FROM dbo.box_assignments"
+
+HISTORY_MATCHES_SQL = """
+    SELECT
+        round_id, box_id, player1_id, player2_id, winner_id, is_draw,
+        player1_set1_games, player2_set1_games, player1_set2_games,
+        player2_set2_games, player1_set3_games, player2_set3_games, played_on
+    FROM dbo.matches
+"""
+
+# One player's profile, ready to render.
+#   rounds:  (round_id, round_name, start_date, end_date, box_name, rank, box_size,
+#             played, wins, losses, draws, points), newest round first
+#   matches: (round_name, box_name, opponent_id, opponent_name, score, result, played_on),
+#             newest round first, unplayed matches last within a round
+#   totals:  (rounds, played, wins, losses, draws, points) over every round
+PlayerProfile = namedtuple('PlayerProfile', ['player_id', 'name', 'rounds', 'matches', 'totals'])
+
+
+def _score_from(player_games, opponent_games):
+    """The score as vw_MatchResults writes it ('6-4 3-6 10-8'), from one player's side."""
+    sets = [f"{mine}-{theirs}" for mine, theirs in zip(player_games, opponent_games)
+            if mine is not None and theirs is not None]
+    return ' '.join(sets) if sets else None
+
+
+def _result_for(player_id, winner_id, is_draw, played_on):
+    if is_draw:
+        return 'Draw'
+    if winner_id is not None:
+        return 'Won' if winner_id == player_id else 'Lost'
+    return 'Played' if played_on is not None else 'Pending'
+
+
+def _date_key(value):
+    # Dates may come back as strings from SQLite; ISO strings sort like dates.
+    return value.isoformat() if isinstance(value, (datetime.date, datetime.datetime)) else (value or '')
+
+
+def extract_player_history():
+    """
+    Reads players, rounds, boxes, box assignments and matches in one read
+    transaction.
+
+    Returns:
+        tuple: (extracted_at, players, rounds, boxes, assignments, matches) row lists.
+    """
+    with league_db.connection() as db:
+        db.commit()
+        db.set_isolation_level(league_snapshot.SNAPSHOT_ISOLATION_LEVEL)
+        try:
+            extracted_at = datetime.datetime.now()
+            rows = (
+                db.fetch_all(HISTORY_PLAYERS_SQL),
+                db.fetch_all(HISTORY_ROUNDS_SQL),
+                db.fetch_all(HISTORY_BOXES_SQL),
+                db.fetch_all(HISTORY_ASSIGNMENTS_SQL),
+                db.fetch_all(HISTORY_MATCHES_SQL),
+            )
+            db.commit()
+        finally:
+            db.set_isolation_level('READ COMMITTED')
+    return (extracted_at,) + rows
+
+
+def build_player_profiles(players, rounds, boxes, assignments, matches):
+    """
+    Indexes the bulk pull by player id in one pass over the matches, ranking
+    every box of every round with the standings rules of vw_CurrentStandings
+    (points, then wins, then name). Assigned players without a played match
+    rank last in their box, by name; the sort key says so explicitly rather
+    than relying on them being the only players on 0 points.
+
+    Returns:
+        dict: player_id -> PlayerProfile, for every row of dbo.Players.
+    """
+    names = {row[0]: standings_engine.player_display_name(row[1], row[2]) for row in players}
+    round_info = {row[0]: tuple(row[1:4]) for row in rounds}
+    box_names = {row[0]: row[1] for row in boxes}
+
+    # (round_id, box_id) -> player_id -> [played, wins, losses, draws, points]
+    box_stats = defaultdict(dict)
+    for round_id, box_id, player_id in assignments:
+        box_stats[(round_id, box_id)].setdefault(player_id, [0, 0, 0, 0, 0])
+
+    matches_by_player = defaultdict(list)
+    for row in matches:
+        round_id, box_id, player1_id, player2_id, winner_id, is_draw = row[:6]
+        player1_games, player2_games, played_on = row[6:12:2], row[7:12:2], row[12]
+        for player_id, opponent_id, mine, theirs in (
+                (player1_id, player2_id, player1_games, player2_games),
+                (player2_id, player1_id, player2_games, player1_games)):
+            stats = box_stats[(round_id, box_id)].setdefault(player_id, [0, 0, 0, 0, 0])
+            for index, value in enumerate(standings_engine.player_match_stats(player_id, winner_id, is_draw, played_on)):
+                stats[index] += value
+            matches_by_player[player_id].append(
+                (round_id, box_id, opponent_id, _score_from(mine, theirs),
+                 _result_for(player_id, winner_id, is_draw, played_on), played_on)
+            )
+
+    rounds_by_player = defaultdict(list)
+    for (round_id, box_id), player_stats in box_stats.items():
+        ranked = sorted(
+            player_stats,
+            key=lambda player_id: (player_stats[player_id][0] == 0,) + standings_engine.standings_sort_key(
+                player_stats[player_id][4], player_stats[player_id][1], names.get(player_id)),
+        )
+        for rank, player_id in enumerate(ranked, start=1):
+            rounds_by_player[player_id].append((round_id, box_id, rank, len(ranked), player_stats[player_id]))
+
+    def round_order(round_id):
+        _, start_date, _ = round_info.get(round_id, (None, None, None))
+        return (_date_key(start_date), round_id)
+
+    profiles = {}
+    for player_id, name in names.items():
+        round_rows = []
+        for round_id, box_id, rank, box_size, stats in sorted(
+                rounds_by_player.get(player_id, ()), key=lambda item: round_order(item[0]), reverse=True):
+            round_name, start_date, end_date = round_info.get(round_id, (None, None, None))
+            round_rows.append((round_id, round_name, start_date, end_date, box_names.get(box_id),
+                               rank, box_size, *stats))
+        match_rows = [
+            (round_info.get(round_id, (None,))[0], box_names.get(box_id), opponent_id, names.get(opponent_id),
+             score, result, played_on)
+            for round_id, box_id, opponent_id, score, result, played_on in sorted(
+                matches_by_player.get(player_id, ()),
+                key=lambda item: (round_order(item[0]), item[5] is not None, _date_key(item[5])),
+                reverse=True,
+            )
+        ]
+        totals = (len(round_rows),) + tuple(sum(row[7 + index] for row in round_rows) for index in range(5))
+        profiles[player_id] = PlayerProfile(player_id, name, round_rows, match_rows, totals)
+    return profiles
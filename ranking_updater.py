@@ -0,0 +1,383 @@
+import argparse
+import datetime
+from collections import defaultdict
+
+import league_db
+import standings_engine
+
+# Columns of dbo.matches that record_match_result is allowed to set.
+RESULT_COLUMNS = (
+    'winner_id', 'is_draw',
+    'player1_set1_games', 'player2_set1_games',
+    'player1_set2_games', 'player2_set2_games',
+    'player1_set3_games', 'player2_set3_games',
+    'played_on', 'Comments_Match_Summary',
+)
+
+MATCH_SQL = """
+    SELECT round_id, box_id, player1_id, player2_id, winner_id, is_draw, played_on
+    FROM dbo.matches
+    WHERE id = ?
+"""
+
+APPLY_DELTA_SQL = """
+    UPDATE dbo.players_ranking
+    SET matches_played = matches_played + ?,
+        wins = wins + ?,
+        losses = losses + ?,
+        draws = draws + ?,
+        points = points + ?
+    WHERE round_id = ? AND player_id = ?
+"""
+
+INSERT_RANKING_SQL = """
+    INSERT INTO dbo.players_ranking (round_id, player_id, matches_played, wins, losses, draws, points)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Every ranking row in one box, read through box_assignments (UQ_Round_Player).
+BOX_RANKING_SQL = """
+    SELECT PR.player_id, PR.points, PR.wins, P.FirstName, P.LastName
+    FROM dbo.players_ranking PR
+    JOIN dbo.box_assignments BA ON BA.round_id = PR.round_id AND BA.player_id = PR.player_id
+    JOIN dbo.Players P ON P.PlayerID = PR.player_id
+    WHERE PR.round_id = ? AND BA.box_id = ?
+"""
+
+SET_RANK_SQL = """
+    UPDATE dbo.players_ranking
+    SET final_rank = ?
+    WHERE round_id = ? AND player_id = ?
+"""
+
+ROUND_SQL = "SELECT end_date, finalized_at FROM dbo.rounds WHERE id = ?"
+
+# Everything a round's final rows are computed from, in one scan of dbo.matches.
+ROUND_RESULTS_SQL = """
+    SELECT M.box_id, M.player1_id, M.player2_id, M.winner_id, M.is_draw,
+        M.player1_set1_games, M.player2_set1_games,
+        M.player1_set2_games, M.player2_set2_games,
+        M.player1_set3_games, M.player2_set3_games
+    FROM dbo.matches M
+    WHERE M.round_id = ? AND M.played_on IS NOT NULL
+"""
+
+BOX_WEIGHTS_SQL = "SELECT id, points_weight FROM dbo.boxes"
+
+INSERT_FINAL_RANKING_SQL = """
+    INSERT INTO dbo.players_ranking (
+        round_id, player_id, final_rank, matches_played, wins, losses, draws, points,
+        games_won, sets_won, weighted_points
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+FINALIZE_ROUND_SQL = "UPDATE dbo.rounds SET finalized_at = GETDATE() WHERE id = ?"
+
+# The two leaderboards compared by check_leaderboard_parity, keyed by player name.
+LEADERBOARD_PARITY_SQL = """
+    SELECT PlayerName, MatchesPlayed, MatchesWon, GamesWon, SetsWon, MatchesLost, MatchesDraw, TotalPoints
+    FROM dbo.{view}
+"""
+LEADERBOARD_PARITY_COLUMNS = (
+    'MatchesPlayed', 'MatchesWon', 'GamesWon', 'SetsWon', 'MatchesLost', 'MatchesDraw', 'TotalPoints',
+)
+
+
+def _apply_delta(db, round_id, player_id, delta):
+    """Adds a (matches_played, wins, losses, draws, points) delta to one player's row."""
+    if not any(delta):
+        return
+    cursor = db.execute(APPLY_DELTA_SQL, tuple(delta) + (round_id, player_id))
+    if cursor.rowcount == 0:
+        db.execute(INSERT_RANKING_SQL, (round_id, player_id) + tuple(delta))
+
+
+def rerank_box(db, round_id, box_id):
+    """Recomputes final_rank for one box only, using the standings tie-break."""
+    rows = db.fetch_all(BOX_RANKING_SQL, (round_id, box_id))
+    ranked = sorted(
+        rows,
+        key=lambda row: standings_engine.standings_sort_key(
+            row[1], row[2], standings_engine.player_display_name(row[3], row[4])
+        ),
+    )
+    for rank, row in enumerate(ranked, start=1):
+        db.execute(SET_RANK_SQL, (rank, round_id, row[0]))
+
+
+def _games_and_sets(result_rows):
+    """
+    Totals games and sets won per player, as vw_OverallLeaderboard counts
+    them: games from every set played, sets where a player won more games.
+    """
+    games = defaultdict(int)
+    sets = defaultdict(int)
+    for row in result_rows:
+        player1_id, player2_id = row[1], row[2]
+        for player1_games, player2_games in zip(row[5:11:2], row[6:11:2]):
+            if player1_games is None or player2_games is None:
+                continue
+            games[player1_id] += player1_games
+            games[player2_id] += player2_games
+            if player1_games > player2_games:
+                sets[player1_id] += 1
+            elif player2_games > player1_games:
+                sets[player2_id] += 1
+    return games, sets
+
+
+def write_final_rows(db, round_id):
+    """
+    Replaces a round's dbo.players_ranking rows with its final results,
+    computed in one pass over the round's matches: the standings columns and
+    final_rank per box, plus games, sets and box-weighted points for the
+    overall leaderboard. The rows go in with one batched executemany.
+
+    Returns:
+        int: Number of rows written.
+    """
+    result_rows = db.fetch_all(ROUND_RESULTS_SQL, (round_id,))
+    box_ids, player_ids, matches_played, wins, losses, draws, points = (
+        standings_engine.aggregate_player_stats([row[:5] for row in result_rows])
+    )
+    games, sets = _games_and_sets(result_rows)
+    weights = {row[0]: row[1] for row in db.fetch_all(BOX_WEIGHTS_SQL)}
+    names = {
+        row[0]: standings_engine.player_display_name(row[1], row[2])
+        for row in db.fetch_all(standings_engine.PLAYER_NAMES_SQL)
+    }
+
+    rows_by_box = defaultdict(list)
+    for box_id, player_id, played, won, lost, drawn, player_points in zip(
+            box_ids.tolist(), player_ids.tolist(), matches_played.tolist(), wins.tolist(),
+            losses.tolist(), draws.tolist(), points.tolist()):
+        weight = weights.get(box_id)
+        weighted_points = round(player_points * (1 if weight is None else weight), 2)
+        rows_by_box[box_id].append((player_id, played, won, lost, drawn, player_points,
+                                    games[player_id], sets[player_id], weighted_points))
+
+    final_rows = []
+    for box_rows in rows_by_box.values():
+        box_rows.sort(key=lambda row: standings_engine.standings_sort_key(row[5], row[2], names.get(row[0])))
+        for rank, row in enumerate(box_rows, start=1):
+            final_rows.append((round_id, row[0], rank) + row[1:])
+
+    db.execute("DELETE FROM dbo.players_ranking WHERE round_id = ?", (round_id,))
+    db.executemany(INSERT_FINAL_RANKING_SQL, final_rows)
+    return len(final_rows)
+
+
+def close_round(round_id, force=False):
+    """
+    Materializes a finished round's final results in dbo.players_ranking and
+    marks the round finalized, in one transaction. Reports that read
+    vw_FinalizedRoundStandings and vw_OverallLeaderboardFromRanking then use
+    these rows instead of re-aggregating the round's matches.
+
+    Args:
+        round_id (int): The round to close.
+        force (bool): Close the round even if its end_date has not passed.
+    """
+    with league_db.connection() as db:
+        round_row = db.fetch_one(ROUND_SQL, (round_id,))
+        if not round_row:
+            raise ValueError(f"Round {round_id} does not exist.")
+        end_date = round_row[0]
+        if isinstance(end_date, datetime.datetime):
+            end_date = end_date.date()
+        if end_date >= datetime.date.today() and not force:
+            raise ValueError(f"Round {round_id} ends on {end_date}; use --force to close it early.")
+
+        count = write_final_rows(db, round_id)
+        db.execute(FINALIZE_ROUND_SQL, (round_id,))
+        db.commit()
+
+    print(f"Closed round {round_id}: {count} final players_ranking row(s).")
+
+
+def record_match_result(match_id, **result):
+    """
+    Records (or corrects) a score on a dbo.matches row and keeps
+    dbo.players_ranking in step.
+
+    Only the difference between the match's old and new result is applied to
+    the two players' ranking rows, and only their box is re-ranked. In a
+    round that has been closed, the round's final rows are recomputed
+    instead, so games, sets and weighted points stay right. Everything
+    happens in one transaction.
+
+    Args:
+        match_id (int): The dbo.matches id to update.
+        **result: New values for any of RESULT_COLUMNS.
+    """
+    unknown = set(result) - set(RESULT_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown match columns: {', '.join(sorted(unknown))}")
+
+    with league_db.connection() as db:
+        old = db.fetch_one(MATCH_SQL, (match_id,))
+        if not old:
+            raise ValueError(f"Match {match_id} does not exist.")
+        round_id, box_id, player1_id, player2_id, old_winner, old_draw, old_played_on = old
+
+        if result:
+            assignments = ", ".join(f"{column} = ?" for column in result)
+            db.execute(
+                f"UPDATE dbo.matches SET {assignments} WHERE id = ?",
+                tuple(result.values()) + (match_id,),
+            )
+
+        new_winner = result.get('winner_id', old_winner)
+        new_draw = result.get('is_draw', old_draw)
+        new_played_on = result.get('played_on', old_played_on)
+
+        round_row = db.fetch_one(ROUND_SQL, (round_id,))
+        if round_row and round_row[1] is not None:
+            write_final_rows(db, round_id)
+        else:
+            for player_id in (player1_id, player2_id):
+                before = standings_engine.player_match_stats(player_id, old_winner, old_draw, old_played_on)
+                after = standings_engine.player_match_stats(player_id, new_winner, new_draw, new_played_on)
+                _apply_delta(db, round_id, player_id, [a - b for a, b in zip(after, before)])
+
+            rerank_box(db, round_id, box_id)
+        db.commit()
+
+    print(f"Recorded result for match {match_id} (round {round_id}, box {box_id}).")
+
+
+def rebuild_round_ranking(round_id):
+    """
+    Recomputes every dbo.players_ranking row for a round from dbo.matches.
+    Use it once to seed the table, after which record_match_result keeps it current.
+    A round that has been closed gets its full final rows again.
+    """
+    with league_db.connection() as db:
+        round_row = db.fetch_one(ROUND_SQL, (round_id,))
+        if round_row and round_row[1] is not None:
+            count = write_final_rows(db, round_id)
+            db.commit()
+            print(f"Rebuilt final players_ranking for closed round {round_id}: {count} player(s).")
+            return
+
+        match_rows = db.fetch_all(standings_engine.ROUND_MATCHES_SQL, (round_id,))
+        box_ids, player_ids, matches_played, wins, losses, draws, points = (
+            standings_engine.aggregate_player_stats(match_rows)
+        )
+
+        db.execute("DELETE FROM dbo.players_ranking WHERE round_id = ?", (round_id,))
+        totals = {}
+        for row in zip(player_ids.tolist(), matches_played.tolist(), wins.tolist(),
+                       losses.tolist(), draws.tolist(), points.tolist()):
+            # A player should only appear in one box per round, but sum defensively.
+            previous = totals.get(row[0], (0, 0, 0, 0, 0))
+            totals[row[0]] = tuple(a + b for a, b in zip(previous, row[1:]))
+        for player_id, stats in totals.items():
+            db.execute(INSERT_RANKING_SQL, (round_id, player_id) + stats)
+
+        for box_id in sorted(set(box_ids.tolist())):
+            rerank_box(db, round_id, box_id)
+        db.commit()
+
+    print(f"Rebuilt players_ranking for round {round_id}: {len(totals)} player(s).")
+
+
+def check_leaderboard_parity():
+    """
+    Compares vw_OverallLeaderboardFromRanking with vw_OverallLeaderboard,
+    player by player, and prints every difference. Run it against the
+    production database before reading the leaderboard from players_ranking
+    (league_snapshot.LEADERBOARD_SOURCE = 'ranking').
+
+    Returns:
+        int: Number of players whose rows differ (0 means the views agree).
+    """
+    with league_db.connection() as db:
+        leaderboards = [
+            {row[0]: tuple(row[1:]) for row in db.fetch_all(LEADERBOARD_PARITY_SQL.format(view=view))}
+            for view in ('vw_OverallLeaderboard', 'vw_OverallLeaderboardFromRanking')
+        ]
+        db.commit()
+
+    view_rows, ranking_rows = leaderboards
+    differences = 0
+    for player_name in sorted(set(view_rows) | set(ranking_rows), key=lambda name: (name or '').casefold()):
+        expected, actual = view_rows.get(player_name), ranking_rows.get(player_name)
+        if expected is None or actual is None:
+            missing_from = 'vw_OverallLeaderboardFromRanking' if actual is None else 'vw_OverallLeaderboard'
+            print(f"{player_name}: missing from {missing_from}")
+            differences += 1
+            continue
+        # TotalPoints is DECIMAL in one view and may be a float in the other.
+        changed = [
+            f"{column} {old} != {new}"
+            for column, old, new in zip(LEADERBOARD_PARITY_COLUMNS, expected, actual)
+            if round(float(old or 0), 2) != round(float(new or 0), 2)
+        ]
+        if changed:
+            print(f"{player_name}: {', '.join(changed)}")
+            differences += 1
+
+    print(f"Compared {len(view_rows)} leaderboard row(s): {differences} player(s) differ.")
+    return differences
+
+
+def _parse_sets(set_scores):
+    """Turns ['6-4', '3-6', '10-8'] into player1/player2 set game columns."""
+    columns = {}
+    for number, score in enumerate(set_scores, start=1):
+        player1_games, player2_games = (int(games) for games in score.split('-'))
+        columns[f'player1_set{number}_games'] = player1_games
+        columns[f'player2_set{number}_games'] = player2_games
+    return columns
+
+
+# --- Main execution block ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keep dbo.players_ranking up to date.")
+    parser.add_argument('--rebuild', type=int, metavar='ROUND_ID',
+                        help="Recompute players_ranking for a whole round.")
+    parser.add_argument('--close', type=int, metavar='ROUND_ID',
+                        help="Write a finished round's final players_ranking rows and mark it finalized.")
+    parser.add_argument('--force', action='store_true', help="With --close, close a round before its end_date.")
+    parser.add_argument('--match', type=int, metavar='MATCH_ID', help="Match to record a result for.")
+    parser.add_argument('--winner', type=int, metavar='PLAYER_ID', help="Winning player id.")
+    parser.add_argument('--draw', action='store_true', help="Record the match as a draw.")
+    parser.add_argument('--sets', nargs='+', default=[], metavar='P1-P2',
+                        help="Set scores from player 1's point of view, e.g. 6-4 3-6 10-8.")
+    parser.add_argument('--played-on', type=datetime.date.fromisoformat, default=datetime.date.today(),
+                        help="Date the match was played (YYYY-MM-DD, default today).")
+    parser.add_argument('--comments', help="Comments/match summary.")
+    parser.add_argument('--check-leaderboard', action='store_true',
+                        help="Compare vw_OverallLeaderboardFromRanking with vw_OverallLeaderboard and list differences.")
+    parser.add_argument('--sqlite', metavar='PATH',
+                        help="Use a local SQLite database file instead of SQL Server.")
+    args = parser.parse_args()
+    if args.sqlite:
+        league_db.use_sqlite(args.sqlite)
+
+    try:
+        if args.rebuild is not None:
+            rebuild_round_ranking(args.rebuild)
+        if args.close is not None:
+            close_round(args.close, force=args.force)
+        if args.match is not None:
+            if not args.draw and args.winner is None:
+                parser.error("--match needs either --winner or --draw")
+            result = _parse_sets(args.sets)
+            result.update(winner_id=None if args.draw else args.winner,
+                          is_draw=1 if args.draw else 0,
+                          played_on=args.played_on)
+            if args.comments is not None:
+                result['Comments_Match_Summary'] = args.comments
+            record_match_result(args.match, **result)
+        if args.check_leaderboard:
+            check_leaderboard_parity()
+        if args.rebuild is None and args.close is None and args.match is None and not args.check_leaderboard:
+            parser.print_help()
+    except ValueError as e:
+        print(f"Error: {e}")
+    except league_db.DatabaseError as ex:
+        print(f"Database error: {ex}")
+    finally:
+        league_db.close_pool()
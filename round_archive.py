@@ -0,0 +1,118 @@
+import datetime
+import decimal
+import gzip
+import json
+import os
+
+# --- Configuration ---
+# Frozen standings and matches of closed rounds, one gzip file per round.
+# Kept next to the scripts (not in docs/) like build_manifest.json.
+ROUND_ARCHIVE_DIR = 'round_archive'
+
+# Bump when the stored layout changes; files in an older format are ignored.
+ARCHIVE_FORMAT = 1
+
+# Set to False to always read history from the database.
+USE_ROUND_ARCHIVE = True
+
+_DECODERS = {
+    'date': datetime.date.fromisoformat,
+    'datetime': datetime.datetime.fromisoformat,
+    'decimal': decimal.Decimal,
+}
+
+
+def _column_type(values):
+    for value in values:
+        if isinstance(value, datetime.datetime):
+            return 'datetime'
+        if isinstance(value, datetime.date):
+            return 'date'
+        if isinstance(value, decimal.Decimal):
+            return 'decimal'
+        if value is not None:
+            return None
+    return None
+
+
+def _encode_rows(rows):
+    """Stores rows column by column; dates and decimals become strings tagged with their type."""
+    columns = [list(column) for column in zip(*rows)]
+    types = [_column_type(column) for column in columns]
+    for column, column_type in zip(columns, types):
+        if column_type is not None:
+            column[:] = [None if value is None else str(value) for value in column]
+    return {'row_count': len(rows), 'types': types, 'columns': columns}
+
+
+def _decode_rows(table):
+    columns = []
+    for column, column_type in zip(table['columns'], table['types']):
+        decode = _DECODERS.get(column_type)
+        if decode is not None:
+            column = [None if value is None else decode(value) for value in column]
+        columns.append(column)
+    if not columns:
+        return []
+    return list(zip(*columns))
+
+
+def _archive_path(round_id):
+    return os.path.join(ROUND_ARCHIVE_DIR, f"round_{round_id}.json.gz")
+
+
+def load_round(round_id, checksum):
+    """
+    Reads a closed round's frozen rows if they still match the database.
+
+    Args:
+        round_id (int): The round.
+        checksum (list): [match_count, checksum] of the round's matches now.
+
+    Returns:
+        tuple: (standings_rows, matches_rows), or None if the round is not
+            archived, was archived by another format, or its matches changed.
+    """
+    if not USE_ROUND_ARCHIVE:
+        return None
+    path = _archive_path(round_id)
+    if not os.path.exists(path):
+        return None
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable round archive {path}: {e}")
+        return None
+    if data.get('format') != ARCHIVE_FORMAT or data.get('checksum') != list(checksum):
+        return None
+    return _decode_rows(data['standings']), _decode_rows(data['matches'])
+
+
+def freeze_round(round_id, checksum, standings_rows, matches_rows):
+    """
+    Writes a closed round's standings and matches to the archive.
+
+    Args:
+        round_id (int): The round.
+        checksum (list): [match_count, checksum] the rows were read at; the
+            file is used until the round's matches no longer match it.
+        standings_rows (list): vw_PreviousRoundStandings rows of the round.
+        matches_rows (list): vw_PreviousRoundMatches rows of the round.
+    """
+    if not USE_ROUND_ARCHIVE:
+        return
+    os.makedirs(ROUND_ARCHIVE_DIR, exist_ok=True)
+    data = {
+        'format': ARCHIVE_FORMAT,
+        'round_id': round_id,
+        'checksum': list(checksum),
+        'frozen_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'standings': _encode_rows(standings_rows),
+        'matches': _encode_rows(matches_rows),
+    }
+    path = _archive_path(round_id)
+    temp_path = path + '.tmp'
+    with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(temp_path, path)
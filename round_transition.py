@@ -0,0 +1,188 @@
+import argparse
+from collections import defaultdict
+
+import league_db
+import standings_engine
+
+# --- Configuration ---
+# Players moved up from each box (except the top box) and down from each box
+# (except the bottom box) at the end of a round. Equal counts keep box sizes.
+PROMOTE_COUNT = 2
+RELEGATE_COUNT = 2
+
+# Boxes from strongest to weakest: the leaderboard weights stronger boxes higher.
+BOX_LEVELS_SQL = """
+    SELECT id
+    FROM dbo.boxes
+    ORDER BY COALESCE(points_weight, 0) DESC, id ASC
+"""
+
+ROUND_EXISTS_SQL = "SELECT id FROM dbo.rounds WHERE id = ?"
+
+ROUND_ASSIGNMENTS_SQL = """
+    SELECT box_id, player_id
+    FROM dbo.box_assignments
+    WHERE round_id = ?
+"""
+
+ROUND_PLAYERS_SQL = """
+    SELECT player_id
+    FROM dbo.box_assignments
+    WHERE round_id = ?
+"""
+
+INSERT_ASSIGNMENT_SQL = """
+    INSERT INTO dbo.box_assignments (round_id, box_id, player_id)
+    VALUES (?, ?, ?)
+"""
+
+
+def final_box_rankings(db, round_id):
+    """
+    Ranks every player of a round within their box in one pass over the
+    round's matches, with the standings tie-break (points, wins, name).
+    Assigned players without a played match rank last in their box.
+
+    Returns:
+        dict: box_id -> player ids, best first.
+    """
+    box_ids, player_ids, _, wins, _, _, points = standings_engine.aggregate_player_stats(
+        db.fetch_all(standings_engine.ROUND_MATCHES_SQL, (round_id,))
+    )
+    totals = {
+        (box_id, player_id): (player_points, player_wins)
+        for box_id, player_id, player_points, player_wins
+        in zip(box_ids.tolist(), player_ids.tolist(), points.tolist(), wins.tolist())
+    }
+    names = {
+        row[0]: standings_engine.player_display_name(row[1], row[2])
+        for row in db.fetch_all(standings_engine.PLAYER_NAMES_SQL)
+    }
+
+    players_by_box = defaultdict(list)
+    for box_id, player_id in db.fetch_all(ROUND_ASSIGNMENTS_SQL, (round_id,)):
+        players_by_box[box_id].append(player_id)
+
+    rankings = {}
+    for box_id, box_players in players_by_box.items():
+        rankings[box_id] = sorted(
+            box_players,
+            key=lambda player_id: standings_engine.standings_sort_key(
+                *totals.get((box_id, player_id), (0, 0)), names.get(player_id)
+            ),
+        )
+    return rankings
+
+
+def plan_transition(rankings, box_levels, promote=PROMOTE_COUNT, relegate=RELEGATE_COUNT):
+    """
+    Applies promotion and relegation to a round's final box rankings.
+
+    Args:
+        rankings (dict): box_id -> player ids, best first (final_box_rankings).
+        box_levels (list): Box ids from strongest to weakest.
+        promote (int): Players moving up from each box but the top one.
+        relegate (int): Players moving down from each box but the bottom one.
+
+    Returns:
+        list: (box_id, player_id, movement) for every player, where movement
+            is 'up', 'down' or 'stay'.
+    """
+    # Only boxes used in the round take part, so an unused box is never a destination.
+    levels = [box_id for box_id in box_levels if box_id in rankings]
+    levels += sorted(box_id for box_id in rankings if box_id not in levels)
+
+    moves = []
+    for level, box_id in enumerate(levels):
+        players = rankings[box_id]
+        up = promote if level > 0 else 0
+        down = relegate if level < len(levels) - 1 else 0
+        # A small box cannot send more players away than it has.
+        up = min(up, len(players))
+        down = min(down, len(players) - up)
+        for index, player_id in enumerate(players):
+            if index < up:
+                moves.append((levels[level - 1], player_id, 'up'))
+            elif index >= len(players) - down:
+                moves.append((levels[level + 1], player_id, 'down'))
+            else:
+                moves.append((box_id, player_id, 'stay'))
+    return moves
+
+
+def roll_over_round(from_round_id, to_round_id, promote=PROMOTE_COUNT, relegate=RELEGATE_COUNT, execute=False):
+    """
+    Builds the next round's dbo.box_assignments from the closing round's final
+    standings, in one transaction. Players already assigned to the next round
+    keep their assignment (UQ_Round_Player), so the job can be re-run.
+
+    Args:
+        from_round_id (int): The round that has finished.
+        to_round_id (int): The round to fill.
+        promote (int): Players promoted from each box.
+        relegate (int): Players relegated from each box.
+        execute (bool): Insert the assignments instead of only printing the plan.
+
+    Returns:
+        list: The (box_id, player_id, movement) assignments that were new.
+    """
+    with league_db.connection() as db:
+        if db.fetch_one(ROUND_EXISTS_SQL, (to_round_id,)) is None:
+            raise ValueError(f"Round {to_round_id} does not exist; create it in dbo.rounds first.")
+        rankings = final_box_rankings(db, from_round_id)
+        if not rankings:
+            print(f"Warning: No box assignments found for round {from_round_id}.")
+            return []
+        box_levels = [row[0] for row in db.fetch_all(BOX_LEVELS_SQL)]
+        already_assigned = {row[0] for row in db.fetch_all(ROUND_PLAYERS_SQL, (to_round_id,))}
+        moves = [move for move in plan_transition(rankings, box_levels, promote, relegate)
+                 if move[1] not in already_assigned]
+        if execute and moves:
+            db.executemany(
+                INSERT_ASSIGNMENT_SQL,
+                [(to_round_id, box_id, player_id) for box_id, player_id, _ in moves],
+            )
+            db.commit()
+
+    counts = defaultdict(int)
+    for _, _, movement in moves:
+        counts[movement] += 1
+    summary = (f"{counts['up']} promoted, {counts['down']} relegated, {counts['stay']} staying; "
+               f"{len(already_assigned)} already assigned")
+    if execute:
+        print(f"Assigned {len(moves)} player(s) to round {to_round_id}: {summary}.")
+    else:
+        for box_id, player_id, movement in moves:
+            print(f"  player {player_id:>6} -> box {box_id:>4} ({movement})")
+        print(f"Would assign {len(moves)} player(s) to round {to_round_id}: {summary}. "
+              f"Run with --execute to insert them.")
+    return moves
+
+
+# --- Main execution block ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Promote and relegate players at the end of a round and fill the next round's boxes."
+    )
+    parser.add_argument('from_round', type=int, metavar='FROM_ROUND_ID', help="The round that has finished.")
+    parser.add_argument('to_round', type=int, metavar='TO_ROUND_ID', help="The round to assign players to.")
+    parser.add_argument('--promote', type=int, default=PROMOTE_COUNT,
+                        help=f"Players promoted from each box (default {PROMOTE_COUNT}).")
+    parser.add_argument('--relegate', type=int, default=RELEGATE_COUNT,
+                        help=f"Players relegated from each box (default {RELEGATE_COUNT}).")
+    parser.add_argument('--execute', action='store_true',
+                        help="Insert into dbo.box_assignments instead of printing the plan.")
+    parser.add_argument('--sqlite', metavar='PATH',
+                        help="Use a local SQLite database file instead of SQL Server.")
+    args = parser.parse_args()
+    if args.sqlite:
+        league_db.use_sqlite(args.sqlite)
+
+    try:
+        roll_over_round(args.from_round, args.to_round, args.promote, args.relegate, args.execute)
+    except ValueError as e:
+        print(f"Error: {e}")
+    except league_db.DatabaseError as ex:
+        print(f"Database error: {ex}")
+    finally:
+        league_db.close_pool()
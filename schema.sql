@@ -22,6 +22,8 @@ CREATE TABLE dbo.rounds (
   signup_close_date DATE NULL,
   PrizeDescription NVARCHAR(500) NULL,
   SponsorID INT NULL,
+  -- Set by ranking_updater.py --close once players_ranking holds the round's final rows.
+  finalized_at DATETIME NULL,
   CONSTRAINT FK_Rounds_Sponsor FOREIGN KEY (SponsorID) REFERENCES dbo.Sponsors(SponsorID)
 );
 CREATE TABLE dbo.box_assignments (
@@ -49,6 +51,8 @@ CREATE TABLE dbo.matches (
   player1_set3_games INT NULL,
   player2_set3_games INT NULL,
   played_on DATE NULL,
+  -- First day of the week fixture_scheduler.py planned the match for (weeks run from the round's start_date).
+  scheduled_week DATE NULL,
   Comments_Match_Summary NVARCHAR(MAX) NULL,
   -- Logic Constraints
   CHECK (player1_id <> player2_id),
@@ -63,6 +67,16 @@ CREATE TABLE dbo.matches (
   FOREIGN KEY (player2_id) REFERENCES dbo.Players(PlayerID),
   FOREIGN KEY (winner_id) REFERENCES dbo.Players(PlayerID)
 );
+-- Periods a player cannot play, avoided when fixtures are scheduled.
+CREATE TABLE dbo.player_blackouts (
+  blackout_id INT IDENTITY(1, 1) PRIMARY KEY,
+  player_id INT NOT NULL,
+  start_date DATE NOT NULL,
+  end_date DATE NOT NULL,
+  reason NVARCHAR(255) NULL,
+  CHECK (end_date >= start_date),
+  FOREIGN KEY (player_id) REFERENCES dbo.Players(PlayerID)
+);
 CREATE TABLE dbo.players_ranking (
   ranking_id INT IDENTITY(1, 1) PRIMARY KEY,
   round_id INT NOT NULL,
@@ -73,10 +87,16 @@ CREATE TABLE dbo.players_ranking (
   losses INT DEFAULT 0,
   draws INT DEFAULT 0,
   points INT DEFAULT 0,
+  -- Filled in when the round is closed, for the overall leaderboard.
+  games_won INT DEFAULT 0,
+  sets_won INT DEFAULT 0,
+  weighted_points DECIMAL(9, 2) DEFAULT 0,
   CONSTRAINT UQ_Round_Player_Ranking UNIQUE (round_id, player_id),
   FOREIGN KEY (round_id) REFERENCES dbo.rounds(id),
   FOREIGN KEY (player_id) REFERENCES dbo.Players(PlayerID)
 );
+-- Lets a single result re-rank just its box in players_ranking.
+CREATE INDEX IX_BoxAssignments_Round_Box ON dbo.box_assignments (round_id, box_id) INCLUDE (player_id);
 GO CREATE VIEW dbo.vw_CurrentStandings AS WITH CurrentRound AS (
     SELECT TOP 1 id AS RoundID,
       name AS RoundName,
@@ -152,6 +172,118 @@ SELECT RoundName,
       PlayerName ASC
   ) AS RankInBox
 FROM PlayerMatchResults;
+-- Final standings of closed rounds, read from players_ranking instead of
+-- re-aggregating dbo.matches. Same columns as vw_PreviousRoundStandings.
+GO CREATE VIEW dbo.vw_FinalizedRoundStandings AS
+SELECT R.id AS RoundID,
+  R.name AS RoundName,
+  R.start_date AS RoundStartDate,
+  R.end_date AS RoundEndDate,
+  B.box_name AS BoxName,
+  P.FirstName + ' ' + P.LastName AS PlayerName,
+  PR.matches_played AS MatchesPlayed,
+  PR.wins AS Wins,
+  PR.losses AS Losses,
+  PR.draws AS Draws,
+  PR.points AS Points,
+  PR.final_rank AS RankInBox
+FROM dbo.players_ranking PR
+  JOIN dbo.rounds R ON R.id = PR.round_id
+  JOIN dbo.box_assignments BA ON BA.round_id = PR.round_id
+  AND BA.player_id = PR.player_id
+  JOIN dbo.boxes B ON B.id = BA.box_id
+  JOIN dbo.Players P ON P.PlayerID = PR.player_id
+WHERE R.finalized_at IS NOT NULL
+  AND PR.matches_played > 0;
+-- vw_OverallLeaderboard built from players_ranking for finalized rounds and
+-- from dbo.matches only for rounds that are still open. dbo.vw_OverallLeaderboard
+-- itself is not defined in this file: the TotalPoints formula below (3 for a
+-- win, 1 otherwise, times the box's points_weight) is the one of its SQLite
+-- port in schema_sqlite.sql. The reports keep reading vw_OverallLeaderboard
+-- (league_snapshot.LEADERBOARD_SOURCE) until `ranking_updater.py
+-- --check-leaderboard` shows both views agree on the production database.
+GO CREATE VIEW dbo.vw_OverallLeaderboardFromRanking AS WITH OpenRoundSides AS (
+    SELECT M.player1_id AS PlayerID,
+      M.box_id AS BoxID,
+      M.winner_id,
+      M.is_draw,
+      COALESCE(M.player1_set1_games, 0) + COALESCE(M.player1_set2_games, 0) + COALESCE(M.player1_set3_games, 0) AS GamesWon,
+      CASE WHEN M.player1_set1_games > M.player2_set1_games THEN 1 ELSE 0 END
+        + CASE WHEN M.player1_set2_games > M.player2_set2_games THEN 1 ELSE 0 END
+        + CASE WHEN M.player1_set3_games > M.player2_set3_games THEN 1 ELSE 0 END AS SetsWon
+    FROM dbo.matches M
+      JOIN dbo.rounds R ON R.id = M.round_id
+    WHERE M.played_on IS NOT NULL
+      AND R.finalized_at IS NULL
+    UNION ALL
+    SELECT M.player2_id,
+      M.box_id,
+      M.winner_id,
+      M.is_draw,
+      COALESCE(M.player2_set1_games, 0) + COALESCE(M.player2_set2_games, 0) + COALESCE(M.player2_set3_games, 0),
+      CASE WHEN M.player2_set1_games > M.player1_set1_games THEN 1 ELSE 0 END
+        + CASE WHEN M.player2_set2_games > M.player1_set2_games THEN 1 ELSE 0 END
+        + CASE WHEN M.player2_set3_games > M.player1_set3_games THEN 1 ELSE 0 END
+    FROM dbo.matches M
+      JOIN dbo.rounds R ON R.id = M.round_id
+    WHERE M.played_on IS NOT NULL
+      AND R.finalized_at IS NULL
+  ),
+  RoundTotals AS (
+    SELECT PR.player_id AS PlayerID,
+      PR.matches_played AS MatchesPlayed,
+      PR.wins AS MatchesWon,
+      PR.games_won AS GamesWon,
+      PR.sets_won AS SetsWon,
+      PR.losses AS MatchesLost,
+      PR.draws AS MatchesDraw,
+      PR.weighted_points AS TotalPoints
+    FROM dbo.players_ranking PR
+      JOIN dbo.rounds R ON R.id = PR.round_id
+    WHERE R.finalized_at IS NOT NULL
+    UNION ALL
+    SELECT S.PlayerID,
+      1,
+      CASE WHEN S.winner_id = S.PlayerID THEN 1 ELSE 0 END,
+      S.GamesWon,
+      S.SetsWon,
+      CASE WHEN S.winner_id <> S.PlayerID AND S.is_draw = 0 THEN 1 ELSE 0 END,
+      CASE WHEN S.is_draw = 1 THEN 1 ELSE 0 END,
+      (CASE WHEN S.winner_id = S.PlayerID THEN 3 ELSE 1 END) * COALESCE(B.points_weight, 1)
+    FROM OpenRoundSides S
+      JOIN dbo.boxes B ON B.id = S.BoxID
+  ),
+  PlayerTotals AS (
+    SELECT P.PlayerID,
+      P.FirstName + ' ' + P.LastName AS PlayerName,
+      SUM(T.MatchesPlayed) AS MatchesPlayed,
+      SUM(T.MatchesWon) AS MatchesWon,
+      SUM(T.GamesWon) AS GamesWon,
+      SUM(T.SetsWon) AS SetsWon,
+      SUM(T.MatchesLost) AS MatchesLost,
+      SUM(T.MatchesDraw) AS MatchesDraw,
+      SUM(T.TotalPoints) AS TotalPoints
+    FROM RoundTotals T
+      JOIN dbo.Players P ON P.PlayerID = T.PlayerID
+    GROUP BY P.PlayerID,
+      P.FirstName,
+      P.LastName
+    HAVING SUM(T.MatchesPlayed) > 0
+  )
+SELECT PlayerName,
+  MatchesPlayed,
+  MatchesWon,
+  GamesWon,
+  SetsWon,
+  MatchesLost,
+  MatchesDraw,
+  TotalPoints,
+  ROW_NUMBER() OVER (
+    ORDER BY TotalPoints DESC,
+      MatchesWon DESC,
+      PlayerName ASC
+  ) AS OverallRank
+FROM PlayerTotals;
 GO CREATE VIEW dbo.active_hours_summary AS
 SELECT 'Social Sessions' AS activity_type,
   SUM(player_count * 150) AS total_minutes,
@@ -0,0 +1,149 @@
+-- Brings a database created from an earlier schema.sql up to date with the
+-- current one. Every step checks before it changes anything, so the script
+-- can be run again safely, e.g.
+--     sqlcmd -S "tariqhassan2022\SQLEXPRESS" -d "DTC Box League" -E -i schema_migrations.sql
+-- A database created from the current schema.sql needs none of it. Local
+-- SQLite files are brought up to date by league_db.create_sqlite_database.
+
+-- Fixture scheduling (fixture_scheduler.py, generate_fixture_sql.py).
+IF COL_LENGTH('dbo.matches', 'scheduled_week') IS NULL
+  ALTER TABLE dbo.matches ADD scheduled_week DATE NULL;
+GO
+IF OBJECT_ID('dbo.player_blackouts', 'U') IS NULL
+  CREATE TABLE dbo.player_blackouts (
+    blackout_id INT IDENTITY(1, 1) PRIMARY KEY,
+    player_id INT NOT NULL,
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    reason NVARCHAR(255) NULL,
+    CHECK (end_date >= start_date),
+    FOREIGN KEY (player_id) REFERENCES dbo.Players(PlayerID)
+  );
+GO
+
+-- Re-ranking one box per recorded result (ranking_updater.py --match).
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'IX_BoxAssignments_Round_Box' AND object_id = OBJECT_ID('dbo.box_assignments'))
+  CREATE INDEX IX_BoxAssignments_Round_Box ON dbo.box_assignments (round_id, box_id) INCLUDE (player_id);
+GO
+
+-- Round close (ranking_updater.py --close) and the history read from players_ranking.
+IF COL_LENGTH('dbo.rounds', 'finalized_at') IS NULL
+  ALTER TABLE dbo.rounds ADD finalized_at DATETIME NULL;
+GO
+IF COL_LENGTH('dbo.players_ranking', 'games_won') IS NULL
+  ALTER TABLE dbo.players_ranking ADD games_won INT DEFAULT 0 WITH VALUES;
+GO
+IF COL_LENGTH('dbo.players_ranking', 'sets_won') IS NULL
+  ALTER TABLE dbo.players_ranking ADD sets_won INT DEFAULT 0 WITH VALUES;
+GO
+IF COL_LENGTH('dbo.players_ranking', 'weighted_points') IS NULL
+  ALTER TABLE dbo.players_ranking ADD weighted_points DECIMAL(9, 2) DEFAULT 0 WITH VALUES;
+GO
+-- The two views below are the ones in schema.sql (CREATE OR ALTER needs SQL
+-- Server 2016 SP1 or later); keep them in step when either changes.
+CREATE OR ALTER VIEW dbo.vw_FinalizedRoundStandings AS
+SELECT R.id AS RoundID,
+  R.name AS RoundName,
+  R.start_date AS RoundStartDate,
+  R.end_date AS RoundEndDate,
+  B.box_name AS BoxName,
+  P.FirstName + ' ' + P.LastName AS PlayerName,
+  PR.matches_played AS MatchesPlayed,
+  PR.wins AS Wins,
+  PR.losses AS Losses,
+  PR.draws AS Draws,
+  PR.points AS Points,
+  PR.final_rank AS RankInBox
+FROM dbo.players_ranking PR
+  JOIN dbo.rounds R ON R.id = PR.round_id
+  JOIN dbo.box_assignments BA ON BA.round_id = PR.round_id
+  AND BA.player_id = PR.player_id
+  JOIN dbo.boxes B ON B.id = BA.box_id
+  JOIN dbo.Players P ON P.PlayerID = PR.player_id
+WHERE R.finalized_at IS NOT NULL
+  AND PR.matches_played > 0;
+GO
+CREATE OR ALTER VIEW dbo.vw_OverallLeaderboardFromRanking AS WITH OpenRoundSides AS (
+    SELECT M.player1_id AS PlayerID,
+      M.box_id AS BoxID,
+      M.winner_id,
+      M.is_draw,
+      COALESCE(M.player1_set1_games, 0) + COALESCE(M.player1_set2_games, 0) + COALESCE(M.player1_set3_games, 0) AS GamesWon,
+      CASE WHEN M.player1_set1_games > M.player2_set1_games THEN 1 ELSE 0 END
+        + CASE WHEN M.player1_set2_games > M.player2_set2_games THEN 1 ELSE 0 END
+        + CASE WHEN M.player1_set3_games > M.player2_set3_games THEN 1 ELSE 0 END AS SetsWon
+    FROM dbo.matches M
+      JOIN dbo.rounds R ON R.id = M.round_id
+    WHERE M.played_on IS NOT NULL
+      AND R.finalized_at IS NULL
+    UNION ALL
+    SELECT M.player2_id,
+      M.box_id,
+      M.winner_id,
+      M.is_draw,
+      COALESCE(M.player2_set1_games, 0) + COALESCE(M.player2_set2_games, 0) + COALESCE(M.player2_set3_games, 0),
+      CASE WHEN M.player2_set1_games > M.player1_set1_games THEN 1 ELSE 0 END
+        + CASE WHEN M.player2_set2_games > M.player1_set2_games THEN 1 ELSE 0 END
+        + CASE WHEN M.player2_set3_games > M.player1_set3_games THEN 1 ELSE 0 END
+    FROM dbo.matches M
+      JOIN dbo.rounds R ON R.id = M.round_id
+    WHERE M.played_on IS NOT NULL
+      AND R.finalized_at IS NULL
+  ),
+  RoundTotals AS (
+    SELECT PR.player_id AS PlayerID,
+      PR.matches_played AS MatchesPlayed,
+      PR.wins AS MatchesWon,
+      PR.games_won AS GamesWon,
+      PR.sets_won AS SetsWon,
+      PR.losses AS MatchesLost,
+      PR.draws AS MatchesDraw,
+      PR.weighted_points AS TotalPoints
+    FROM dbo.players_ranking PR
+      JOIN dbo.rounds R ON R.id = PR.round_id
+    WHERE R.finalized_at IS NOT NULL
+    UNION ALL
+    SELECT S.PlayerID,
+      1,
+      CASE WHEN S.winner_id = S.PlayerID THEN 1 ELSE 0 END,
+      S.GamesWon,
+      S.SetsWon,
+      CASE WHEN S.winner_id <> S.PlayerID AND S.is_draw = 0 THEN 1 ELSE 0 END,
+      CASE WHEN S.is_draw = 1 THEN 1 ELSE 0 END,
+      (CASE WHEN S.winner_id = S.PlayerID THEN 3 ELSE 1 END) * COALESCE(B.points_weight, 1)
+    FROM OpenRoundSides S
+      JOIN dbo.boxes B ON B.id = S.BoxID
+  ),
+  PlayerTotals AS (
+    SELECT P.PlayerID,
+      P.FirstName + ' ' + P.LastName AS PlayerName,
+      SUM(T.MatchesPlayed) AS MatchesPlayed,
+      SUM(T.MatchesWon) AS MatchesWon,
+      SUM(T.GamesWon) AS GamesWon,
+      SUM(T.SetsWon) AS SetsWon,
+      SUM(T.MatchesLost) AS MatchesLost,
+      SUM(T.MatchesDraw) AS MatchesDraw,
+      SUM(T.TotalPoints) AS TotalPoints
+    FROM RoundTotals T
+      JOIN dbo.Players P ON P.PlayerID = T.PlayerID
+    GROUP BY P.PlayerID,
+      P.FirstName,
+      P.LastName
+    HAVING SUM(T.MatchesPlayed) > 0
+  )
+SELECT PlayerName,
+  MatchesPlayed,
+  MatchesWon,
+  GamesWon,
+  SetsWon,
+  MatchesLost,
+  MatchesDraw,
+  TotalPoints,
+  ROW_NUMBER() OVER (
+    ORDER BY TotalPoints DESC,
+      MatchesWon DESC,
+      PlayerName ASC
+  ) AS OverallRank
+FROM PlayerTotals;
+GO
@@ -0,0 +1,447 @@
+-- SQLite port of schema.sql, used by league_db.py's SQLite backend for local
+-- builds, tests and benchmarks. The file is attached as schema "dbo", so
+-- objects are created unqualified here and read as dbo.<name> by the scripts.
+--
+-- Differences from SQL Server:
+--   IDENTITY columns are INTEGER PRIMARY KEY, BIT is INTEGER 0/1,
+--   INCLUDE columns become trailing index keys, string concatenation is ||,
+--   TOP 1 is LIMIT 1, and GETDATE() is a function registered per connection.
+--   dbo.Sponsors and dbo.social_sessions are not part of schema.sql, so the
+--   rounds.SponsorID foreign key and active_hours_summary are left out.
+CREATE TABLE IF NOT EXISTS boxes (
+  id INTEGER PRIMARY KEY,
+  box_name VARCHAR(50) NOT NULL UNIQUE,
+  points_weight DECIMAL(5, 2) NULL
+);
+CREATE TABLE IF NOT EXISTS Players (
+  PlayerID INTEGER PRIMARY KEY,
+  FirstName VARCHAR(50) NULL,
+  LastName VARCHAR(50) NULL,
+  SkillLevel INT NULL,
+  Email VARCHAR(255) NULL,
+  Phone_number VARCHAR(255) NULL,
+  PasswordHash NVARCHAR(255) NULL,
+  ResetToken NVARCHAR(255) NULL,
+  ResetTokenExpiry DATETIME NULL
+);
+CREATE TABLE IF NOT EXISTS rounds (
+  id INTEGER PRIMARY KEY,
+  name VARCHAR(255) NOT NULL,
+  start_date DATE NOT NULL,
+  end_date DATE NOT NULL,
+  signup_close_date DATE NULL,
+  PrizeDescription NVARCHAR(500) NULL,
+  SponsorID INT NULL,
+  -- Set by ranking_updater.py --close once players_ranking holds the round's final rows.
+  finalized_at DATETIME NULL
+);
+CREATE TABLE IF NOT EXISTS box_assignments (
+  box_assignment_id INTEGER PRIMARY KEY,
+  round_id INT NOT NULL,
+  box_id INT NOT NULL,
+  player_id INT NOT NULL,
+  CONSTRAINT UQ_Round_Player UNIQUE (round_id, player_id),
+  FOREIGN KEY (round_id) REFERENCES rounds(id),
+  FOREIGN KEY (box_id) REFERENCES boxes(id),
+  FOREIGN KEY (player_id) REFERENCES Players(PlayerID)
+);
+CREATE TABLE IF NOT EXISTS matches (
+  id INTEGER PRIMARY KEY,
+  round_id INT NOT NULL,
+  box_id INT NOT NULL,
+  player1_id INT NOT NULL,
+  player2_id INT NOT NULL,
+  winner_id INT NULL,
+  is_draw INTEGER DEFAULT 0,
+  player1_set1_games INT NULL,
+  player2_set1_games INT NULL,
+  player1_set2_games INT NULL,
+  player2_set2_games INT NULL,
+  player1_set3_games INT NULL,
+  player2_set3_games INT NULL,
+  played_on DATE NULL,
+  -- First day of the week fixture_scheduler.py planned the match for (weeks run from the round's start_date).
+  scheduled_week DATE NULL,
+  Comments_Match_Summary NVARCHAR NULL,
+  -- Logic Constraints
+  CHECK (player1_id <> player2_id),
+  CHECK (
+    winner_id IS NULL
+    OR winner_id = player1_id
+    OR winner_id = player2_id
+  ),
+  FOREIGN KEY (round_id) REFERENCES rounds(id),
+  FOREIGN KEY (box_id) REFERENCES boxes(id),
+  FOREIGN KEY (player1_id) REFERENCES Players(PlayerID),
+  FOREIGN KEY (player2_id) REFERENCES Players(PlayerID),
+  FOREIGN KEY (winner_id) REFERENCES Players(PlayerID)
+);
+-- Periods a player cannot play, avoided when fixtures are scheduled.
+CREATE TABLE IF NOT EXISTS player_blackouts (
+  blackout_id INTEGER PRIMARY KEY,
+  player_id INT NOT NULL,
+  start_date DATE NOT NULL,
+  end_date DATE NOT NULL,
+  reason NVARCHAR(255) NULL,
+  CHECK (end_date >= start_date),
+  FOREIGN KEY (player_id) REFERENCES Players(PlayerID)
+);
+CREATE TABLE IF NOT EXISTS players_ranking (
+  ranking_id INTEGER PRIMARY KEY,
+  round_id INT NOT NULL,
+  player_id INT NOT NULL,
+  final_rank INT NULL,
+  matches_played INT DEFAULT 0,
+  wins INT DEFAULT 0,
+  losses INT DEFAULT 0,
+  draws INT DEFAULT 0,
+  points INT DEFAULT 0,
+  -- Filled in when the round is closed, for the overall leaderboard.
+  games_won INT DEFAULT 0,
+  sets_won INT DEFAULT 0,
+  weighted_points DECIMAL(9, 2) DEFAULT 0,
+  CONSTRAINT UQ_Round_Player_Ranking UNIQUE (round_id, player_id),
+  FOREIGN KEY (round_id) REFERENCES rounds(id),
+  FOREIGN KEY (player_id) REFERENCES Players(PlayerID)
+);
+CREATE INDEX IF NOT EXISTS IX_BoxAssignments_Round_Box ON box_assignments (round_id, box_id, player_id);
+CREATE INDEX IF NOT EXISTS IX_Matches_Round ON matches (round_id, box_id);
+
+-- Same logic as dbo.vw_CurrentStandings in schema.sql.
+CREATE VIEW IF NOT EXISTS vw_CurrentStandings AS WITH CurrentRound AS (
+    SELECT id AS RoundID,
+      name AS RoundName,
+      start_date,
+      end_date
+    FROM rounds
+    WHERE start_date <= GETDATE()
+    ORDER BY start_date DESC,
+      id DESC
+    LIMIT 1
+  ),
+  PlayerMatchResults AS (
+    SELECT CR.RoundID,
+      CR.RoundName,
+      B.id AS BoxID,
+      B.box_name AS BoxName,
+      P.PlayerID,
+      P.FirstName || ' ' || P.LastName AS PlayerName,
+      SUM(
+        CASE
+          WHEN M.winner_id = P.PlayerID THEN 1
+          ELSE 0
+        END
+      ) AS Wins,
+      SUM(
+        CASE
+          WHEN M.played_on IS NOT NULL
+          AND M.winner_id <> P.PlayerID
+          AND M.is_draw = 0 THEN 1
+          ELSE 0
+        END
+      ) AS Losses,
+      SUM(
+        CASE
+          WHEN M.is_draw = 1 THEN 1
+          ELSE 0
+        END
+      ) AS Draws,
+      COUNT(M.id) AS MatchesPlayed,
+      SUM(
+        CASE
+          WHEN M.winner_id = P.PlayerID THEN 3
+          WHEN M.is_draw = 1 THEN 1
+          WHEN M.played_on IS NOT NULL THEN 1
+          ELSE 0
+        END
+      ) AS Points
+    FROM CurrentRound CR
+      JOIN matches M ON CR.RoundID = M.round_id
+      JOIN Players P ON M.player1_id = P.PlayerID
+      OR M.player2_id = P.PlayerID
+      JOIN boxes B ON M.box_id = B.id
+    WHERE M.played_on IS NOT NULL
+    GROUP BY CR.RoundID,
+      CR.RoundName,
+      B.id,
+      B.box_name,
+      P.PlayerID,
+      P.FirstName,
+      P.LastName
+  )
+SELECT RoundName,
+  BoxName,
+  PlayerName,
+  MatchesPlayed,
+  Wins,
+  Losses,
+  Draws,
+  Points,
+  ROW_NUMBER() OVER (
+    PARTITION BY BoxID
+    ORDER BY Points DESC,
+      Wins DESC,
+      PlayerName COLLATE NOCASE ASC
+  ) AS RankInBox
+FROM PlayerMatchResults;
+
+-- The views below are not in schema.sql; they return the columns the
+-- report and post generators read from their SQL Server counterparts.
+
+-- One row per player per played match, with the games from that player's side.
+CREATE VIEW IF NOT EXISTS vw_PlayerMatchSides AS
+SELECT M.id AS MatchID,
+  M.round_id AS RoundID,
+  M.box_id AS BoxID,
+  M.player1_id AS PlayerID,
+  M.winner_id,
+  M.is_draw,
+  M.played_on,
+  COALESCE(M.player1_set1_games, 0) + COALESCE(M.player1_set2_games, 0) + COALESCE(M.player1_set3_games, 0) AS GamesWon,
+  (M.player1_set1_games > M.player2_set1_games)
+    + (M.player1_set2_games > M.player2_set2_games)
+    + COALESCE(M.player1_set3_games > M.player2_set3_games, 0) AS SetsWon
+FROM matches M
+WHERE M.played_on IS NOT NULL
+UNION ALL
+SELECT M.id,
+  M.round_id,
+  M.box_id,
+  M.player2_id,
+  M.winner_id,
+  M.is_draw,
+  M.played_on,
+  COALESCE(M.player2_set1_games, 0) + COALESCE(M.player2_set2_games, 0) + COALESCE(M.player2_set3_games, 0),
+  (M.player2_set1_games > M.player1_set1_games)
+    + (M.player2_set2_games > M.player1_set2_games)
+    + COALESCE(M.player2_set3_games > M.player1_set3_games, 0)
+FROM matches M
+WHERE M.played_on IS NOT NULL;
+
+-- Score from player 1's side, e.g. '6-4 3-6 10-8', and the result label.
+CREATE VIEW IF NOT EXISTS vw_MatchResults AS
+SELECT M.id AS MatchID,
+  M.round_id AS RoundID,
+  R.name AS RoundName,
+  R.start_date AS RoundStartDate,
+  R.end_date AS RoundEndDate,
+  B.box_name AS BoxName,
+  P1.FirstName || ' ' || P1.LastName AS Player1Name,
+  P2.FirstName || ' ' || P2.LastName AS Player2Name,
+  CASE
+    WHEN M.player1_set1_games IS NULL THEN NULL
+    ELSE M.player1_set1_games || '-' || M.player2_set1_games
+      || COALESCE(' ' || M.player1_set2_games || '-' || M.player2_set2_games, '')
+      || COALESCE(' ' || M.player1_set3_games || '-' || M.player2_set3_games, '')
+  END AS Score,
+  CASE
+    WHEN M.is_draw = 1 THEN 'Draw'
+    WHEN M.winner_id IS NOT NULL THEN W.FirstName || ' ' || W.LastName
+    WHEN M.played_on IS NULL THEN 'Pending'
+  END AS WinnerName,
+  M.played_on AS PlayedOn,
+  M.Comments_Match_Summary
+FROM matches M
+  JOIN rounds R ON R.id = M.round_id
+  JOIN boxes B ON B.id = M.box_id
+  JOIN Players P1 ON P1.PlayerID = M.player1_id
+  JOIN Players P2 ON P2.PlayerID = M.player2_id
+  LEFT JOIN Players W ON W.PlayerID = M.winner_id;
+
+CREATE VIEW IF NOT EXISTS vw_CurrentRoundMatches AS
+SELECT RoundName,
+  BoxName,
+  Player1Name,
+  Player2Name,
+  Score,
+  WinnerName,
+  PlayedOn,
+  Comments_Match_Summary
+FROM vw_MatchResults
+WHERE RoundID = (
+    SELECT id
+    FROM rounds
+    WHERE start_date <= GETDATE()
+    ORDER BY start_date DESC,
+      id DESC
+    LIMIT 1
+  );
+
+-- Standings of every round that has ended, ranked as in vw_CurrentStandings.
+CREATE VIEW IF NOT EXISTS vw_PreviousRoundStandings AS WITH PlayerMatchResults AS (
+    SELECT R.id AS RoundID,
+      R.name AS RoundName,
+      R.start_date AS RoundStartDate,
+      R.end_date AS RoundEndDate,
+      B.id AS BoxID,
+      B.box_name AS BoxName,
+      P.FirstName || ' ' || P.LastName AS PlayerName,
+      COUNT(S.MatchID) AS MatchesPlayed,
+      SUM(CASE WHEN S.winner_id = S.PlayerID THEN 1 ELSE 0 END) AS Wins,
+      SUM(CASE WHEN S.winner_id <> S.PlayerID AND S.is_draw = 0 THEN 1 ELSE 0 END) AS Losses,
+      SUM(CASE WHEN S.is_draw = 1 THEN 1 ELSE 0 END) AS Draws,
+      SUM(CASE WHEN S.winner_id = S.PlayerID THEN 3 ELSE 1 END) AS Points
+    FROM vw_PlayerMatchSides S
+      JOIN rounds R ON R.id = S.RoundID
+      JOIN boxes B ON B.id = S.BoxID
+      JOIN Players P ON P.PlayerID = S.PlayerID
+    WHERE R.end_date < GETDATE()
+    GROUP BY R.id,
+      R.name,
+      R.start_date,
+      R.end_date,
+      B.id,
+      B.box_name,
+      P.PlayerID,
+      P.FirstName,
+      P.LastName
+  )
+SELECT RoundID,
+  RoundName,
+  RoundStartDate,
+  RoundEndDate,
+  BoxName,
+  PlayerName,
+  MatchesPlayed,
+  Wins,
+  Losses,
+  Draws,
+  Points,
+  ROW_NUMBER() OVER (
+    PARTITION BY RoundID,
+    BoxID
+    ORDER BY Points DESC,
+      Wins DESC,
+      PlayerName COLLATE NOCASE ASC
+  ) AS RankInBox
+FROM PlayerMatchResults;
+
+CREATE VIEW IF NOT EXISTS vw_PreviousRoundMatches AS
+SELECT RoundID,
+  RoundName,
+  RoundStartDate,
+  RoundEndDate,
+  BoxName,
+  Player1Name,
+  Player2Name,
+  Score,
+  WinnerName,
+  PlayedOn
+FROM vw_MatchResults
+WHERE RoundEndDate < GETDATE();
+
+-- Totals across every round; round points are weighted by the box's points_weight.
+CREATE VIEW IF NOT EXISTS vw_OverallLeaderboard AS WITH PlayerTotals AS (
+    SELECT P.PlayerID,
+      P.FirstName || ' ' || P.LastName AS PlayerName,
+      COUNT(S.MatchID) AS MatchesPlayed,
+      SUM(CASE WHEN S.winner_id = S.PlayerID THEN 1 ELSE 0 END) AS MatchesWon,
+      SUM(S.GamesWon) AS GamesWon,
+      SUM(S.SetsWon) AS SetsWon,
+      SUM(CASE WHEN S.winner_id <> S.PlayerID AND S.is_draw = 0 THEN 1 ELSE 0 END) AS MatchesLost,
+      SUM(CASE WHEN S.is_draw = 1 THEN 1 ELSE 0 END) AS MatchesDraw,
+      SUM((CASE WHEN S.winner_id = S.PlayerID THEN 3 ELSE 1 END) * COALESCE(B.points_weight, 1)) AS TotalPoints
+    FROM vw_PlayerMatchSides S
+      JOIN boxes B ON B.id = S.BoxID
+      JOIN Players P ON P.PlayerID = S.PlayerID
+    GROUP BY P.PlayerID,
+      P.FirstName,
+      P.LastName
+  )
+SELECT PlayerName,
+  MatchesPlayed,
+  MatchesWon,
+  GamesWon,
+  SetsWon,
+  MatchesLost,
+  MatchesDraw,
+  TotalPoints,
+  ROW_NUMBER() OVER (
+    ORDER BY TotalPoints DESC,
+      MatchesWon DESC,
+      PlayerName COLLATE NOCASE ASC
+  ) AS OverallRank
+FROM PlayerTotals;
+
+-- Same logic as dbo.vw_FinalizedRoundStandings in schema.sql.
+CREATE VIEW IF NOT EXISTS vw_FinalizedRoundStandings AS
+SELECT R.id AS RoundID,
+  R.name AS RoundName,
+  R.start_date AS RoundStartDate,
+  R.end_date AS RoundEndDate,
+  B.box_name AS BoxName,
+  P.FirstName || ' ' || P.LastName AS PlayerName,
+  PR.matches_played AS MatchesPlayed,
+  PR.wins AS Wins,
+  PR.losses AS Losses,
+  PR.draws AS Draws,
+  PR.points AS Points,
+  PR.final_rank AS RankInBox
+FROM players_ranking PR
+  JOIN rounds R ON R.id = PR.round_id
+  JOIN box_assignments BA ON BA.round_id = PR.round_id
+  AND BA.player_id = PR.player_id
+  JOIN boxes B ON B.id = BA.box_id
+  JOIN Players P ON P.PlayerID = PR.player_id
+WHERE R.finalized_at IS NOT NULL
+  AND PR.matches_played > 0;
+
+-- Same logic as dbo.vw_OverallLeaderboardFromRanking in schema.sql; open
+-- rounds are read through vw_PlayerMatchSides like vw_OverallLeaderboard.
+CREATE VIEW IF NOT EXISTS vw_OverallLeaderboardFromRanking AS WITH RoundTotals AS (
+    SELECT PR.player_id AS PlayerID,
+      PR.matches_played AS MatchesPlayed,
+      PR.wins AS MatchesWon,
+      PR.games_won AS GamesWon,
+      PR.sets_won AS SetsWon,
+      PR.losses AS MatchesLost,
+      PR.draws AS MatchesDraw,
+      PR.weighted_points AS TotalPoints
+    FROM players_ranking PR
+      JOIN rounds R ON R.id = PR.round_id
+    WHERE R.finalized_at IS NOT NULL
+    UNION ALL
+    SELECT S.PlayerID,
+      1,
+      CASE WHEN S.winner_id = S.PlayerID THEN 1 ELSE 0 END,
+      S.GamesWon,
+      S.SetsWon,
+      CASE WHEN S.winner_id <> S.PlayerID AND S.is_draw = 0 THEN 1 ELSE 0 END,
+      CASE WHEN S.is_draw = 1 THEN 1 ELSE 0 END,
+      (CASE WHEN S.winner_id = S.PlayerID THEN 3 ELSE 1 END) * COALESCE(B.points_weight, 1)
+    FROM vw_PlayerMatchSides S
+      JOIN rounds R ON R.id = S.RoundID
+      JOIN boxes B ON B.id = S.BoxID
+    WHERE R.finalized_at IS NULL
+  ),
+  PlayerTotals AS (
+    SELECT P.PlayerID,
+      P.FirstName || ' ' || P.LastName AS PlayerName,
+      SUM(T.MatchesPlayed) AS MatchesPlayed,
+      SUM(T.MatchesWon) AS MatchesWon,
+      SUM(T.GamesWon) AS GamesWon,
+      SUM(T.SetsWon) AS SetsWon,
+      SUM(T.MatchesLost) AS MatchesLost,
+      SUM(T.MatchesDraw) AS MatchesDraw,
+      SUM(T.TotalPoints) AS TotalPoints
+    FROM RoundTotals T
+      JOIN Players P ON P.PlayerID = T.PlayerID
+    GROUP BY P.PlayerID,
+      P.FirstName,
+      P.LastName
+    HAVING SUM(T.MatchesPlayed) > 0
+  )
+SELECT PlayerName,
+  MatchesPlayed,
+  MatchesWon,
+  GamesWon,
+  SetsWon,
+  MatchesLost,
+  MatchesDraw,
+  TotalPoints,
+  ROW_NUMBER() OVER (
+    ORDER BY TotalPoints DESC,
+      MatchesWon DESC,
+      PlayerName COLLATE NOCASE ASC
+  ) AS OverallRank
+FROM PlayerTotals;
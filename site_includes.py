@@ -0,0 +1,225 @@
+import argparse
+import fnmatch
+import glob
+import json
+import os
+import re
+
+import asset_pipeline
+import build_metrics
+import build_runner
+import html_writer
+import image_pipeline
+
+# --- Configuration ---
+SITE_DIR = 'docs'
+
+# Shared partials, expanded into the element with the given id on every page
+# that has one. These files are the single source for the site's chrome.
+PARTIALS = {
+    'header-placeholder': 'header.html',
+    'footer-placeholder': 'footer.html',
+}
+ROLES_FILE = 'roles.json'
+
+# Pages generate_html_reports.py writes complete, with current asset and image
+# links; there are thousands of player profiles, so they are not re-read here.
+GENERATED_PAGES = ('player_*.html',)
+
+# Expanded content sits between these markers, so a page that has already
+# been built is updated in place and re-running the step changes nothing.
+BEGIN_MARKER = '<!-- begin {element_id} from {source} -->'
+END_MARKER = '<!-- end {element_id} -->'
+
+
+def _expand_element(page_html, element_id, source, content):
+    """
+    Puts content inside the element with element_id: between the include
+    markers if the page was built before, otherwise in place of the
+    placeholder's (flat) content, such as a "Loading..." message.
+
+    Returns:
+        str: The page, unchanged when it has no such element.
+    """
+    begin = BEGIN_MARKER.format(element_id=element_id, source=source)
+    end = END_MARKER.format(element_id=element_id)
+    block = f"{begin}\n{content.strip()}\n{end}"
+    marked = re.compile(re.escape(begin) + r'.*?' + re.escape(end), re.DOTALL)
+    if marked.search(page_html):
+        return marked.sub(lambda _: block, page_html, count=1)
+    placeholder = re.compile(r'(<div\b[^>]*\bid="' + re.escape(element_id) + r'"[^>]*>).*?(</div>)', re.DOTALL)
+    return placeholder.sub(lambda m: m.group(1) + block + m.group(2), page_html, count=1)
+
+
+def mark_active_link(header_html, page_name):
+    """Highlights the page's own link in the header, as the menu script used to at runtime."""
+    def replace(match):
+        return f'<a href="{match.group(1)}" class="active"'
+    return re.sub(r'<a href="(' + re.escape(page_name) + r')"(?: class="[^"]*")?', replace, header_html)
+
+
+def render_roles(roles):
+    """
+    Renders the volunteer roles as the tab buttons and adverts the roles page
+    shows, with the first role selected.
+
+    Args:
+        roles (list): Entries of roles.json.
+
+    Returns:
+        tuple: (tab buttons html, adverts html)
+    """
+    buttons = []
+    adverts = []
+    for index, role in enumerate(roles):
+        is_active = index == 0
+        button_class = 'tab-button active' if is_active else 'tab-button'
+        buttons.append(f"""
+            <button class="{button_class}" data-role-id="{role['id']}">
+                <strong>{role['title']}</strong>
+                <p>{role['subtitle']}</p>
+            </button>""")
+
+        advert_class = 'role-advert active' if is_active else 'role-advert hidden'
+        mailto_link = f"mailto:hello@tennisnerds.org?subject={role['linkSubject']}"
+        details_list = ''.join(f"<li>{detail}</li>" for detail in role['details'])
+        adverts.append(f"""
+            <article id="{role['id']}" class="{advert_class}">
+                <h2>{role['heading']}</h2>
+                <p>{role['description']}</p>
+                <ul>{details_list}</ul>
+                <a href="{mailto_link}" class="cta-button {role['buttonClass']}">{role['linkText']}</a>
+            </article>""")
+    return ''.join(buttons), ''.join(adverts)
+
+
+def expand_page(page_html, page_name, partials, roles=None):
+    """
+    Expands the shared header, footer and volunteer roles into one page and
+    points its stylesheet and script links at the current hashed assets and
+    its images at their responsive variants.
+
+    Args:
+        page_html (str): The page as it is on disk.
+        page_name (str): File name of the page, for the active menu link.
+        partials (dict): Placeholder id -> (source file name, html).
+        roles (list): Entries of roles.json, or None if it is missing.
+
+    Returns:
+        str: The complete page.
+    """
+    for element_id, (source, content) in partials.items():
+        if element_id == 'header-placeholder':
+            content = mark_active_link(content, page_name)
+        page_html = _expand_element(page_html, element_id, source, content)
+    if roles is not None:
+        buttons_html, adverts_html = render_roles(roles)
+        page_html = _expand_element(page_html, 'roles-nav', ROLES_FILE, buttons_html)
+        page_html = _expand_element(page_html, 'roles-content', ROLES_FILE, adverts_html)
+    page_html = image_pipeline.rewrite_images(page_html)
+    return asset_pipeline.rewrite_asset_references(page_html)
+
+
+def partial_html(element_id, site_dir=SITE_DIR):
+    """
+    The placeholder element for a shared partial with the partial already
+    expanded, exactly as expand_site_includes leaves it, for pages that
+    generate_html_reports.py writes complete. Re-running the step on such
+    a page then changes nothing.
+
+    Args:
+        element_id (str): A key of PARTIALS, e.g. 'footer-placeholder'.
+        site_dir (str): Folder holding the partials.
+
+    Returns:
+        str: The <div id="element_id"> element.
+    """
+    source = PARTIALS[element_id]
+    with open(os.path.join(site_dir, source), 'r', encoding='utf-8') as f:
+        content = f.read()
+    element_html = _expand_element(f'<div id="{element_id}"></div>', element_id, source, content)
+    return asset_pipeline.rewrite_asset_references(image_pipeline.rewrite_images(element_html))
+
+
+def site_pages(site_dir=SITE_DIR):
+    """Paths of the pages in site_dir this step expands: every page but the partials and GENERATED_PAGES."""
+    partial_files = set(PARTIALS.values())
+    return [
+        page_path for page_path in sorted(glob.glob(os.path.join(site_dir, '*.html')))
+        if os.path.basename(page_path) not in partial_files
+        and not any(fnmatch.fnmatch(os.path.basename(page_path), pattern) for pattern in GENERATED_PAGES)
+    ]
+
+
+def referenced_images(site_dir=SITE_DIR):
+    """
+    The docs/assets images shown by <img> tags in the partials and the pages
+    this step expands, i.e. those rewrite_images gives a <picture>.
+
+    Returns:
+        set: 'assets/<name>' paths, for image_pipeline.build_images().
+    """
+    sources = set()
+    partial_paths = [os.path.join(site_dir, source) for source in PARTIALS.values()]
+    for page_path in partial_paths + site_pages(site_dir):
+        if os.path.exists(page_path):
+            with open(page_path, 'r', encoding='utf-8') as f:
+                sources |= image_pipeline.image_sources(f.read())
+    return sources
+
+
+def expand_site_includes(site_dir=SITE_DIR):
+    """
+    Build step for the static pages in site_dir: writes the shared header,
+    footer and volunteer roles into every page at build time, so pages are
+    complete on first byte instead of fetching them after load. Only pages
+    whose bytes change are rewritten.
+
+    Returns:
+        int: Number of pages rewritten, or None on error.
+    """
+    try:
+        with build_metrics.stage('extract'):
+            partials = {}
+            for element_id, source in PARTIALS.items():
+                with open(os.path.join(site_dir, source), 'r', encoding='utf-8') as f:
+                    partials[element_id] = (source, f.read())
+            roles_path = os.path.join(site_dir, ROLES_FILE)
+            roles = None
+            if os.path.exists(roles_path):
+                with open(roles_path, 'r', encoding='utf-8') as f:
+                    roles = json.load(f)
+
+        written = 0
+        with build_metrics.stage('render'):
+            for page_path in site_pages(site_dir):
+                page_name = os.path.basename(page_path)
+                with open(page_path, 'r', encoding='utf-8') as f:
+                    page_html = f.read()
+                expanded = expand_page(page_html, page_name, partials, roles)
+                if expanded == page_html:
+                    continue
+                with html_writer.PageWriter(page_path) as writer:
+                    writer.write(expanded)
+                    writer.commit()
+                written += 1
+
+        print(f"Expanded shared includes into {written} page(s) in {site_dir}")
+        return written
+
+    except (OSError, ValueError) as e:
+        build_runner.note_error(f"Error expanding site includes: {e}")
+    return None
+
+
+# --- Main execution block ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Expand the shared header, footer and volunteer roles into the static site pages."
+    )
+    parser.add_argument('--site-dir', default=SITE_DIR,
+                        help=f"Folder holding the pages and partials (default {SITE_DIR}).")
+    args = parser.parse_args()
+    asset_pipeline.build_assets(args.site_dir)
+    image_pipeline.build_images(args.site_dir, referenced_images(args.site_dir))
+    expand_site_includes(args.site_dir)
@@ -0,0 +1,225 @@
+import argparse
+
+import numpy as np
+
+import league_db
+
+# Column order of dbo.vw_CurrentStandings, which compute_standings reproduces.
+STANDINGS_COLUMNS = (
+    'RoundName', 'BoxName', 'PlayerName', 'MatchesPlayed',
+    'Wins', 'Losses', 'Draws', 'Points', 'RankInBox',
+)
+
+# Points per played match, as in the view: 3 for a win, 1 for anything else.
+WIN_POINTS = 3
+PLAYED_POINTS = 1
+
+# The round vw_CurrentStandings reports on.
+VIEW_ROUND_SQL = """
+    SELECT TOP 1 id, name
+    FROM dbo.rounds
+    WHERE start_date <= GETDATE()
+    ORDER BY start_date DESC, id DESC
+"""
+
+# One scan of dbo.matches for a round; no join back to Players.
+ROUND_MATCHES_SQL = """
+    SELECT box_id, player1_id, player2_id, winner_id, is_draw
+    FROM dbo.matches
+    WHERE round_id = ? AND played_on IS NOT NULL
+"""
+
+PLAYER_NAMES_SQL = "SELECT PlayerID, FirstName, LastName FROM dbo.Players"
+
+BOX_NAMES_SQL = "SELECT id, box_name FROM dbo.boxes"
+
+
+def player_display_name(first_name, last_name):
+    """Matches the view's FirstName + ' ' + LastName, which is NULL if either part is."""
+    if first_name is None or last_name is None:
+        return None
+    return f"{first_name} {last_name}"
+
+
+def _name_sort_keys(names):
+    """
+    Turns player names into integer sort keys. SQL Server sorts NULL first and,
+    with the default collation, ignores case, so the keys do the same.
+    """
+    folded = np.array(['' if name is None else name.casefold() for name in names], dtype=object)
+    _, keys = np.unique(folded, return_inverse=True)
+    return keys.reshape(-1)
+
+
+def player_match_stats(player_id, winner_id, is_draw, played_on):
+    """
+    Returns what one match contributes to one player's row, following the
+    view's rules, as (matches_played, wins, losses, draws, points).
+    Unplayed matches contribute nothing.
+    """
+    if played_on is None:
+        return (0, 0, 0, 0, 0)
+    won = int(winner_id is not None and winner_id == player_id)
+    lost = int(winner_id is not None and winner_id != player_id and is_draw is not None and not is_draw)
+    drawn = int(is_draw is not None and bool(is_draw))
+    points = WIN_POINTS if won else PLAYED_POINTS
+    return (1, won, lost, drawn, points)
+
+
+def standings_sort_key(points, wins, player_name):
+    """Sort key giving the view's ROW_NUMBER() order within a box."""
+    return (-points, -wins, '' if player_name is None else player_name.casefold())
+
+
+def aggregate_player_stats(match_rows):
+    """
+    Totals played matches per (box, player) without looping over rows.
+
+    Args:
+        match_rows (list): Played matches as (box_id, player1_id, player2_id, winner_id, is_draw).
+
+    Returns:
+        tuple: Arrays (box_ids, player_ids, matches_played, wins, losses, draws, points),
+        one entry per distinct (box, player), ordered by box id then player id.
+    """
+    empty = np.zeros(0, dtype=np.int64)
+    if not match_rows:
+        return (empty,) * 7
+
+    columns = np.array(match_rows, dtype=object).reshape(len(match_rows), 5)
+    box_ids = columns[:, 0].astype(np.int64)
+    player1_ids = columns[:, 1].astype(np.int64)
+    player2_ids = columns[:, 2].astype(np.int64)
+    # Identity columns start at 1, so 0 can stand in for "no winner yet".
+    winner_ids = np.where(columns[:, 3] == None, 0, columns[:, 3]).astype(np.int64)  # noqa: E711
+    # -1 stands in for a NULL is_draw, which the view counts as neither draw nor loss.
+    draw_flags = np.where(columns[:, 4] == None, -1, columns[:, 4]).astype(np.int64)  # noqa: E711
+
+    # Each match counts once for each of its two players.
+    box = np.concatenate([box_ids, box_ids])
+    player = np.concatenate([player1_ids, player2_ids])
+    winner = np.concatenate([winner_ids, winner_ids])
+    draw = np.concatenate([draw_flags, draw_flags])
+
+    keys = (box << 32) | player
+    unique_keys, slot = np.unique(keys, return_inverse=True)
+    slot = slot.reshape(-1)
+    slots = len(unique_keys)
+
+    matches_played = np.bincount(slot, minlength=slots)
+    wins = np.bincount(slot, weights=(winner == player), minlength=slots).astype(np.int64)
+    losses = np.bincount(
+        slot, weights=(winner != 0) & (winner != player) & (draw == 0), minlength=slots
+    ).astype(np.int64)
+    draws = np.bincount(slot, weights=(draw == 1), minlength=slots).astype(np.int64)
+    points = PLAYED_POINTS * (matches_played - wins) + WIN_POINTS * wins
+
+    return (unique_keys >> 32, unique_keys & 0xFFFFFFFF, matches_played, wins, losses, draws, points)
+
+
+def compute_standings(match_rows, player_names, box_names, round_name):
+    """
+    Computes box standings for one round from raw dbo.matches rows.
+
+    The result matches dbo.vw_CurrentStandings column for column, including the
+    ROW_NUMBER() tie-break (Points DESC, Wins DESC, PlayerName ASC per box).
+    All counting and ranking is done on arrays, one entry per (match, player).
+
+    Args:
+        match_rows (list): Played matches as (box_id, player1_id, player2_id, winner_id, is_draw).
+        player_names (dict): PlayerID -> display name.
+        box_names (dict): Box id -> box name.
+        round_name (str): Name of the round, repeated on every row.
+
+    Returns:
+        list: Tuples in STANDINGS_COLUMNS order, sorted by BoxName then RankInBox.
+    """
+    slot_boxes, slot_players, matches_played, wins, losses, draws, points = aggregate_player_stats(match_rows)
+    slots = len(slot_players)
+    if not slots:
+        return []
+
+    names = [player_names.get(player_id) for player_id in slot_players.tolist()]
+    slot_box_names = [box_names.get(box_id) for box_id in slot_boxes.tolist()]
+
+    # Group boxes by name (the report order), then apply the view's tie-break.
+    _, box_order = np.unique(np.array([name or '' for name in slot_box_names], dtype=object), return_inverse=True)
+    order = np.lexsort((_name_sort_keys(names), -wins, -points, box_order.reshape(-1)))
+
+    sorted_boxes = box_order.reshape(-1)[order]
+    positions = np.arange(slots)
+    box_starts = np.where(np.r_[True, sorted_boxes[1:] != sorted_boxes[:-1]], positions, 0)
+    rank_in_box = positions - np.maximum.accumulate(box_starts) + 1
+
+    return list(zip(
+        [round_name] * slots,
+        [slot_box_names[i] for i in order.tolist()],
+        [names[i] for i in order.tolist()],
+        matches_played[order].tolist(),
+        wins[order].tolist(),
+        losses[order].tolist(),
+        draws[order].tolist(),
+        points[order].tolist(),
+        rank_in_box.tolist(),
+    ))
+
+
+def compute_round_standings(db, round_id, round_name):
+    """Computes standings for a round using a pooled connection from league_db."""
+    match_rows = db.fetch_all(ROUND_MATCHES_SQL, (round_id,))
+    player_names = {
+        row[0]: player_display_name(row[1], row[2]) for row in db.fetch_all(PLAYER_NAMES_SQL)
+    }
+    box_names = {row[0]: row[1] for row in db.fetch_all(BOX_NAMES_SQL)}
+    return compute_standings(match_rows, player_names, box_names, round_name)
+
+
+def compute_current_standings(db):
+    """Computes standings for the same round vw_CurrentStandings reports on."""
+    round_row = db.fetch_one(VIEW_ROUND_SQL)
+    if not round_row:
+        return []
+    return compute_round_standings(db, round_row[0], round_row[1])
+
+
+def check_against_view():
+    """
+    Compares the engine's output with dbo.vw_CurrentStandings and prints any
+    rows that differ.
+
+    Returns:
+        bool: True when both produce identical standings.
+    """
+    with league_db.connection() as db:
+        engine_rows = compute_current_standings(db)
+        view_rows = db.fetch_all("""
+            SELECT
+                RoundName, BoxName, PlayerName, MatchesPlayed, Wins, Losses, Draws, Points, RankInBox
+            FROM dbo.vw_CurrentStandings
+            ORDER BY BoxName ASC, RankInBox ASC
+        """)
+
+    view_rows = [tuple(row) for row in view_rows]
+    if engine_rows == view_rows:
+        print(f"Standings engine matches vw_CurrentStandings ({len(view_rows)} rows).")
+        return True
+
+    print(f"Standings engine differs from vw_CurrentStandings "
+          f"(engine {len(engine_rows)} rows, view {len(view_rows)} rows):")
+    for engine_row, view_row in zip(engine_rows, view_rows):
+        if engine_row != view_row:
+            print(f"  engine: {engine_row}")
+            print(f"  view:   {view_row}")
+    return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the standings engine against vw_CurrentStandings.")
+    parser.add_argument('--sqlite', metavar='PATH',
+                        help="Read from a local SQLite database file instead of SQL Server.")
+    args = parser.parse_args()
+    if args.sqlite:
+        league_db.use_sqlite(args.sqlite)
+    check_against_view()
+    league_db.close_pool()
+    league_db.print_db_stats()
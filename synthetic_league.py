@@ -0,0 +1,220 @@
+import argparse
+import datetime
+import itertools
+import os
+import random
+import sqlite3
+import time
+
+import league_db
+
+# --- Configuration ---
+# Defaults give a league about the size of the real one; the benchmark presets
+# scale up to 10k players, 500 boxes and 200 rounds.
+DEFAULT_PLAYERS = 120
+DEFAULT_BOXES = 20
+DEFAULT_ROUNDS = 8
+DEFAULT_BOX_SIZE = 6
+
+# Each round runs for eight weeks; the last generated round is in progress today.
+ROUND_LENGTH_DAYS = 56
+CURRENT_ROUND_ELAPSED_DAYS = 21
+
+# Share of fixtures played in a finished round, and of matches that end in a draw
+# (one set each when time runs out).
+FINISHED_ROUND_PLAYED_RATE = 0.9
+DRAW_RATE = 0.04
+COMMENT_RATE = 0.3
+
+# Games won by the loser of a 6-x set, weighted towards close sets, plus 7-5 and 7-6.
+SET_SCORES = [(6, 0), (6, 1), (6, 2), (6, 3), (6, 4), (7, 5), (7, 6)]
+SET_SCORE_WEIGHTS = [3, 6, 10, 14, 16, 8, 8]
+# Third sets are played as a match tie-break.
+TIEBREAK_SCORES = [(10, games) for games in range(0, 9)] + [(11, 9), (12, 10)]
+TIEBREAK_SCORE_WEIGHTS = [1, 1, 2, 3, 4, 5, 6, 7, 8, 4, 2]
+
+FIRST_NAMES = [
+    'Alex', 'Amara', 'Ben', 'Chloe', 'Dan', 'Deepa', 'Ella', 'Femi', 'George', 'Hannah',
+    'Ibrahim', 'Isla', 'Jack', 'Jas', 'Katie', 'Leo', 'Lucy', 'Marco', 'Maya', 'Noah',
+    'Olivia', 'Oscar', 'Priya', 'Raj', 'Rosie', 'Sam', 'Sofia', 'Tom', 'Yusuf', 'Zoe',
+]
+LAST_NAMES = [
+    'Adams', 'Ahmed', 'Baker', 'Clarke', 'Davies', 'Evans', 'Fisher', 'Green', 'Hughes', 'Iqbal',
+    'Jones', 'Khan', 'Lewis', 'Morris', 'Nowak', 'Owen', 'Patel', 'Quinn', 'Roberts', 'Singh',
+    'Taylor', 'Turner', 'Walker', 'Ward', 'Wilson', 'Wright', 'Young',
+]
+COMMENTS = [
+    'Great rally in the second set.',
+    'Windy conditions, lots of unforced errors.',
+    'Close tie-break to decide it.',
+    'Played under the lights.',
+    'Rain delay but finished the match.',
+    'Very even match, well played both.',
+]
+
+
+def _set_score(rng, player1_wins_set):
+    winner_games, loser_games = rng.choices(SET_SCORES, SET_SCORE_WEIGHTS)[0]
+    return (winner_games, loser_games) if player1_wins_set else (loser_games, winner_games)
+
+
+def random_match_result(rng, skill1, skill2):
+    """
+    Plays a synthetic best-of-three match between two skill levels.
+
+    Returns:
+        tuple: (player1_wins, is_draw, sets) where sets is a list of
+            (player1_games, player2_games) pairs.
+    """
+    # Logistic win chance per set: a 4-level gap makes the stronger player a 10:1 favourite.
+    set_win_chance = 1 / (1 + 10 ** ((skill2 - skill1) / 4))
+    if rng.random() < DRAW_RATE:
+        first = rng.random() < 0.5
+        return False, True, [_set_score(rng, first), _set_score(rng, not first)]
+
+    sets = [_set_score(rng, rng.random() < set_win_chance) for _ in range(2)]
+    player1_sets = sum(games1 > games2 for games1, games2 in sets)
+    if player1_sets == 1:
+        winner_points, loser_points = rng.choices(TIEBREAK_SCORES, TIEBREAK_SCORE_WEIGHTS)[0]
+        if rng.random() < set_win_chance:
+            sets.append((winner_points, loser_points))
+            player1_sets += 1
+        else:
+            sets.append((loser_points, winner_points))
+    return player1_sets >= 2, False, sets
+
+
+def generate_league(path, players=DEFAULT_PLAYERS, boxes=DEFAULT_BOXES, rounds=DEFAULT_ROUNDS,
+                    box_size=DEFAULT_BOX_SIZE, seed=1, today=None):
+    """
+    Writes a synthetic league into a new SQLite database created from schema_sqlite.sql.
+
+    Every round re-seeds the boxes by skill (with some noise), plays a full
+    round robin in each box and spreads the results over the round's dates.
+    Finished rounds are mostly played; the current round is part way through.
+
+    Args:
+        path (str): SQLite file to create; an existing file is replaced.
+        players (int): Number of players in dbo.Players.
+        boxes (int): Number of boxes; box 1 is the strongest.
+        rounds (int): Number of rounds, the last of which is in progress.
+        box_size (int): Players per box in each round.
+        seed (int): Random seed, so a given size always produces the same league.
+        today (datetime.date): Date the current round is measured against.
+
+    Returns:
+        dict: Row counts per table.
+    """
+    rng = random.Random(seed)
+    today = today or datetime.date.today()
+    if os.path.exists(path):
+        os.remove(path)
+    league_db.create_sqlite_database(path)
+
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = OFF")
+
+        box_rows = [
+            (box_id, f"Box {box_id}", round(2.0 - (box_id - 1) / max(boxes - 1, 1), 2))
+            for box_id in range(1, boxes + 1)
+        ]
+        conn.executemany("INSERT INTO boxes (id, box_name, points_weight) VALUES (?, ?, ?)", box_rows)
+
+        skills = {}
+        player_rows = []
+        for player_id in range(1, players + 1):
+            skills[player_id] = rng.randint(1, 10)
+            player_rows.append((
+                player_id, rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), skills[player_id],
+                f"player{player_id}@example.com",
+            ))
+        conn.executemany(
+            "INSERT INTO Players (PlayerID, FirstName, LastName, SkillLevel, Email) VALUES (?, ?, ?, ?, ?)",
+            player_rows,
+        )
+
+        current_start = today - datetime.timedelta(days=CURRENT_ROUND_ELAPSED_DAYS)
+        seasons = ['Winter', 'Spring', 'Summer', 'Autumn']
+        round_rows = []
+        for index in range(rounds):
+            start_date = current_start - datetime.timedelta(days=ROUND_LENGTH_DAYS * (rounds - 1 - index))
+            end_date = start_date + datetime.timedelta(days=ROUND_LENGTH_DAYS - 1)
+            name = f"{seasons[start_date.month % 12 // 3]} {start_date.year} R{index + 1}"
+            round_rows.append((index + 1, name, start_date, end_date))
+        conn.executemany("INSERT INTO rounds (id, name, start_date, end_date) VALUES (?, ?, ?, ?)", round_rows)
+
+        assignment_count = match_count = 0
+        per_round = min(players, boxes * box_size)
+        for round_id, _, start_date, end_date in round_rows:
+            is_current = start_date <= today <= end_date
+            last_day = min(end_date, today)
+            days = max((last_day - start_date).days, 0)
+            played_rate = (days / ROUND_LENGTH_DAYS) if is_current else FINISHED_ROUND_PLAYED_RATE
+
+            entrants = rng.sample(range(1, players + 1), per_round)
+            entrants.sort(key=lambda player_id: skills[player_id] + rng.uniform(-2, 2), reverse=True)
+
+            assignment_rows = []
+            match_rows = []
+            for box_index in range(0, per_round, box_size):
+                box_id = box_index // box_size + 1
+                box_players = entrants[box_index:box_index + box_size]
+                assignment_rows.extend((round_id, box_id, player_id) for player_id in box_players)
+                for player1_id, player2_id in itertools.combinations(box_players, 2):
+                    if rng.random() >= played_rate:
+                        match_rows.append((round_id, box_id, player1_id, player2_id,
+                                           None, 0, None, None, None, None, None, None, None, None))
+                        continue
+                    player1_wins, is_draw, sets = random_match_result(rng, skills[player1_id], skills[player2_id])
+                    winner_id = None if is_draw else (player1_id if player1_wins else player2_id)
+                    games = [games for set_score in sets for games in set_score]
+                    games += [None] * (6 - len(games))
+                    played_on = start_date + datetime.timedelta(days=rng.randint(0, days))
+                    comment = rng.choice(COMMENTS) if rng.random() < COMMENT_RATE else None
+                    match_rows.append((round_id, box_id, player1_id, player2_id,
+                                       winner_id, int(is_draw), *games, played_on, comment))
+
+            conn.executemany(
+                "INSERT INTO box_assignments (round_id, box_id, player_id) VALUES (?, ?, ?)",
+                assignment_rows,
+            )
+            conn.executemany(
+                """INSERT INTO matches (
+                    round_id, box_id, player1_id, player2_id, winner_id, is_draw,
+                    player1_set1_games, player2_set1_games, player1_set2_games, player2_set2_games,
+                    player1_set3_games, player2_set3_games, played_on, Comments_Match_Summary
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                match_rows,
+            )
+            assignment_count += len(assignment_rows)
+            match_count += len(match_rows)
+        conn.commit()
+    finally:
+        conn.close()
+
+    return {
+        'boxes': boxes,
+        'Players': players,
+        'rounds': rounds,
+        'box_assignments': assignment_count,
+        'matches': match_count,
+    }
+
+
+# --- Main execution block ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create a synthetic league in a SQLite database.")
+    parser.add_argument('path', nargs='?', default=league_db.SQLITE_PATH, help="SQLite file to (re)create.")
+    parser.add_argument('--players', type=int, default=DEFAULT_PLAYERS)
+    parser.add_argument('--boxes', type=int, default=DEFAULT_BOXES)
+    parser.add_argument('--rounds', type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument('--box-size', type=int, default=DEFAULT_BOX_SIZE, help="Players per box each round.")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = generate_league(args.path, args.players, args.boxes, args.rounds, args.box_size, args.seed)
+    print(f"Generated {args.path} in {time.perf_counter() - start:.1f}s: "
+          + ", ".join(f"{count} {table}" for table, count in counts.items()))